@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from pipeline.bm25 import Bm25Index
+from pipeline.config import Settings
+from pipeline.embeddings import EmbeddingSettings, EmbeddingStore
+from pipeline.models import ExtractionResult, ProjectMetadata
+from pipeline.parsers import extract_pdf_pages, write_page_cache
+from pipeline.pipeline import run_pipeline
+from pipeline.selector import SECTION_CONFIGS, select_scored_pages
+from pipeline.storage import save_sqlite
+from pipeline.table_extractor import extract_tables_for_pages
+from pipeline.table_parser import parse_statement_tables
+
+from .synthetic import SyntheticSpec, generate_corpus
+
+Corpus = list[tuple[Path, list[str], list[dict[str, str]]]]
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+# Entry points that must start fast: the CLI and what Airflow tasks import.
+IMPORT_TARGETS = ("pipeline.run", "pipeline.pipeline")
+IMPORT_BUDGET_SEC = 0.5
+# Loaded only by the stage that needs them (tables, embeddings, parquet, LLM, profiling...).
+HEAVY_MODULES = (
+    "camelot",
+    "cv2",
+    "pandas",
+    "pdfplumber",
+    "numpy",
+    "pyarrow",
+    "google.genai",
+    "llama_parse",
+    "http.server",
+    "cProfile",
+    "tracemalloc",
+)
+
+
+def _summary(runs: list[float], documents: int) -> dict:
+    median = statistics.median(runs)
+    return {
+        "status": "ok",
+        "runs_sec": [round(run, 4) for run in runs],
+        "median_sec": round(median, 4),
+        "min_sec": round(min(runs), 4),
+        "per_doc_ms": round(median * 1000 / max(1, documents), 3),
+    }
+
+
+def _skipped(reason: str) -> dict:
+    return {"status": "skipped", "reason": reason}
+
+
+def _time(fn: Callable[[], object], repeat: int) -> list[float]:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def measure_import(module: str) -> tuple[float, list[str]]:
+    """Import time of `module` in a fresh interpreter and the heavy modules it loaded."""
+    code = (
+        f"import json, sys; import {module}; "
+        f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))"
+    )
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(SRC), os.environ.get("PYTHONPATH", "")]),
+    }
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    # -X importtime lines: "import time: self_us | cumulative_us | <indent>module".
+    cumulative_us = next(
+        int(parts[1])
+        for parts in (line.split("|") for line in proc.stderr.splitlines())
+        if len(parts) == 3 and parts[2] == f" {module}"
+    )
+    return cumulative_us / 1_000_000, json.loads(proc.stdout)
+
+
+def _bench_import(module: str, repeat: int) -> dict:
+    runs = []
+    loaded: set[str] = set()
+    for _ in range(repeat):
+        seconds, heavy = measure_import(module)
+        runs.append(seconds)
+        loaded.update(heavy)
+    summary = _summary(runs, 1)
+    summary["budget_sec"] = IMPORT_BUDGET_SEC
+    summary["heavy_modules_loaded"] = sorted(loaded)
+    return summary
+
+
+def _bench_extract_pages(corpus: Corpus, repeat: int) -> dict:
+    if not shutil.which("pdftotext"):
+        return _skipped("pdftotext not found")
+    return _summary(
+        _time(lambda: [extract_pdf_pages(path) for path, _, _ in corpus], repeat), len(corpus)
+    )
+
+
+def _bench_rank_pages(corpus: Corpus, repeat: int) -> dict:
+    embed_settings = EmbeddingSettings(
+        enabled=False, api_key=None, model_name="bench", max_chars=4000, max_pages=60
+    )
+    store = EmbeddingStore(Path(tempfile.mkdtemp(prefix="bench-embed-")), embed_settings)
+    bm25_weight = Settings().bm25_weight
+
+    def _rank() -> None:
+        for _, texts, _ in corpus:
+            index = Bm25Index.build(texts)
+            for config in SECTION_CONFIGS.values():
+                select_scored_pages(
+                    texts, config, store, embed_settings, index=index, bm25_weight=bm25_weight
+                )
+
+    return _summary(_time(_rank, repeat), len(corpus))
+
+
+def _bench_extract_tables(corpus: Corpus, repeat: int) -> dict:
+    if not any(importlib.util.find_spec(name) for name in ("camelot", "pdfplumber")):
+        return _skipped("camelot and pdfplumber not installed")
+
+    def _extract() -> None:
+        for path, _, tables in corpus:
+            extract_tables_for_pages(path, [int(table["page"]) - 1 for table in tables])
+
+    return _summary(_time(_extract, repeat), len(corpus))
+
+
+def _bench_save_sqlite(corpus: Corpus, repeat: int, workdir: Path) -> dict:
+    results = []
+    for path, _, tables in corpus:
+        resources = parse_statement_tables(tables, "resources").rows
+        reserves = parse_statement_tables(tables, "reserves").rows
+        results.append(
+            ExtractionResult(
+                metadata=ProjectMetadata(project_name=path.stem, source_pdf=path.name),
+                resources=resources,
+                reserves=reserves,
+            )
+        )
+    sqlite_path = workdir / "bench.db"
+    return _summary(_time(lambda: save_sqlite(results, sqlite_path), repeat), len(corpus))
+
+
+def _seed_page_cache(corpus: Corpus, output_dir: Path) -> None:
+    # Without poppler, pre-populate the page cache so runs exercise everything downstream.
+    cache_dir = output_dir / "cache" / "pages"
+    for path, texts, _ in corpus:
+        write_page_cache(path, cache_dir, texts).close()
+
+
+def _bench_run(
+    corpus: Corpus,
+    data_dir: Path,
+    workdir: Path,
+    workers: int,
+    repeat: int,
+    provider: str = "mock",
+) -> dict:
+    seeded = not shutil.which("pdftotext")
+    runs = []
+    for attempt in range(repeat):
+        output_dir = workdir / f"run_w{workers}_{attempt}"
+        if seeded:
+            _seed_page_cache(corpus, output_dir)
+        settings = Settings()
+        settings.output_dir = str(output_dir)
+        settings.llm_provider = provider
+        settings.embeddings_enabled = False
+        settings.max_workers = workers
+        settings.log_level = "WARNING"
+        start = time.perf_counter()
+        run_pipeline(data_dir, output_dir, output_dir / "extractions.db", settings)
+        runs.append(time.perf_counter() - start)
+    summary = _summary(runs, len(corpus))
+    summary["page_cache"] = "seeded" if seeded else "cold"
+    return summary
+
+
+def run_benchmarks(
+    spec: SyntheticSpec,
+    documents: int,
+    workers: list[int],
+    repeat: int,
+    workdir: Path,
+    stages: set[str] | None = None,
+    provider: str = "mock",
+) -> dict:
+    data_dir = workdir / "data"
+    corpus = generate_corpus(data_dir, documents, spec)
+    wanted = stages or {
+        "import",
+        "extract_pdf_pages",
+        "rank_pages",
+        "extract_tables",
+        "save_sqlite",
+        "run",
+    }
+    benchmarks: dict[str, dict] = {}
+    if "import" in wanted:
+        for module in IMPORT_TARGETS:
+            benchmarks[f"import.{module}"] = _bench_import(module, repeat)
+    if "extract_pdf_pages" in wanted:
+        benchmarks["stage.extract_pdf_pages"] = _bench_extract_pages(corpus, repeat)
+    if "rank_pages" in wanted:
+        benchmarks["stage.rank_pages"] = _bench_rank_pages(corpus, repeat)
+    if "extract_tables" in wanted:
+        benchmarks["stage.extract_tables_for_pages"] = _bench_extract_tables(corpus, repeat)
+    if "save_sqlite" in wanted:
+        benchmarks["stage.save_sqlite"] = _bench_save_sqlite(corpus, repeat, workdir)
+    if "run" in wanted:
+        for count in workers:
+            benchmarks[f"run.workers_{count}"] = _bench_run(
+                corpus, data_dir, workdir, count, repeat, provider
+            )
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "documents": documents,
+            "pages": spec.pages,
+            "table_density": spec.table_density,
+            "layout": spec.layout,
+            "seed": spec.seed,
+            "workers": workers,
+            "repeat": repeat,
+            "provider": provider,
+        },
+        "benchmarks": benchmarks,
+    }
+
+
+def compare_results(
+    current: dict, baseline: dict, threshold: float = 0.2, min_delta_sec: float = 0.005
+) -> list[dict]:
+    """Compare median timings; a regression is slower by more than threshold and min_delta."""
+    rows = []
+    for name, entry in current.get("benchmarks", {}).items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if entry.get("status") != "ok" or not base or base.get("status") != "ok":
+            continue
+        now, before = entry["median_sec"], base["median_sec"]
+        ratio = now / before if before else None
+        regression = ratio is not None and ratio > 1 + threshold and now - before > min_delta_sec
+        rows.append(
+            {
+                "benchmark": name,
+                "baseline_sec": before,
+                "current_sec": now,
+                "ratio": round(ratio, 3) if ratio is not None else None,
+                "regression": regression,
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic reports")
+    parser.add_argument("--documents", type=int, default=32, help="Synthetic PDFs to generate")
+    parser.add_argument("--pages", type=int, default=80, help="Pages per synthetic PDF")
+    parser.add_argument(
+        "--table-density", type=float, default=0.1, help="Fraction of pages with tables"
+    )
+    parser.add_argument(
+        "--layout",
+        default="mixed",
+        choices=["mixed", "single_metal", "multi_metal", "split_header"],
+        help="Resource table layout",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument("--workers", default="1,8,32", help="Comma-separated worker counts")
+    parser.add_argument(
+        "--provider",
+        default="mock",
+        choices=["mock", "simulated"],
+        help="LLM provider for full runs (simulated reads SIM_* settings)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per benchmark")
+    parser.add_argument(
+        "--stages",
+        default=None,
+        help="Comma-separated subset: "
+        "import,extract_pdf_pages,rank_pages,extract_tables,save_sqlite,run",
+    )
+    parser.add_argument(
+        "--output", default="output/bench/latest.json", help="Where to write results JSON"
+    )
+    parser.add_argument(
+        "--baseline", default="benchmarks/baseline.json", help="Baseline results to compare"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Allowed slowdown ratio before failing"
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Store these results as the new baseline"
+    )
+    args = parser.parse_args()
+
+    logging.getLogger().addHandler(logging.NullHandler())
+    spec = SyntheticSpec(
+        pages=args.pages, table_density=args.table_density, layout=args.layout, seed=args.seed
+    )
+    workers = [int(value) for value in args.workers.split(",") if value.strip()]
+    stages = {value.strip() for value in args.stages.split(",")} if args.stages else None
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        results = run_benchmarks(
+            spec, args.documents, workers, args.repeat, Path(tmp), stages, args.provider
+        )
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    for name, entry in results["benchmarks"].items():
+        if entry["status"] == "ok":
+            print(f"{name:34} median={entry['median_sec']:.4f}s per_doc={entry['per_doc_ms']}ms")
+        else:
+            print(f"{name:34} skipped ({entry['reason']})")
+    print(f"Results written: {output_path}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline or not baseline_path.exists():
+        # Timings only compare on the machine that produced them, so the first run on a
+        # machine becomes its baseline instead of silently skipping the comparison.
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Baseline {'updated' if args.save_baseline else 'created'}: {baseline_path}")
+        return
+    comparison = compare_results(
+        results, json.loads(baseline_path.read_text(encoding="utf-8")), args.threshold
+    )
+    regressions = [row for row in comparison if row["regression"]]
+    for row in comparison:
+        flag = "REGRESSION" if row["regression"] else "ok"
+        print(f"{row['benchmark']:34} x{row['ratio']} {flag}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+LAYOUTS = ("single_metal", "multi_metal", "split_header")
+
+PAGE_LINES = 60
+LINE_CHARS = 96
+
+_FILLER = [
+    "The property is located within a mining district with established infrastructure.",
+    "Drilling was completed using diamond core and reverse circulation methods.",
+    "Samples were prepared and assayed at an accredited independent laboratory.",
+    "Metallurgical testwork indicates recoveries consistent with similar deposits.",
+    "The qualified person reviewed the data and considers it adequate for this report.",
+    "Geological logging recorded lithology, alteration, mineralization and structure.",
+    "Environmental baseline studies are ongoing and no material issues were identified.",
+    "The mine plan considers conventional open pit methods with truck and shovel fleets.",
+]
+
+_CHAPTERS = [
+    "Summary",
+    "Property Description and Location",
+    "History",
+    "Geological Setting and Mineralization",
+    "Drilling",
+    "Sample Preparation, Analyses and Security",
+    "Mineral Processing and Metallurgical Testing",
+    "Mineral Resource Estimates",
+    "Mineral Reserve Estimates",
+    "Mining Methods",
+    "Capital and Operating Costs",
+    "Economic Analysis",
+]
+
+
+@dataclass
+class SyntheticSpec:
+    pages: int = 80
+    table_density: float = 0.1  # fraction of pages carrying a numeric table
+    layout: str = "single_metal"  # single_metal | multi_metal | split_header
+    seed: int = 0
+
+
+def _resource_table(rng: random.Random, layout: str, section: str) -> list[list[str]]:
+    if section == "resources":
+        categories = ["Measured", "Indicated", "Measured + Indicated", "Inferred"]
+    else:
+        categories = ["Proven", "Probable", "Proven + Probable"]
+    if layout == "multi_metal":
+        header = [
+            [
+                "Category",
+                "Tonnes (Mt)",
+                "Au Grade (g/t)",
+                "Cu Grade (%)",
+                "Contained Au (koz)",
+                "Contained Cu (Mlbs)",
+            ]
+        ]
+    elif layout == "split_header":
+        header = [
+            ["", "Tonnes", "Grade", "Contained"],
+            ["Category", "(Mt)", "Au (g/t)", "Au (koz)"],
+        ]
+    else:
+        header = [["Category", "Tonnes (Mt)", "Au Grade (g/t)", "Contained Au (koz)"]]
+    rows = [list(row) for row in header]
+    for category in categories:
+        tonnes = rng.uniform(5, 250)
+        au_grade = rng.uniform(0.3, 4.0)
+        row = [category, f"{tonnes:,.1f}", f"{au_grade:.2f}"]
+        if layout == "multi_metal":
+            cu_grade = rng.uniform(0.1, 1.2)
+            row += [
+                f"{cu_grade:.2f}",
+                f"{tonnes * au_grade * 32.15:,.0f}",
+                f"{tonnes * cu_grade * 22.05:,.0f}",
+            ]
+        else:
+            row.append(f"{tonnes * au_grade * 32.15:,.0f}")
+        rows.append(row)
+    return rows
+
+
+def _render_table(rows: list[list[str]]) -> list[str]:
+    widths = [max(len(row[col]) for row in rows if col < len(row)) for col in range(len(rows[0]))]
+    return ["   ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows]
+
+
+def _cost_table(rng: random.Random) -> list[list[str]]:
+    return [
+        ["Item", "Value", "Unit"],
+        ["Initial capital cost", f"{rng.uniform(200, 1500):,.0f}", "US$M"],
+        ["Operating cost", f"{rng.uniform(15, 60):.2f}", "US$/t"],
+        ["After-tax NPV (5%)", f"{rng.uniform(100, 2500):,.0f}", "US$M"],
+        ["After-tax IRR", f"{rng.uniform(8, 40):.1f}", "%"],
+    ]
+
+
+def generate_report(spec: SyntheticSpec) -> tuple[list[str], list[dict[str, str]]]:
+    """Build page texts plus the statement tables they contain, as Camelot would emit them."""
+    rng = random.Random(spec.seed)
+    pages = max(4, spec.pages)
+    resource_page = int(pages * 0.55)
+    reserve_page = int(pages * 0.65)
+    texts: list[str] = []
+    tables: list[dict[str, str]] = []
+    for page_idx in range(pages):
+        chapter = _CHAPTERS[min(len(_CHAPTERS) - 1, page_idx * len(_CHAPTERS) // pages)]
+        lines = [
+            "Synthetic Gold Project - NI 43-101 Technical Report",
+            f"{page_idx + 1}. {chapter}",
+            "",
+        ]
+        table_rows: list[list[str]] | None = None
+        section = None
+        if page_idx == resource_page:
+            section = "resources"
+            lines.append("Table 14-1: Mineral Resource Statement (effective date 2024-06-30)")
+            table_rows = _resource_table(rng, spec.layout, "resources")
+        elif page_idx == reserve_page:
+            section = "reserves"
+            lines.append("Table 15-1: Mineral Reserve Statement (effective date 2024-06-30)")
+            table_rows = _resource_table(rng, spec.layout, "reserves")
+        elif rng.random() < spec.table_density:
+            table_rows = (
+                _cost_table(rng)
+                if rng.random() < 0.3
+                else _resource_table(rng, spec.layout, "resources")
+            )
+        if table_rows:
+            lines.extend(_render_table(table_rows))
+            lines.append("")
+            if section:
+                tables.append(
+                    {
+                        "page": str(page_idx + 1),
+                        "method": "synthetic",
+                        "text": "\n".join(",".join(f'"{c}"' for c in row) for row in table_rows),
+                    }
+                )
+        while len(lines) < PAGE_LINES - 2:
+            lines.append(rng.choice(_FILLER))
+        lines.append("")
+        lines.append(f"Page {page_idx + 1} of {pages}")
+        texts.append("\n".join(line[:LINE_CHARS] for line in lines))
+    return texts, tables
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(page_texts: list[str], path: Path) -> None:
+    """Write a minimal text-only PDF (one Courier text object per page)."""
+    objects: list[bytes] = []
+    page_ids = [4 + 2 * idx for idx in range(len(page_texts))]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>")
+    for pid, text in zip(page_ids, page_texts):
+        ops = ["BT", "/F1 7 Tf", "9 TL", "36 756 Td"]
+        for line in text.split("\n"):
+            ops.append(f"({_escape(line)}) '")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", errors="replace")
+        objects.append(
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {pid + 1} 0 R >>"
+            ).encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n"
+    ).encode()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(bytes(out))
+
+
+def generate_corpus(
+    output_dir: Path, documents: int, spec: SyntheticSpec
+) -> list[tuple[Path, list[str], list[dict[str, str]]]]:
+    """Write `documents` synthetic PDFs, cycling layouts when spec.layout is "mixed"."""
+    corpus = []
+    for doc_idx in range(documents):
+        layout = LAYOUTS[doc_idx % len(LAYOUTS)] if spec.layout == "mixed" else spec.layout
+        doc_spec = SyntheticSpec(
+            pages=spec.pages,
+            table_density=spec.table_density,
+            layout=layout,
+            seed=spec.seed + doc_idx,
+        )
+        texts, tables = generate_report(doc_spec)
+        path = output_dir / f"synthetic_{doc_idx:03d}_{layout}.pdf"
+        write_pdf(texts, path)
+        corpus.append((path, texts, tables))
+    return corpus
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pipeline.manifest import compact_manifest  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compact run_manifest.jsonl into the legacy run_manifest.json"
+    )
+    parser.add_argument(
+        "--manifest", default="output/run_manifest.jsonl", help="Path to run_manifest.jsonl"
+    )
+    parser.add_argument(
+        "--output", default="output/run_manifest.json", help="Path to write run_manifest.json"
+    )
+    args = parser.parse_args()
+
+    manifest = compact_manifest(Path(args.manifest), Path(args.output))
+    suffix = " (incomplete run: no footer record)" if manifest.get("incomplete") else ""
+    print(f"Wrote {args.output} with {len(manifest['pdfs'])} PDFs{suffix}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,100 +1,149 @@
 from __future__ import annotations
 
 import argparse
-import json
+import sqlite3
+import sys
 from collections import defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
 
-
-def _load_manifest(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pipeline.manifest import iter_records  # noqa: E402
+from pipeline.pricing import ModelPrice, cost_usd, parse_price_overrides  # noqa: E402
+
+_COUNT_KEYS = ("calls", "prompt_tokens", "output_tokens", "cached_tokens", "estimated_calls")
+
+_USAGE_QUERY = """
+SELECT source_pdf, model, COUNT(*), SUM(prompt_tokens), SUM(output_tokens),
+       SUM(cached_tokens), SUM(estimated)
+FROM llm_usage
+WHERE run_id = ?
+GROUP BY source_pdf, model
+ORDER BY source_pdf, model
+"""
+
+
+def latest_run_id(conn: sqlite3.Connection) -> str | None:
+    row = conn.execute("SELECT run_id FROM llm_usage ORDER BY rowid DESC LIMIT 1").fetchone()
+    return row[0] if row else None
+
+
+def load_sqlite_usage(sqlite_path: Path, run_id: str | None) -> tuple[str | None, list[dict]]:
+    """One row per (pdf, model) for the run, aggregated by SQLite."""
+    if not sqlite_path.exists():
+        return run_id, []
+    conn = sqlite3.connect(sqlite_path)
+    try:
+        if not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'llm_usage'"
+        ).fetchone():
+            return run_id, []
+        run_id = run_id or latest_run_id(conn)
+        rows = conn.execute(_USAGE_QUERY, (run_id,)).fetchall() if run_id else []
+    finally:
+        conn.close()
+    return run_id, [dict(zip(("pdf", "model", *_COUNT_KEYS), row)) for row in rows]
+
+
+def load_manifest_usage(manifest_path: Path) -> tuple[str | None, list[dict]]:
+    """Same rows from the per-document usage summaries of a run manifest."""
+    run_id = None
+    rows = []
+    for record in iter_records(manifest_path):
+        if record.get("record") == "header":
+            run_id = record.get("run_id")
+        if record.get("record") != "pdf":
+            continue
+        usage = record.get("usage") or {}
+        for model, totals in usage.get("by_model", {}).items():
+            rows.append(
+                {"pdf": record.get("source_pdf"), "model": model}
+                | {key: totals.get(key, 0) for key in _COUNT_KEYS}
+            )
+    return run_id, rows
 
 
-def _estimate_tokens(chars: int, chars_per_token: float) -> float:
-    if chars_per_token <= 0:
-        return 0.0
-    return chars / chars_per_token
+def price_rows(rows: list[dict], prices: dict[str, ModelPrice]) -> tuple[list[dict], list[str]]:
+    """Attach cost_usd to each row; returns the rows and the models with no known price."""
+    unpriced = set()
+    for row in rows:
+        row["cost_usd"] = cost_usd(
+            row["model"], row["prompt_tokens"], row["output_tokens"], row["cached_tokens"], prices
+        )
+        if row["cost_usd"] is None:
+            unpriced.add(row["model"])
+    return rows, sorted(unpriced)
 
 
-def _read_json_output(output_dir: Path, pdf_name: str) -> int:
-    stem = Path(pdf_name).stem
-    path = output_dir / "json" / f"{stem}.json"
-    if not path.exists():
-        return 0
-    return len(path.read_text(encoding="utf-8"))
+def _totals(rows: list[dict], key: str) -> dict[str, dict[str, float]]:
+    grouped: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for row in rows:
+        target = grouped[row[key]]
+        for name in _COUNT_KEYS:
+            target[name] += row[name] or 0
+        target["cost_usd"] += row["cost_usd"] or 0.0
+    return grouped
+
+
+def _line(name: str, totals: dict[str, float]) -> str:
+    estimated = int(totals["estimated_calls"])
+    return (
+        f"- {name}: calls={int(totals['calls'])}, prompt_tokens={int(totals['prompt_tokens'])}, "
+        f"cached_tokens={int(totals['cached_tokens'])}, "
+        f"output_tokens={int(totals['output_tokens'])}, cost=${round(totals['cost_usd'], 4)}"
+        + (f" ({estimated} estimated)" if estimated else "")
+    )
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(
-        description="Estimate LLM cost from run_manifest.json + JSON outputs"
+        description="Report LLM token usage and cost from the llm_usage table (or a manifest)"
     )
+    parser.add_argument("--sqlite-path", default="output/extractions.db", help="SQLite DB path")
+    parser.add_argument("--run-id", default=None, help="Run to report (default: latest)")
     parser.add_argument(
-        "--manifest", default="output/run_manifest.json", help="Path to run_manifest.json"
+        "--manifest",
+        default=None,
+        help="Read usage from run_manifest.jsonl (or .json) instead of SQLite",
     )
-    parser.add_argument("--output-dir", default="output", help="Output directory with json/ folder")
-    parser.add_argument("--chars-per-token", type=float, default=4.0, help="Approx chars per token")
-    parser.add_argument("--input-per-1m", type=float, default=0.30, help="USD per 1M input tokens")
     parser.add_argument(
-        "--output-per-1m", type=float, default=2.50, help="USD per 1M output tokens"
+        "--price",
+        action="append",
+        default=[],
+        metavar="MODEL=IN,OUT[,CACHED]",
+        help="Override a model price in USD per 1M tokens (repeatable)",
     )
     args = parser.parse_args()
 
-    manifest = _load_manifest(Path(args.manifest))
-    output_dir = Path(args.output_dir)
-
-    totals = defaultdict(float)
-    rows = []
-
-    for metric in manifest.get("pdfs", []):
-        pdf = metric.get("source_pdf")
-        input_chars = sum(metric.get("llm_input_chars", {}).values())
-        output_chars = _read_json_output(output_dir, pdf) if pdf else 0
-        input_tokens = _estimate_tokens(input_chars, args.chars_per_token)
-        output_tokens = _estimate_tokens(output_chars, args.chars_per_token)
-
-        input_cost = (input_tokens / 1_000_000) * args.input_per_1m
-        output_cost = (output_tokens / 1_000_000) * args.output_per_1m
-        total_cost = input_cost + output_cost
-
-        totals["input_chars"] += input_chars
-        totals["output_chars"] += output_chars
-        totals["input_tokens"] += input_tokens
-        totals["output_tokens"] += output_tokens
-        totals["input_cost"] += input_cost
-        totals["output_cost"] += output_cost
-        totals["total_cost"] += total_cost
-
-        rows.append(
-            {
-                "pdf": pdf,
-                "input_chars": int(input_chars),
-                "output_chars": int(output_chars),
-                "input_tokens": round(input_tokens, 1),
-                "output_tokens": round(output_tokens, 1),
-                "estimated_cost_usd": round(total_cost, 4),
-            }
-        )
+    prices = parse_price_overrides(args.price)
+    if args.manifest:
+        run_id, rows = load_manifest_usage(Path(args.manifest))
+    else:
+        run_id, rows = load_sqlite_usage(Path(args.sqlite_path), args.run_id)
+    rows, unpriced = price_rows(rows, prices)
 
     now = datetime.now(timezone.utc).isoformat()
-    print(f"Estimate generated: {now}")
+    print(f"Cost report generated: {now} (run {run_id or 'n/a'})")
     print("Per PDF:")
-    for row in rows:
-        print(
-            "- {pdf}: input_chars={input_chars}, output_chars={output_chars}, "
-            "input_tokens={input_tokens}, output_tokens={output_tokens}, cost=${estimated_cost_usd}".format(
-                **row
-            )
-        )
+    for pdf, totals in _totals(rows, "pdf").items():
+        print(_line(pdf, totals))
+    print("\nPer model:")
+    for model, totals in _totals(rows, "model").items():
+        print(_line(model, totals))
 
+    grand = _totals([{**row, "all": "total"} for row in rows], "all").get("total")
     print("\nTotals:")
-    print(f"- input_chars: {int(totals['input_chars'])}")
-    print(f"- output_chars: {int(totals['output_chars'])}")
-    print(f"- input_tokens: {round(totals['input_tokens'], 1)}")
-    print(f"- output_tokens: {round(totals['output_tokens'], 1)}")
-    print(f"- input_cost_usd: {round(totals['input_cost'], 4)}")
-    print(f"- output_cost_usd: {round(totals['output_cost'], 4)}")
-    print(f"- total_cost_usd: {round(totals['total_cost'], 4)}")
+    if grand:
+        for name in _COUNT_KEYS:
+            print(f"- {name}: {int(grand[name])}")
+        print(f"- total_cost_usd: {round(grand['cost_usd'], 4)}")
+    else:
+        print("- no usage recorded")
+    if unpriced:
+        print(f"\nNo price for: {', '.join(unpriced)} (add --price MODEL=IN,OUT)")
 
 
 if __name__ == "__main__":
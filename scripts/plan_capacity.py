@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pipeline.manifest import iter_records  # noqa: E402
+from pipeline.planner import parse_workers, summarize_plan  # noqa: E402
+
+
+def load_plans(manifest_path: Path) -> list[dict]:
+    """Per-document capacity plans from a dry-run manifest (.jsonl or .json)."""
+    return [
+        record["plan"]
+        for record in iter_records(manifest_path)
+        if record.get("record") == "pdf" and record.get("plan")
+    ]
+
+
+def scale_plans(plans: list[dict], documents: int | None) -> list[dict]:
+    """Repeat the sampled documents up to `documents` to size a larger batch."""
+    if not documents or not plans:
+        return plans
+    return list(itertools.islice(itertools.cycle(plans), documents))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Re-plan workers and quota from the capacity plan of a --dry-run manifest"
+    )
+    parser.add_argument(
+        "--manifest", default="output/run_manifest.jsonl", help="Dry-run manifest path"
+    )
+    parser.add_argument("--workers", default="1", help="Worker counts to simulate, e.g. 8,16,32")
+    parser.add_argument("--rpm", type=int, default=0, help="Request quota (0 = none)")
+    parser.add_argument(
+        "--documents",
+        type=int,
+        default=None,
+        help="Extrapolate the sampled documents to this batch size",
+    )
+    args = parser.parse_args()
+
+    plans = scale_plans(load_plans(Path(args.manifest)), args.documents)
+    summary = summarize_plan(plans, parse_workers(args.workers, 1), args.rpm)
+    if summary is None:
+        print("No capacity plan in manifest (run with --dry-run first)")
+        return
+    print(f"Documents: {summary['documents']}")
+    print(f"- expected_calls: {summary['expected_calls']}")
+    print(f"- prompt_tokens: {summary['prompt_tokens']}")
+    print(f"- output_tokens: {summary['output_tokens']}")
+    print(f"- cost_usd: {summary['cost_usd']}")
+    print(f"- cpu_sec: {summary['cpu_sec']}")
+    print("\nMakespan:")
+    for row in summary["makespan"]:
+        print(
+            f"- workers={row['workers']}, rpm={row['rpm'] or 'unlimited'}: "
+            f"{round(row['makespan_sec'] / 3600, 2)} h ({row['mean_rpm']} requests/min)"
+        )
+
+
+if __name__ == "__main__":
+    main()
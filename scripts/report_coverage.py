@@ -2,11 +2,17 @@ from __future__ import annotations
 
 import argparse
 import csv
-import json
+import sys
 from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
 
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pipeline.manifest import iter_records  # noqa: E402
+
 
 def _read_csv(path: Path) -> list[dict[str, str]]:
     if not path.exists():
@@ -35,10 +41,12 @@ def _economics_with_values(rows: list[dict[str, str]]) -> Counter:
 
 def main() -> None:
     parser = argparse.ArgumentParser(
-        description="Generate coverage report from run_manifest.json and CSV outputs"
+        description="Generate coverage report from the run manifest and CSV outputs"
     )
     parser.add_argument(
-        "--manifest", default="output/run_manifest.json", help="Path to run_manifest.json"
+        "--manifest",
+        default="output/run_manifest.jsonl",
+        help="Path to run_manifest.jsonl (or a legacy run_manifest.json)",
     )
     parser.add_argument("--csv-dir", default="output", help="Directory with CSV outputs")
     parser.add_argument(
@@ -50,9 +58,6 @@ def main() -> None:
     csv_dir = Path(args.csv_dir)
     output_path = Path(args.output)
 
-    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
-    pdf_metrics = manifest.get("pdfs", [])
-
     resources_rows = _read_csv(csv_dir / "resources.csv")
     reserves_rows = _read_csv(csv_dir / "reserves.csv")
     economics_rows = _read_csv(csv_dir / "economics.csv")
@@ -62,16 +67,54 @@ def main() -> None:
     economics_counts = _count_rows(economics_rows, "source_pdf")
     economics_with_values = _economics_with_values(economics_rows)
 
+    run: dict = {}
+    pdf_count = 0
+    failed_count = 0
+    pdf_lines = []
+    # Stream the manifest: only the rendered rows are kept, never the per-PDF metrics.
+    for metric in iter_records(manifest_path):
+        kind = metric.pop("record", None)
+        if kind in ("header", "footer"):
+            run.update(metric)
+            continue
+        if kind != "pdf":
+            continue
+        pdf_count += 1
+        failed_count += metric.get("status") == "failed"
+        pdf = metric.get("source_pdf")
+        durations = metric.get("durations_sec", {})
+        total = durations.get("total")
+        warnings = metric.get("warnings") or []
+        no_reserves = "yes" if metric.get("no_reserves_pages") else ""
+        no_econ = "yes" if metric.get("no_economics_pages") else ""
+        pdf_lines.append(
+            "| {} | {} | {} | {} | {} | {} | {} | {} | {} | {} | {} |".format(
+                pdf,
+                resources_counts.get(pdf, 0),
+                reserves_counts.get(pdf, 0),
+                economics_counts.get(pdf, 0),
+                economics_with_values.get(pdf, 0),
+                len(warnings),
+                no_reserves,
+                no_econ,
+                total,
+                metric.get("page_count"),
+                metric.get("cache_hit"),
+            )
+        )
+
     now = datetime.now(timezone.utc).isoformat()
     summary = {
-        "pdfs": len(pdf_metrics),
+        "pdfs": pdf_count,
+        "failed_pdfs": len(run["failed_pdfs"]) if "failed_pdfs" in run else failed_count,
+        "skipped_pdfs": len(run.get("skipped_pdfs") or []),
         "resources_rows": len(resources_rows),
         "reserves_rows": len(reserves_rows),
         "economics_rows": len(economics_rows),
         "economics_with_values": sum(economics_with_values.values()),
-        "run_id": manifest.get("run_id"),
-        "duration_sec": manifest.get("duration_sec"),
-        "strategy": manifest.get("settings", {}).get("extraction_strategy"),
+        "run_id": run.get("run_id"),
+        "duration_sec": run.get("duration_sec"),
+        "strategy": run.get("settings", {}).get("extraction_strategy"),
     }
 
     lines = [
@@ -94,29 +137,7 @@ def main() -> None:
             "| --- | --- | --- | --- | --- | --- | --- | --- | --- | --- | --- |",
         ]
     )
-
-    for metric in pdf_metrics:
-        pdf = metric.get("source_pdf")
-        durations = metric.get("durations_sec", {})
-        total = durations.get("total")
-        warnings = metric.get("warnings") or []
-        no_reserves = "yes" if metric.get("no_reserves_pages") else ""
-        no_econ = "yes" if metric.get("no_economics_pages") else ""
-        lines.append(
-            "| {} | {} | {} | {} | {} | {} | {} | {} | {} | {} | {} |".format(
-                pdf,
-                resources_counts.get(pdf, 0),
-                reserves_counts.get(pdf, 0),
-                economics_counts.get(pdf, 0),
-                economics_with_values.get(pdf, 0),
-                len(warnings),
-                no_reserves,
-                no_econ,
-                total,
-                metric.get("page_count"),
-                metric.get("cache_hit"),
-            )
-        )
+    lines.extend(pdf_lines)
 
     output_path.write_text("\n".join(lines), encoding="utf-8")
     print(f"Wrote {output_path}")
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pipeline.page_index import search_pages  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Full-text search over the page text indexed in extractions.db"
+    )
+    parser.add_argument("query", help='FTS5 query, e.g. "cut-off grade" or deposit NEAR/5 porphyry')
+    parser.add_argument("--sqlite-path", default="output/extractions.db", help="SQLite DB path")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum pages to return")
+    parser.add_argument("--pdf", default=None, help="Restrict hits to one source PDF")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        hits = search_pages(
+            Path(args.sqlite_path), args.query, limit=args.limit, source_pdf=args.pdf
+        )
+    except (FileNotFoundError, ValueError) as exc:
+        parser.exit(1, f"error: {exc}\n")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for hit in hits:
+        print(f"{hit.score:7.2f}  {hit.source_pdf} p.{hit.page}: {hit.snippet}")
+    print(f"\n{len(hits)} hits in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Iterable
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class Bm25Index:
+    """Inverted index over the pages of one document with BM25 scoring."""
+
+    def __init__(
+        self,
+        postings: dict[str, list[tuple[int, int]]],
+        doc_lengths: list[int],
+        k1: float = 1.5,
+        b: float = 0.75,
+    ) -> None:
+        self.postings = postings
+        self.doc_lengths = doc_lengths
+        self.k1 = k1
+        self.b = b
+        avgdl = sum(doc_lengths) / len(doc_lengths) if doc_lengths else 0.0
+        # Length normalisation only depends on the page, so compute it once.
+        self._norms = [k1 * (1 - b + b * (dl / avgdl if avgdl else 0.0)) for dl in doc_lengths]
+        self._memo: dict[tuple[str, ...], dict[int, float]] = {}
+
+    @classmethod
+    def build(cls, page_texts: Iterable[str]) -> Bm25Index:
+        builder = Bm25Builder()
+        for text in page_texts:
+            builder.add(text)
+        return builder.build()
+
+    def score(self, terms: Iterable[str]) -> dict[int, float]:
+        key = tuple(sorted(set(terms)))
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+        total = len(self.doc_lengths)
+        scores: dict[int, float] = defaultdict(float)
+        for term in key:
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            df = len(posting)
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            k1 = self.k1
+            norms = self._norms
+            for page, tf in posting:
+                scores[page] += idf * tf * (k1 + 1) / (tf + norms[page])
+        result = dict(scores)
+        self._memo[key] = result
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "doc_lengths": self.doc_lengths,
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> Bm25Index:
+        postings = {
+            term: [(int(page), int(tf)) for page, tf in entries]
+            for term, entries in payload["postings"].items()
+        }
+        return cls(postings, list(payload["doc_lengths"]), payload["k1"], payload["b"])
+
+
+class Bm25Builder:
+    """Adds pages one at a time, so the index can be built inside another page scan."""
+
+    def __init__(self) -> None:
+        self.postings: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        self.doc_lengths: list[int] = []
+
+    def add(self, text: str) -> None:
+        idx = len(self.doc_lengths)
+        tokens = tokenize(text)
+        self.doc_lengths.append(len(tokens))
+        for term, tf in Counter(tokens).items():
+            self.postings[term].append((idx, tf))
+
+    def build(self) -> Bm25Index:
+        return Bm25Index(dict(self.postings), self.doc_lengths)
+
+
+def load_cached_index(cache_dir: Path, digest: str) -> Bm25Index | None:
+    # Keyed by page content so any change to extraction or stripping rebuilds the index.
+    cache_path = cache_dir / f"{digest}.json"
+    if not cache_path.exists():
+        return None
+    try:
+        return Bm25Index.from_dict(json.loads(cache_path.read_text(encoding="utf-8")))
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def save_index(index: Bm25Index, cache_dir: Path, digest: str) -> None:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    (cache_dir / f"{digest}.json").write_text(json.dumps(index.to_dict()), encoding="utf-8")
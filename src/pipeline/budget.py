@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from typing import Any, Callable
+
+from .config import Settings
+from .pricing import price_for
+
+# Applied in order, one step per completed document while the run stays over its soft limit.
+DEGRADATION_STEPS = ("no_retries", "shrink_context", "switch_model")
+
+
+def billed_models(settings: Settings) -> list[str]:
+    """Every model a run with these settings may send billed calls to."""
+    models = [settings.model_name]
+    models += [model.strip() for model in settings.cascade_models.split(",") if model.strip()]
+    if settings.use_retry_model and settings.retry_model:
+        models.append(settings.retry_model)
+    if settings.budget_fallback_model:
+        models.append(settings.budget_fallback_model)
+    if settings.embeddings_enabled and settings.embedding_provider == "gemini":
+        models.append(settings.embedding_model)
+    return list(dict.fromkeys(models))
+
+
+class BudgetController:
+    """Tracks spend and wall time for a run, degrades settings, and enforces a hard cap.
+
+    `max_usd` and `max_wall_sec` are hard caps (0 disables each). Once actual usage passes
+    `soft_fraction` of a cap, or the projection for the whole batch exceeds it, the next
+    degradation step is applied to documents scheduled from then on.
+    """
+
+    def __init__(
+        self,
+        total_documents: int,
+        max_usd: float = 0.0,
+        max_wall_sec: float = 0.0,
+        soft_fraction: float = 0.8,
+        workers: int = 1,
+        fallback_model: str = "",
+        context_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        context_shrinkable: bool = True,
+    ) -> None:
+        self.total_documents = total_documents
+        self.max_usd = max_usd
+        self.max_wall_sec = max_wall_sec
+        self.soft_fraction = soft_fraction
+        self.workers = max(1, workers)
+        self.fallback_model = fallback_model
+        self.context_factor = context_factor
+        # Steps that cannot change anything are left out rather than logged as applied:
+        # no fallback model to switch to, or contexts already packed by `prepare`.
+        self.steps = [
+            step
+            for step in DEGRADATION_STEPS
+            if (step != "switch_model" or fallback_model)
+            and (step != "shrink_context" or context_shrinkable)
+        ]
+        self.level = 0
+        self.stopped = False
+        self.spent_usd = 0.0
+        self.documents_done = 0
+        self.document_sec = 0.0
+        self.timed_documents = 0
+        self.decisions: list[dict[str, Any]] = []
+        self._unreported: list[dict[str, Any]] = []
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(
+        cls, settings: Settings, total_documents: int, context_shrinkable: bool = True
+    ) -> BudgetController | None:
+        if settings.budget_usd <= 0 and settings.budget_wall_sec <= 0:
+            return None
+        if settings.budget_usd > 0:
+            unpriced = [model for model in billed_models(settings) if price_for(model) is None]
+            if unpriced:
+                # Their calls would count as $0 and the cap would never trigger.
+                raise ValueError(
+                    f"BUDGET_USD needs a price for every model the run may call; "
+                    f"no price for: {', '.join(unpriced)} (add it to pricing.PRICES)"
+                )
+        return cls(
+            total_documents,
+            max_usd=settings.budget_usd,
+            max_wall_sec=settings.budget_wall_sec,
+            soft_fraction=settings.budget_soft_fraction,
+            workers=settings.max_workers,
+            fallback_model=settings.budget_fallback_model,
+            context_factor=settings.budget_context_factor,
+            context_shrinkable=context_shrinkable,
+        )
+
+    def elapsed(self) -> float:
+        return self._clock() - self._started
+
+    def _projection(self) -> tuple[float | None, float | None]:
+        remaining = max(0, self.total_documents - self.documents_done)
+        usd = None
+        if self.documents_done:
+            usd = self.spent_usd + self.spent_usd / self.documents_done * remaining
+        sec = None
+        if self.timed_documents:
+            per_document = self.document_sec / self.timed_documents
+            sec = self.elapsed() + per_document * remaining / self.workers
+        return usd, sec
+
+    def _snapshot(self) -> dict[str, Any]:
+        usd, sec = self._projection()
+        return {
+            "spent_usd": round(self.spent_usd, 6),
+            "projected_usd": round(usd, 6) if usd is not None else None,
+            "elapsed_sec": round(self.elapsed(), 3),
+            "projected_sec": round(sec, 3) if sec is not None else None,
+            "documents_done": self.documents_done,
+        }
+
+    def _over(self, actual: float, projected: float | None, cap: float) -> tuple[bool, bool]:
+        if cap <= 0:
+            return False, False
+        soft = actual >= cap * self.soft_fraction or (projected is not None and projected > cap)
+        return soft, actual >= cap
+
+    def observe(self, metrics: dict[str, Any], duration_sec: float | None) -> None:
+        """Account one finished document and take at most one new decision."""
+        with self._lock:
+            usage = metrics.get("usage") or {}
+            cost = usage.get("cost_usd")
+            if cost is None:
+                # One unpriced call voids the document total; keep what is priced.
+                cost = sum(
+                    totals.get("cost_usd") or 0.0
+                    for totals in (usage.get("by_model") or {}).values()
+                )
+            self.spent_usd += cost
+            self.documents_done += 1
+            if duration_sec is not None:
+                self.document_sec += duration_sec
+                self.timed_documents += 1
+            usd, sec = self._projection()
+            soft_usd, hard_usd = self._over(self.spent_usd, usd, self.max_usd)
+            soft_sec, hard_sec = self._over(self.elapsed(), sec, self.max_wall_sec)
+            if (hard_usd or hard_sec) and not self.stopped:
+                self.stopped = True
+                self._decide("stop", "spend" if hard_usd else "wall_time")
+            elif (soft_usd or soft_sec) and self.level < len(self.steps):
+                self.level += 1
+                self._decide(self.steps[self.level - 1], "spend" if soft_usd else "wall_time")
+
+    def _decide(self, action: str, trigger: str) -> None:
+        decision = {"action": action, "trigger": trigger, **self._snapshot()}
+        self.decisions.append(decision)
+        self._unreported.append(decision)
+
+    def pop_decisions(self) -> list[dict[str, Any]]:
+        """Decisions taken since the last call, for the manifest and the log."""
+        with self._lock:
+            decisions, self._unreported = self._unreported, []
+        return decisions
+
+    def can_schedule(self) -> bool:
+        with self._lock:
+            if self.stopped:
+                return False
+            if self.max_wall_sec > 0 and self.elapsed() >= self.max_wall_sec:
+                self.stopped = True
+                self._decide("stop", "wall_time")
+                return False
+            return True
+
+    def apply(self, settings: Settings) -> tuple[Settings, list[str]]:
+        """Settings for the next document with the current degradation steps applied."""
+        with self._lock:
+            applied = self.steps[: self.level]
+        if not applied:
+            return settings, []
+        degraded = copy.copy(settings)
+        if "no_retries" in applied:
+            degraded.retries_enabled = False
+            degraded.use_retry_model = False
+            # Hedged duplicates are billed too.
+            degraded.call_hedge_percentile = 0.0
+        if "shrink_context" in applied:
+            degraded.section_token_budget = max(
+                1000, int(settings.section_token_budget * self.context_factor)
+            )
+        if "switch_model" in applied:
+            degraded.model_name = self.fallback_model
+            # Escalating to stronger tiers would undo the switch.
+            degraded.cascade_models = ""
+        return degraded, list(applied)
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_usd": self.max_usd or None,
+                "max_wall_sec": self.max_wall_sec or None,
+                "level": self.level,
+                "applied": self.steps[: self.level],
+                "stopped": self.stopped,
+                **self._snapshot(),
+            }
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from .models import ExtractionResult
+
+
+def run_dir(output_dir: Path, run_id: str) -> Path:
+    return output_dir / "runs" / run_id
+
+
+def _signature(pdf_path: Path) -> str:
+    stat = pdf_path.stat()
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _checkpoint_path(checkpoint_dir: Path, pdf_path: Path) -> Path:
+    digest = hashlib.sha256(str(pdf_path.resolve()).encode("utf-8")).hexdigest()[:12]
+    return checkpoint_dir / f"{pdf_path.stem}-{digest}.json"
+
+
+def write_checkpoint(
+    checkpoint_dir: Path, pdf_path: Path, result: ExtractionResult, metrics: dict
+) -> None:
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    path = _checkpoint_path(checkpoint_dir, pdf_path)
+    payload = {
+        "source_pdf": pdf_path.name,
+        "signature": _signature(pdf_path),
+        "result": result.model_dump(mode="json"),
+        "metrics": metrics,
+    }
+    # Write then rename so a crash mid-write never leaves a truncated checkpoint behind.
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(checkpoint_dir: Path, pdf_path: Path) -> tuple[ExtractionResult, dict] | None:
+    """Return the stored result for an unchanged PDF, or None if it must be reprocessed."""
+    path = _checkpoint_path(checkpoint_dir, pdf_path)
+    if not path.exists():
+        return None
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if payload.get("signature") != _signature(pdf_path):
+            return None
+        return ExtractionResult.model_validate(payload["result"]), dict(payload["metrics"])
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
@@ -3,6 +3,10 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass, field
 
+# Shared with the selector so callers that pass a BM25 index without a weight rank
+# pages the same way the pipeline does.
+DEFAULT_BM25_WEIGHT = 3.0
+
 
 @dataclass
 class Settings:
@@ -15,18 +19,80 @@ class Settings:
     extraction_mode: str = "smart"  # full | smart
     extraction_strategy: str = "two_stage"  # two_stage | single
     max_chars: int = 350000
-    llm_provider: str = "gemini"  # gemini | mock
+    section_token_budget: int = 32000
+    combined_call_max_tokens: int = 16000
+    table_parser_enabled: bool = True
+    table_parser_min_confidence: float = 0.8
+    llm_provider: str = "gemini"  # gemini | mock | simulated
+    structured_output: bool = True
     page_window: int = 1
+    # Off until a labelled selection comparison shows BM25 beats raw keyword hits.
+    bm25_enabled: bool = False
+    bm25_weight: float = DEFAULT_BM25_WEIGHT
+    strip_boilerplate: bool = True
+    boilerplate_min_fraction: float = 0.5
+    page_lru_size: int = 64
+    page_index_enabled: bool = True
     max_workers: int = 1
     log_level: str = "INFO"
     log_dir: str | None = None
+    log_sample_rates: str = ""
+    manifest_json: bool = True
     dry_run: bool = False
+    # Dry-run capacity plan: worker counts to simulate (comma-separated; default max_workers),
+    # request quota in RPM (0 = none) and manifests to learn retry rates and latency from
+    # (comma-separated; default the previous run's manifest in output_dir).
+    plan_workers: str = ""
+    plan_rpm: int = 0
+    plan_history: str = ""
+
+    # Parquet datasets (hive-partitioned by ingest_date/run_id; needs pyarrow)
+    parquet_enabled: bool = False
+    parquet_dir: str | None = None
+    parquet_row_group_size: int = 50_000
     sections: list[str] = field(
         default_factory=lambda: ["metadata", "resources", "reserves", "economics"]
     )
 
+    # Profiling (opt-in; sampled documents get cProfile + tracemalloc per stage)
+    profile_enabled: bool = False
+    profile_sample_rate: float = 0.1
+    profile_top_n: int = 30
+    profile_memory: bool = True
+
+    # Tracing / metrics export
+    tracing_enabled: bool = False
+    metrics_textfile: str | None = None
+    metrics_port: int = 0
+
+    # Run budget (0 disables a cap); past budget_soft_fraction the run degrades step by step
+    budget_usd: float = 0.0
+    budget_wall_sec: float = 0.0
+    budget_soft_fraction: float = 0.8
+    budget_fallback_model: str = ""
+    budget_context_factor: float = 0.5
+
+    # Provider call resilience (LLM + embeddings)
+    call_max_attempts: int = 4
+    call_backoff_base_sec: float = 1.0
+    call_backoff_max_sec: float = 30.0
+    call_deadline_sec: float = 300.0
+    call_hedge_percentile: float = 0.0
+
+    # Simulated provider (offline load tests)
+    sim_seed: int = 0
+    sim_latency_ms: float = 800.0
+    sim_latency_per_1k_tokens_ms: float = 60.0
+    sim_latency_sigma: float = 0.35
+    sim_error_rate_429: float = 0.0
+    sim_error_rate_500: float = 0.0
+    sim_rpm_limit: int = 0
+    sim_time_scale: float = 1.0
+
     # Embeddings
     embeddings_enabled: bool = True
+    embedding_provider: str = "gemini"  # gemini | local
+    embedding_dimensions: int = 256
     embedding_model: str = "models/text-embedding-004"
     embedding_max_chars: int = 4000
     embedding_max_pages: int = 60
@@ -35,6 +101,11 @@ class Settings:
     retries_enabled: bool = True
     retry_model: str = ""
     use_retry_model: bool = False
+    retry_delta_only: bool = True
+
+    # Model cascade: comma-separated models, cheapest first. Sections start on the first and
+    # move up only when quality checks flag the result (empty rows, filtered categories...).
+    cascade_models: str = ""
 
     def __post_init__(self) -> None:
         self.data_dir = os.getenv("DATA_DIR", self.data_dir)
@@ -46,12 +117,61 @@ class Settings:
         self.extraction_mode = os.getenv("EXTRACTION_MODE", self.extraction_mode)
         self.extraction_strategy = os.getenv("EXTRACTION_STRATEGY", self.extraction_strategy)
         self.max_chars = int(os.getenv("MAX_CHARS", str(self.max_chars)))
+        self.section_token_budget = int(
+            os.getenv("SECTION_TOKEN_BUDGET", str(self.section_token_budget))
+        )
+        self.combined_call_max_tokens = int(
+            os.getenv("COMBINED_CALL_MAX_TOKENS", str(self.combined_call_max_tokens))
+        )
+        self.table_parser_enabled = os.getenv(
+            "TABLE_PARSER_ENABLED", str(self.table_parser_enabled)
+        ).lower() in ["1", "true", "yes"]
+        self.table_parser_min_confidence = float(
+            os.getenv("TABLE_PARSER_MIN_CONFIDENCE", str(self.table_parser_min_confidence))
+        )
         self.llm_provider = os.getenv("LLM_PROVIDER", self.llm_provider)
+        self.structured_output = os.getenv(
+            "STRUCTURED_OUTPUT", str(self.structured_output)
+        ).lower() in ["1", "true", "yes"]
         self.page_window = int(os.getenv("PAGE_WINDOW", str(self.page_window)))
+        self.bm25_enabled = os.getenv("BM25_ENABLED", str(self.bm25_enabled)).lower() in [
+            "1",
+            "true",
+            "yes",
+        ]
+        self.bm25_weight = float(os.getenv("BM25_WEIGHT", str(self.bm25_weight)))
+        self.strip_boilerplate = os.getenv(
+            "STRIP_BOILERPLATE", str(self.strip_boilerplate)
+        ).lower() in ["1", "true", "yes"]
+        self.boilerplate_min_fraction = float(
+            os.getenv("BOILERPLATE_MIN_FRACTION", str(self.boilerplate_min_fraction))
+        )
+        self.page_lru_size = int(os.getenv("PAGE_LRU_SIZE", str(self.page_lru_size)))
+        self.page_index_enabled = os.getenv(
+            "PAGE_INDEX_ENABLED", str(self.page_index_enabled)
+        ).lower() in ["1", "true", "yes"]
         self.max_workers = int(os.getenv("MAX_WORKERS", str(self.max_workers)))
         self.log_level = os.getenv("LOG_LEVEL", self.log_level)
         self.log_dir = os.getenv("LOG_DIR", self.log_dir)
+        self.log_sample_rates = os.getenv("LOG_SAMPLE_RATES", self.log_sample_rates)
+        self.manifest_json = os.getenv("MANIFEST_JSON", str(self.manifest_json)).lower() in [
+            "1",
+            "true",
+            "yes",
+        ]
         self.dry_run = os.getenv("DRY_RUN", str(self.dry_run)).lower() in ["1", "true", "yes"]
+        self.plan_workers = os.getenv("PLAN_WORKERS", self.plan_workers)
+        self.plan_rpm = int(os.getenv("PLAN_RPM", str(self.plan_rpm)))
+        self.plan_history = os.getenv("PLAN_HISTORY", self.plan_history)
+        self.parquet_enabled = os.getenv("PARQUET_ENABLED", str(self.parquet_enabled)).lower() in [
+            "1",
+            "true",
+            "yes",
+        ]
+        self.parquet_dir = os.getenv("PARQUET_DIR", self.parquet_dir) or None
+        self.parquet_row_group_size = int(
+            os.getenv("PARQUET_ROW_GROUP_SIZE", str(self.parquet_row_group_size))
+        )
 
         sections_env = os.getenv("SECTIONS")
         if sections_env:
@@ -59,6 +179,61 @@ class Settings:
                 section.strip() for section in sections_env.split(",") if section.strip()
             ]
 
+        self.profile_enabled = os.getenv("PROFILE_ENABLED", str(self.profile_enabled)).lower() in [
+            "1",
+            "true",
+            "yes",
+        ]
+        self.profile_sample_rate = float(
+            os.getenv("PROFILE_SAMPLE_RATE", str(self.profile_sample_rate))
+        )
+        self.profile_top_n = int(os.getenv("PROFILE_TOP_N", str(self.profile_top_n)))
+        self.profile_memory = os.getenv("PROFILE_MEMORY", str(self.profile_memory)).lower() in [
+            "1",
+            "true",
+            "yes",
+        ]
+        self.tracing_enabled = os.getenv("TRACING_ENABLED", str(self.tracing_enabled)).lower() in [
+            "1",
+            "true",
+            "yes",
+        ]
+        self.metrics_textfile = os.getenv("METRICS_TEXTFILE", self.metrics_textfile) or None
+        self.metrics_port = int(os.getenv("METRICS_PORT", str(self.metrics_port)))
+        self.budget_usd = float(os.getenv("BUDGET_USD", str(self.budget_usd)))
+        self.budget_wall_sec = float(os.getenv("BUDGET_WALL_SEC", str(self.budget_wall_sec)))
+        self.budget_soft_fraction = float(
+            os.getenv("BUDGET_SOFT_FRACTION", str(self.budget_soft_fraction))
+        )
+        self.budget_fallback_model = os.getenv("BUDGET_FALLBACK_MODEL", self.budget_fallback_model)
+        self.budget_context_factor = float(
+            os.getenv("BUDGET_CONTEXT_FACTOR", str(self.budget_context_factor))
+        )
+        self.call_max_attempts = int(os.getenv("CALL_MAX_ATTEMPTS", str(self.call_max_attempts)))
+        self.call_backoff_base_sec = float(
+            os.getenv("CALL_BACKOFF_BASE_SEC", str(self.call_backoff_base_sec))
+        )
+        self.call_backoff_max_sec = float(
+            os.getenv("CALL_BACKOFF_MAX_SEC", str(self.call_backoff_max_sec))
+        )
+        self.call_deadline_sec = float(os.getenv("CALL_DEADLINE_SEC", str(self.call_deadline_sec)))
+        self.call_hedge_percentile = float(
+            os.getenv("CALL_HEDGE_PERCENTILE", str(self.call_hedge_percentile))
+        )
+        self.sim_seed = int(os.getenv("SIM_SEED", str(self.sim_seed)))
+        self.sim_latency_ms = float(os.getenv("SIM_LATENCY_MS", str(self.sim_latency_ms)))
+        self.sim_latency_per_1k_tokens_ms = float(
+            os.getenv("SIM_LATENCY_PER_1K_TOKENS_MS", str(self.sim_latency_per_1k_tokens_ms))
+        )
+        self.sim_latency_sigma = float(os.getenv("SIM_LATENCY_SIGMA", str(self.sim_latency_sigma)))
+        self.sim_error_rate_429 = float(
+            os.getenv("SIM_ERROR_RATE_429", str(self.sim_error_rate_429))
+        )
+        self.sim_error_rate_500 = float(
+            os.getenv("SIM_ERROR_RATE_500", str(self.sim_error_rate_500))
+        )
+        self.sim_rpm_limit = int(os.getenv("SIM_RPM_LIMIT", str(self.sim_rpm_limit)))
+        self.sim_time_scale = float(os.getenv("SIM_TIME_SCALE", str(self.sim_time_scale)))
         self.embeddings_enabled = os.getenv(
             "EMBEDDINGS_ENABLED", str(self.embeddings_enabled)
         ).lower() in [
@@ -66,6 +241,10 @@ class Settings:
             "true",
             "yes",
         ]
+        self.embedding_provider = os.getenv("EMBEDDING_PROVIDER", self.embedding_provider)
+        self.embedding_dimensions = int(
+            os.getenv("EMBEDDING_DIMENSIONS", str(self.embedding_dimensions))
+        )
         self.embedding_model = os.getenv("EMBEDDING_MODEL", self.embedding_model)
         self.embedding_max_chars = int(
             os.getenv("EMBEDDING_MAX_CHARS", str(self.embedding_max_chars))
@@ -85,3 +264,7 @@ class Settings:
             "true",
             "yes",
         ]
+        self.retry_delta_only = os.getenv(
+            "RETRY_DELTA_ONLY", str(self.retry_delta_only)
+        ).lower() in ["1", "true", "yes"]
+        self.cascade_models = os.getenv("CASCADE_MODELS", self.cascade_models)
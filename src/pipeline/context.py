@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field, replace
+from difflib import SequenceMatcher
+from typing import Any, Iterable, Sequence
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d|[^\sA-Za-z\d]")
+_PAGE_CHUNK_SPLIT = re.compile(r"\n\n(?=Page \d+:)")
+_PAGE_HEADER = re.compile(r"^Page (\d+):")
+_LABEL_PAGE = re.compile(r"^Page (\d+)")
+
+
+def estimate_tokens(text: str) -> int:
+    # Prose averages ~4 chars per token, but digits and punctuation in numeric tables
+    # tokenize close to one token each, so count them separately.
+    tokens = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        piece = match.group(0)
+        if piece[0].isalpha():
+            tokens += (len(piece) + 3) // 4
+        else:
+            tokens += 1
+    return tokens
+
+
+@dataclass
+class ContextUnit:
+    label: str
+    text: str
+    score: float
+    kind: str = "page"  # page | table
+    tokens: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.tokens:
+            self.tokens = estimate_tokens(self.render())
+
+    def render(self) -> str:
+        return f"{self.label}:\n{self.text}" if self.label else self.text
+
+
+@dataclass
+class PackedContext:
+    text: str
+    budget_tokens: int
+    used_tokens: int
+    units_total: int
+    units_kept: int
+    dropped: list[str] = field(default_factory=list)
+    units: list[ContextUnit] = field(default_factory=list)
+
+    def stats(self) -> dict[str, Any]:
+        utilization = self.used_tokens / self.budget_tokens if self.budget_tokens else None
+        return {
+            "budget_tokens": self.budget_tokens,
+            "used_tokens": self.used_tokens,
+            "utilization": round(utilization, 3) if utilization is not None else None,
+            "units_total": self.units_total,
+            "units_kept": self.units_kept,
+            "dropped": self.dropped,
+        }
+
+
+def page_units(context: str, page_scores: dict[int, float]) -> list[ContextUnit]:
+    """Split a `Page N:` context back into one unit per page, scored by selection rank.
+
+    Text outside any `Page N:` chunk is kept as an unlabeled unit with the lowest score.
+    """
+    units: list[ContextUnit] = []
+    if not context:
+        return units
+    for chunk in _PAGE_CHUNK_SPLIT.split(context):
+        header, _, body = chunk.partition("\n")
+        match = _PAGE_HEADER.match(header)
+        if not match:
+            if chunk.strip():
+                units.append(ContextUnit(label="", text=chunk.strip(), score=0.0))
+            continue
+        if not body.strip():
+            continue
+        page_idx = int(match.group(1)) - 1
+        units.append(
+            ContextUnit(
+                label=header.rstrip(":"),
+                text=body,
+                score=page_scores.get(page_idx, 0.0),
+            )
+        )
+    return units
+
+
+def _label_page(unit: ContextUnit) -> int:
+    match = _LABEL_PAGE.match(unit.label)
+    return int(match.group(1)) if match else 0
+
+
+def _union_lines(first: str, second: str) -> str:
+    """Lines of two snippets of one page, each kept once and in page order."""
+    a, b = first.splitlines(), second.splitlines()
+    lines: list[str] = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        lines += a[i1:i2]
+        if tag != "equal":
+            lines += b[j1:j2]
+    return "\n".join(lines)
+
+
+def merge_units(unit_lists: Iterable[Sequence[ContextUnit]]) -> list[ContextUnit]:
+    """Union of units from several sections, deduplicated and ordered by page.
+
+    A page packed whole for one section and cut to fit for another is one unit: the wider
+    text is kept with the best score. Different snippets of one page, focused on different
+    sections, merge into the union of their lines. Tables on the same page merge only when
+    one text contains the other, since a page can hold several distinct tables.
+    """
+    merged: dict[tuple[int, str], list[ContextUnit]] = {}
+    for units in unit_lists:
+        for unit in units:
+            same_page = merged.setdefault((_label_page(unit), unit.kind), [])
+            for pos, seen in enumerate(same_page):
+                score = max(unit.score, seen.score)
+                if unit.text in seen.text or seen.text in unit.text:
+                    wider = unit if len(unit.text) > len(seen.text) else seen
+                    same_page[pos] = replace(wider, score=score)
+                elif unit.kind == "table":
+                    continue
+                else:
+                    text = _union_lines(seen.text, unit.text)
+                    same_page[pos] = ContextUnit(seen.label, text, score, seen.kind)
+                break
+            else:
+                same_page.append(unit)
+
+    return sorted(
+        (unit for units in merged.values() for unit in units),
+        key=lambda unit: (unit.kind != "table", _label_page(unit)),
+    )
+
+
+def _take(
+    candidates: Sequence[ContextUnit], budget: int, kept: list[ContextUnit]
+) -> tuple[int, list[ContextUnit]]:
+    used = 0
+    rest: list[ContextUnit] = []
+    for unit in sorted(candidates, key=lambda u: u.score, reverse=True):
+        if used + unit.tokens <= budget:
+            kept.append(unit)
+            used += unit.tokens
+        else:
+            rest.append(unit)
+    return used, rest
+
+
+def pack_context(
+    units: Sequence[ContextUnit], token_budget: int, table_share: float = 0.4
+) -> PackedContext:
+    """Pack whole units by score under a token budget; tables first, then pages in order."""
+    if token_budget <= 0:
+        kept = list(units)
+        used = sum(unit.tokens for unit in kept)
+        dropped: list[str] = []
+    else:
+        tables = [unit for unit in units if unit.kind == "table"]
+        pages = [unit for unit in units if unit.kind != "table"]
+        # Keep a budget for tables because they carry dense numeric signals, but let
+        # pages claim it when there are no tables (and vice versa).
+        table_budget = int(token_budget * table_share) if pages else token_budget
+        kept = []
+        used, tables_left = _take(tables, table_budget, kept)
+        page_used, pages_left = _take(pages, token_budget - used, kept)
+        used += page_used
+        table_used, tables_left = _take(tables_left, token_budget - used, kept)
+        used += table_used
+        leftovers = tables_left + pages_left
+        if not kept and leftovers:
+            # A single unit larger than the whole budget: keep the best one, cut to fit.
+            best = max(leftovers, key=lambda u: u.score)
+            ratio = token_budget / max(1, best.tokens)
+            text = best.text[: int(len(best.text) * ratio)]
+            kept.append(ContextUnit(best.label, text, best.score, best.kind, tokens=token_budget))
+            used = token_budget
+            leftovers = [unit for unit in leftovers if unit is not best]
+        dropped = [unit.label or "(unlabeled)" for unit in leftovers]
+
+    order = {id(unit): pos for pos, unit in enumerate(units)}
+    kept.sort(key=lambda u: (u.kind != "table", order.get(id(u), len(order))))
+    return PackedContext(
+        text="\n\n".join(unit.render() for unit in kept),
+        budget_tokens=token_budget,
+        used_tokens=used,
+        units_total=len(units),
+        units_kept=len(kept),
+        dropped=dropped,
+        units=kept,
+    )
@@ -3,11 +3,18 @@ from __future__ import annotations
 import hashlib
 import json
 import math
+import re
+import time
+import zlib
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Sequence
 
+from .context import estimate_tokens
 from .genai_client import extract_embedding, get_genai_client
+from .metrics import record_cache
+from .resilience import RetryPolicy, call_with_retries
+from .usage import record_usage
 
 
 @dataclass
@@ -17,6 +24,9 @@ class EmbeddingSettings:
     model_name: str
     max_chars: int
     max_pages: int
+    provider: str = "gemini"  # gemini | local
+    dimensions: int = 256
+    retry: RetryPolicy = RetryPolicy()
 
 
 def _hash_text(model_name: str, text: str) -> str:
@@ -39,6 +49,36 @@ def cosine_similarity(vec_a: Iterable[float] | None, vec_b: Iterable[float] | No
     return dot / (norm_a * norm_b)
 
 
+def _hashed_features(text: str) -> list[str]:
+    tokens = re.findall(r"[a-z0-9]+", text.lower())
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def local_embeddings(texts: Sequence[str], dimensions: int = 256) -> list[list[float]]:
+    """Hashed TF-IDF vectors with IDF computed across the batch; no network or model."""
+    import numpy as np
+
+    counts = np.zeros((len(texts), dimensions), dtype=np.float32)
+    buckets: dict[str, tuple[int, float]] = {}
+    for row, text in enumerate(texts):
+        for feature in _hashed_features(text):
+            bucket = buckets.get(feature)
+            if bucket is None:
+                digest = zlib.crc32(feature.encode("utf-8"))
+                # A sign bit keeps hash collisions from only ever adding up.
+                bucket = (digest % dimensions, 1.0 if digest & 0x80000000 else -1.0)
+                buckets[feature] = bucket
+            counts[row, bucket[0]] += bucket[1]
+
+    tf = np.sign(counts) * np.log1p(np.abs(counts))
+    df = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(texts)) / (1 + df)) + 1.0
+    vectors = tf * idf
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).tolist()
+
+
 class EmbeddingStore:
     def __init__(self, cache_dir: Path, settings: EmbeddingSettings) -> None:
         self.cache_dir = cache_dir
@@ -65,21 +105,52 @@ class EmbeddingStore:
     def _save_cache(self, path: Path, embedding: list[float]) -> None:
         path.write_text(json.dumps({"embedding": embedding}), encoding="utf-8")
 
+    def _available(self) -> bool:
+        if not self.settings.enabled:
+            return False
+        return self.settings.provider == "local" or bool(self.settings.api_key)
+
+    def embed_texts(self, texts: Sequence[str]) -> list[list[float] | None]:
+        if not self._available():
+            return [None] * len(texts)
+        if self.settings.provider == "local":
+            clipped = [text[: self.settings.max_chars] for text in texts]
+            return list(local_embeddings(clipped, self.settings.dimensions))
+        return [self.embed_text(text) for text in texts]
+
     def embed_text(self, text: str) -> list[float] | None:
-        if not self.settings.enabled or not self.settings.api_key:
+        if not self._available():
+            return None
+        if self.settings.provider == "local":
+            return self.embed_texts([text])[0]
+        if not self.settings.api_key:
             return None
 
         clipped = text[: self.settings.max_chars]
         cache_path = self._cache_path(self.settings.model_name, clipped)
         cached = self._load_cache(cache_path)
+        record_cache("embeddings", bool(cached))
         if cached:
             return cached
 
         client = get_genai_client(self.settings.api_key)
-        response = client.models.embed_content(
-            model=self.settings.model_name,
-            contents=clipped,
-        )
+        model_name = self.settings.model_name
+
+        def _embed() -> object:
+            start = time.perf_counter()
+            response = client.models.embed_content(model=model_name, contents=clipped)
+            # embed_content reports no token counts, so bill the local estimate.
+            record_usage(
+                "embed",
+                model_name,
+                estimate_tokens(clipped),
+                0,
+                latency_sec=time.perf_counter() - start,
+                estimated=True,
+            )
+            return response
+
+        response = call_with_retries(_embed, self.settings.retry, name=f"embed:{model_name}")
         embedding = extract_embedding(response)
         if not embedding:
             return None
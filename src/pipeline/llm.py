@@ -2,17 +2,23 @@ from __future__ import annotations
 
 import json
 import re
+import time
+from functools import lru_cache
 from typing import Any, Type, TypeVar
 
 from pydantic import BaseModel
 
+from .context import estimate_tokens
 from .genai_client import extract_text, get_genai_client
+from .mock_llm import SimulatedProvider, SimulationSettings, get_simulated_provider
 from .models import ExtractionResult
+from .resilience import RetryPolicy, call_with_retries
+from .usage import record_usage, usage_from_response
 
 T = TypeVar("T", bound=BaseModel)
 
 SYSTEM_PROMPT = """You are a data extraction engine for NI 43-101 mining technical reports.
-Extract ONLY the fields in the provided JSON schema. Return valid JSON and nothing else.
+Extract ONLY the fields in the {schema_source}. Return valid JSON and nothing else.
 If a field is missing, set it to null or [] as appropriate.
 Do not convert units or scale values; keep value as shown in the document.
 Fill `raw` with the original string and `unit` with the unit text if present.
@@ -42,6 +48,9 @@ SECTION_TASKS = {
         "Return null when a field is not present."
     ),
 }
+SECTION_TASKS["combined"] = "Extract every section of the schema in a single pass.\n" + "\n".join(
+    f"- {task}" for task in SECTION_TASKS.values()
+)
 
 
 def _extract_json(text: str) -> dict[str, Any]:
@@ -50,37 +59,143 @@ def _extract_json(text: str) -> dict[str, Any]:
     except json.JSONDecodeError:
         pass
 
-    match = re.search(r"\{.*\}", text, re.S)
-    if not match:
-        raise ValueError("No JSON object found in LLM response")
-    return json.loads(match.group(0))
+    # Chatty responses wrap the object in prose or code fences; decode the first object
+    # that parses instead of greedily matching from the first to the last brace.
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r"\{", text):
+        try:
+            data, _ = decoder.raw_decode(text, match.start())
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict):
+            return data
+    raise ValueError("No JSON object found in LLM response")
 
 
-def _build_prompt(document_text: str, schema: dict[str, Any], task: str | None = None) -> str:
-    prompt = SYSTEM_PROMPT
+@lru_cache(maxsize=None)
+def _schema_json(schema_model: Type[BaseModel]) -> str:
+    return json.dumps(schema_model.model_json_schema(), indent=2)
+
+
+@lru_cache(maxsize=64)
+def _prompt_prefix(task: str | None, schema_json: str | None) -> str:
+    # Structured output sends the schema with the request config instead of the prompt.
+    prompt = SYSTEM_PROMPT.format(
+        schema_source="provided JSON schema" if schema_json else "response schema"
+    )
     if task:
         prompt += f"\n\nTask: {task}\n"
-    return (
-        prompt
-        + "\nJSON schema:\n"
-        + json.dumps(schema, indent=2)
-        + "\n\nDocument content:\n"
-        + document_text
-    )
+    if schema_json:
+        prompt += "\nJSON schema:\n" + schema_json
+    return prompt + "\n\nDocument content:\n"
+
+
+def _build_prompt(document_text: str, schema_json: str | None, task: str | None = None) -> str:
+    return _prompt_prefix(task, schema_json) + document_text
+
+
+def _call_prompt(
+    document_text: str,
+    schema_model: Type[BaseModel],
+    task: str | None,
+    structured_output: bool,
+) -> str:
+    # With structured output the provider enforces the schema, so the prompt leaves it out.
+    schema_json = None if structured_output else _schema_json(schema_model)
+    return _build_prompt(document_text, schema_json, task)
+
+
+def estimate_prompt_tokens(
+    document_text: str,
+    schema_model: Type[BaseModel],
+    task: str | None = None,
+    structured_output: bool = False,
+) -> int:
+    """Estimated prompt tokens of the call `_call_gemini` would make with these arguments."""
+    return estimate_tokens(_call_prompt(document_text, schema_model, task, structured_output))
 
 
 def _call_gemini(
-    document_text: str, model_name: str, api_key: str, schema: dict[str, Any], task: str | None
-) -> dict[str, Any]:
+    document_text: str,
+    model_name: str,
+    api_key: str,
+    schema_model: Type[T],
+    task: str | None,
+    structured_output: bool = False,
+) -> T:
     client = get_genai_client(api_key)
-    prompt = _build_prompt(document_text, schema, task)
+    config: dict[str, Any] = {"temperature": 0.1}
+    if structured_output:
+        config["response_mime_type"] = "application/json"
+        config["response_schema"] = schema_model
+    prompt = _call_prompt(document_text, schema_model, task, structured_output)
 
+    start = time.perf_counter()
     response = client.models.generate_content(
         model=model_name,
         contents=prompt,
-        config={"temperature": 0.1},
+        config=config,
     )
-    return _extract_json(extract_text(response))
+    latency = time.perf_counter() - start
+    usage = usage_from_response(response)
+    if usage is not None:
+        record_usage("llm", model_name, *usage, latency_sec=latency)
+    else:
+        text = getattr(response, "text", None) or ""
+        record_usage(
+            "llm",
+            model_name,
+            estimate_tokens(prompt),
+            estimate_tokens(text),
+            latency_sec=latency,
+            estimated=True,
+        )
+    parsed = getattr(response, "parsed", None) if structured_output else None
+    if isinstance(parsed, schema_model):
+        return parsed
+    return schema_model.model_validate(_extract_json(extract_text(response)))
+
+
+def _record_estimated_usage(
+    model_name: str,
+    document_text: str,
+    schema_model: Type[BaseModel],
+    task: str | None,
+    structured_output: bool,
+    result: BaseModel,
+    latency: float,
+) -> None:
+    # Offline providers report what the real call would have cost with the same prompt.
+    record_usage(
+        "llm",
+        model_name,
+        estimate_prompt_tokens(document_text, schema_model, task, structured_output),
+        estimate_tokens(result.model_dump_json()),
+        latency_sec=latency,
+        estimated=True,
+    )
+
+
+def _complete_simulated(
+    provider: SimulatedProvider,
+    document_text: str,
+    model_name: str,
+    schema_model: Type[T],
+    task: str | None,
+    structured_output: bool,
+) -> T:
+    start = time.perf_counter()
+    result = provider.complete(document_text, schema_model, task)
+    _record_estimated_usage(
+        model_name,
+        document_text,
+        schema_model,
+        task,
+        structured_output,
+        result,
+        time.perf_counter() - start,
+    )
+    return result
 
 
 def extract_with_schema(
@@ -90,21 +205,48 @@ def extract_with_schema(
     provider: str,
     schema_model: Type[T],
     task: str | None = None,
+    structured_output: bool = False,
+    simulation: SimulationSettings | None = None,
+    retry_policy: RetryPolicy | None = None,
 ) -> T:
     if provider == "mock":
-        return schema_model()
+        result = schema_model()
+        _record_estimated_usage(
+            model_name, document_text, schema_model, task, structured_output, result, 0.0
+        )
+        return result
+    policy = retry_policy or RetryPolicy()
+    if provider == "simulated":
+        provider_sim = get_simulated_provider(simulation or SimulationSettings())
+        return call_with_retries(
+            lambda: _complete_simulated(
+                provider_sim, document_text, model_name, schema_model, task, structured_output
+            ),
+            policy,
+            name="llm:simulated",
+        )
     if provider != "gemini":
         raise ValueError(f"Unsupported LLM provider: {provider}")
     if not api_key:
         raise ValueError("GEMINI_API_KEY is required for gemini extraction")
 
-    schema = schema_model.model_json_schema()
-    data = _call_gemini(document_text, model_name, api_key, schema, task)
-    return schema_model.model_validate(data)
+    return call_with_retries(
+        lambda: _call_gemini(
+            document_text, model_name, api_key, schema_model, task, structured_output
+        ),
+        policy,
+        name=f"llm:{model_name}",
+    )
 
 
 def extract_structured(
-    document_text: str, model_name: str, api_key: str | None, provider: str
+    document_text: str,
+    model_name: str,
+    api_key: str | None,
+    provider: str,
+    structured_output: bool = False,
+    simulation: SimulationSettings | None = None,
+    retry_policy: RetryPolicy | None = None,
 ) -> ExtractionResult:
     return extract_with_schema(
         document_text=document_text,
@@ -113,4 +255,7 @@ def extract_structured(
         provider=provider,
         schema_model=ExtractionResult,
         task=None,
+        structured_output=structured_output,
+        simulation=simulation,
+        retry_policy=retry_policy,
     )
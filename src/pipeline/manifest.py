@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Iterator
+
+MANIFEST_JSONL = "run_manifest.jsonl"
+MANIFEST_JSON = "run_manifest.json"
+
+# Key order of the legacy run_manifest.json, kept so compacted files diff cleanly.
+_LEGACY_KEYS = (
+    "run_id",
+    "started_at",
+    "duration_sec",
+    "run_dir",
+    "resumed_from",
+    "failed_pdfs",
+    "trace_path",
+    "profile",
+    "settings",
+)
+
+
+class ManifestWriter:
+    """Append-only JSONL manifest: a header, one record per document, then a footer."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._handle = path.open("w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def _write(self, record: str, payload: dict[str, Any]) -> None:
+        line = json.dumps({"record": record, **payload}, ensure_ascii=True, default=str)
+        with self._lock:
+            self._handle.write(line + "\n")
+            # Flush per record: a crash loses at most the line being written.
+            self._handle.flush()
+
+    def header(self, **fields: Any) -> None:
+        self._write("header", fields)
+
+    def document(self, metrics: dict[str, Any]) -> None:
+        self._write("pdf", metrics)
+
+    def budget(self, decision: dict[str, Any]) -> None:
+        self._write("budget", decision)
+
+    def footer(self, **fields: Any) -> None:
+        self._write("footer", fields)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._handle.closed:
+                self._handle.close()
+
+    def __enter__(self) -> ManifestWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def iter_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream manifest records; legacy .json manifests are split into the same records."""
+    if path.suffix == ".json":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        pdfs = data.pop("pdfs", [])
+        yield {"record": "header", **data}
+        for metrics in pdfs:
+            yield {"record": "pdf", **metrics}
+        return
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # Torn last line from a run that died mid-write.
+                continue
+
+
+def compact_manifest(source: Path, destination: Path) -> dict[str, Any]:
+    """Rebuild the legacy single-document run_manifest.json from a JSONL manifest."""
+    run: dict[str, Any] = {}
+    pdfs: list[dict[str, Any]] = []
+    decisions: list[dict[str, Any]] = []
+    complete = False
+    for record in iter_records(source):
+        kind = record.pop("record", None)
+        if kind == "pdf":
+            pdfs.append(record)
+        elif kind == "budget":
+            decisions.append(record)
+        elif kind in ("header", "footer"):
+            run.update(record)
+            complete = complete or kind == "footer"
+    pdfs.sort(key=lambda metrics: str(metrics.get("source_pdf", "")))
+    run.setdefault(
+        "failed_pdfs",
+        [metrics["source_pdf"] for metrics in pdfs if metrics.get("status") == "failed"],
+    )
+    manifest = {key: run.pop(key) for key in _LEGACY_KEYS if key in run}
+    manifest.update(run)
+    if decisions:
+        manifest["budget_decisions"] = decisions
+    if not complete:
+        manifest["incomplete"] = True
+    manifest["pdfs"] = pdfs
+    tmp_path = destination.with_name(f".{destination.name}.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp_path, destination)
+    return manifest
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+LabelKey = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _key(labels: dict[str, str]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        super().__init__(name, help_text)
+        self.values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self.values.items())
+        return [f"{self.name}{_format_labels(key)} {value:g}" for key, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self.values[_key(labels)] = value
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help_text: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, help_text)
+        self.buckets = buckets
+        self.series: dict[LabelKey, tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _key(labels)
+        with self._lock:
+            counts, total, count = self.series.get(key, ([0] * len(self.buckets), 0.0, 0))
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[idx] += 1
+            self.series[key] = (counts, total + value, count + 1)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, (list(c), t, n)) for key, (c, t, n) in self.series.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(key, (('le', f'{bound:g}'),))} "
+                    f"{bucket_count}"
+                )
+            lines.append(f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {total:g}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    "pipeline_stage_duration_seconds", "Wall time per pipeline stage and document."
+)
+DOCUMENT_SECONDS = Histogram("pipeline_document_duration_seconds", "Wall time per document.")
+DOCUMENTS = Counter("pipeline_documents_total", "Documents processed by final status.")
+DOCUMENTS_IN_PROGRESS = Gauge("pipeline_documents_in_progress", "Documents being processed.")
+QUEUE_DEPTH = Gauge("pipeline_queue_depth", "Documents submitted and waiting for a worker.")
+CALLS_IN_FLIGHT = Gauge("pipeline_calls_in_flight", "Provider calls currently running by kind.")
+CALLS = Counter("pipeline_calls_total", "Provider calls by kind and outcome.")
+CALL_ATTEMPTS = Counter("pipeline_call_attempts_total", "Provider call attempts by kind.")
+CACHE_REQUESTS = Counter("pipeline_cache_requests_total", "Cache lookups by cache and result.")
+CACHE_HIT_RATIO = Gauge("pipeline_cache_hit_ratio", "Hit ratio per cache since process start.")
+CASCADE_SECTIONS = Counter(
+    "pipeline_cascade_sections_total",
+    "Section results per cascade tier (accepted/escalated/unresolved).",
+)
+
+REGISTRY: list[_Metric] = [
+    STAGE_SECONDS,
+    DOCUMENT_SECONDS,
+    DOCUMENTS,
+    DOCUMENTS_IN_PROGRESS,
+    QUEUE_DEPTH,
+    CALLS_IN_FLIGHT,
+    CALLS,
+    CALL_ATTEMPTS,
+    CACHE_REQUESTS,
+    CACHE_HIT_RATIO,
+    CASCADE_SECTIONS,
+]
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def _refresh_ratios() -> None:
+    totals: dict[str, list[float]] = {}
+    for key, value in list(CACHE_REQUESTS.values.items()):
+        labels = dict(key)
+        hits_total = totals.setdefault(labels["cache"], [0.0, 0.0])
+        hits_total[1] += value
+        if labels["result"] == "hit":
+            hits_total[0] += value
+    for cache, (hits, total) in totals.items():
+        CACHE_HIT_RATIO.set(hits / total if total else 0.0, cache=cache)
+
+
+def render_metrics() -> str:
+    """Prometheus text exposition format (0.0.4)."""
+    _refresh_ratios()
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.header())
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: Path) -> None:
+    # node_exporter's textfile collector may read at any time; never expose a partial file.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(render_metrics(), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+_SERVER: ThreadingHTTPServer | None = None
+
+
+def start_http_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve /metrics from a daemon thread; one server per process."""
+    # http.server drags in email/ssl; most runs never serve metrics.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = render_metrics().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            return
+
+    global _SERVER
+    if _SERVER is None:
+        _SERVER = ThreadingHTTPServer((host, port), _MetricsHandler)
+        threading.Thread(target=_SERVER.serve_forever, name="metrics-http", daemon=True).start()
+    return _SERVER
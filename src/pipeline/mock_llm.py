@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Type, TypeVar
+
+from pydantic import BaseModel
+
+from .context import estimate_tokens
+from .table_parser import parse_statement_tables
+
+T = TypeVar("T", bound=BaseModel)
+
+_CHUNK_SPLIT = re.compile(r"\n\n(?=Page \d+)")
+_CHUNK_HEADER = re.compile(r"^Page (\d+)(?: \(([^)]*)\))?:")
+_PROJECT_NAME = re.compile(r"\b((?:(?!The\b)[A-Z][\w'-]+ ){1,4}(?:Project|Mine|Property))\b")
+
+
+@dataclass(frozen=True)
+class SimulationSettings:
+    seed: int = 0
+    latency_ms: float = 800.0
+    latency_per_1k_tokens_ms: float = 60.0
+    latency_sigma: float = 0.35  # lognormal spread around the expected latency
+    error_rate_429: float = 0.0
+    error_rate_500: float = 0.0
+    rpm_limit: int = 0  # 0 disables the quota
+    time_scale: float = 1.0  # shrink or stretch every simulated delay
+
+
+class SimulatedLLMError(RuntimeError):
+    """Provider error carrying an HTTP-like status code, as the real client raises."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self, time_scale: float) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            # A compressed clock refills proportionally faster so quotas keep their shape.
+            elapsed = (now - self.updated) / max(time_scale, 1e-6)
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class SimulatedProvider:
+    def __init__(self, settings: SimulationSettings) -> None:
+        self.settings = settings
+        self.bucket = _TokenBucket(settings.rpm_limit) if settings.rpm_limit > 0 else None
+        self._attempts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def _rng(self, prompt: str) -> random.Random:
+        # Seed each call from the prompt and its attempt number so outcomes do not depend
+        # on thread scheduling, while retries of the same prompt still see fresh draws.
+        key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        with self._lock:
+            self._attempts[key] += 1
+            attempt = self._attempts[key]
+        return random.Random(f"{self.settings.seed}:{key}:{attempt}")
+
+    def reset(self) -> None:
+        """Restart attempt numbering so a new run replays the same draws."""
+        with self._lock:
+            self._attempts.clear()
+
+    def latency(self, tokens: int, rng: random.Random) -> float:
+        cfg = self.settings
+        expected = cfg.latency_ms + cfg.latency_per_1k_tokens_ms * tokens / 1000
+        return expected / 1000 * rng.lognormvariate(0.0, cfg.latency_sigma) * cfg.time_scale
+
+    def complete(self, document_text: str, schema_model: Type[T], task: str | None) -> T:
+        cfg = self.settings
+        rng = self._rng(f"{task}\n{document_text}")
+        if self.bucket and not self.bucket.take(cfg.time_scale):
+            raise SimulatedLLMError(429, "RESOURCE_EXHAUSTED: requests per minute quota exceeded")
+        roll = rng.random()
+        if roll < cfg.error_rate_429:
+            time.sleep(0.05 * cfg.time_scale)
+            raise SimulatedLLMError(429, "RESOURCE_EXHAUSTED: rate limited")
+        time.sleep(self.latency(estimate_tokens(document_text), rng))
+        if roll < cfg.error_rate_429 + cfg.error_rate_500:
+            raise SimulatedLLMError(500, "INTERNAL: simulated server error")
+        return canned_response(document_text, schema_model)
+
+
+def _context_tables(document_text: str) -> list[dict[str, str]]:
+    tables = []
+    for chunk in _CHUNK_SPLIT.split(document_text):
+        header, _, body = chunk.partition("\n")
+        match = _CHUNK_HEADER.match(header)
+        if match and match.group(2) and body.strip():
+            tables.append({"page": match.group(1), "method": match.group(2), "text": body})
+    return tables
+
+
+def canned_response(document_text: str, schema_model: Type[T]) -> T:
+    """Answer from the context itself: statement tables via the rule parser, a project name."""
+    fields = schema_model.model_fields
+    payload: dict[str, Any] = {}
+    tables = _context_tables(document_text)
+    for section in ("resources", "reserves"):
+        if section in fields:
+            rows = parse_statement_tables(tables, section).rows
+            payload[section] = [row.model_dump() for row in rows]
+    if "metadata" in fields:
+        match = _PROJECT_NAME.search(document_text)
+        payload["metadata"] = {"project_name": match.group(1) if match else None}
+    return schema_model.model_validate(payload)
+
+
+@lru_cache(maxsize=8)
+def get_simulated_provider(settings: SimulationSettings) -> SimulatedProvider:
+    # One provider per configuration so every worker thread shares the same quota.
+    return SimulatedProvider(settings)
@@ -1,19 +1,69 @@
 from __future__ import annotations
 
+import atexit
+import itertools
 import json
 import logging
+import logging.handlers
+import queue
+import threading
 from pathlib import Path
 from typing import Any
 
 _LOG_CONFIGURED = False
+_LISTENER: logging.handlers.QueueListener | None = None
+_LISTENER_RUNNING = False
+_LISTENER_LOCK = threading.Lock()
+_SAMPLE_RATES: dict[str, float] = {}
+_SAMPLE_COUNTERS: dict[str, itertools.count] = {}
+_SAMPLE_LOCK = threading.Lock()
 
 
-def configure_logging(log_dir: Path | None, level: str = "INFO") -> Path:
+class _EventMessage:
+    """Log message whose JSON is only built when a handler formats the record."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self.payload = payload
+
+    def __str__(self) -> str:
+        return json.dumps(self.payload, ensure_ascii=True, sort_keys=True, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock QueueHandler formats on the calling thread; hand the record over
+        # as-is so serialization and I/O both happen on the listener thread.
+        if record.exc_info or record.args:
+            return super().prepare(record)
+        return record
+
+
+def parse_sample_rates(spec: str | None) -> dict[str, float]:
+    """Parse `event=rate,event=rate` (e.g. `pages_selected=0.1`)."""
+    rates: dict[str, float] = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        event, _, rate = item.partition("=")
+        rates[event.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+def configure_logging(
+    log_dir: Path | None, level: str = "INFO", sample_rates: dict[str, float] | None = None
+) -> Path:
     target_dir = log_dir or Path("output") / "logs"
     target_dir.mkdir(parents=True, exist_ok=True)
     log_path = target_dir / "run.log"
 
-    global _LOG_CONFIGURED
+    global _LOG_CONFIGURED, _LISTENER, _LISTENER_RUNNING
+    if sample_rates is not None:
+        with _SAMPLE_LOCK:
+            _SAMPLE_RATES.clear()
+            _SAMPLE_RATES.update(sample_rates)
+            _SAMPLE_COUNTERS.clear()
     if _LOG_CONFIGURED:
         return log_path
 
@@ -23,16 +73,68 @@ def configure_logging(log_dir: Path | None, level: str = "INFO") -> Path:
 
     stream_handler = logging.StreamHandler()
     stream_handler.setFormatter(formatter)
-    root.addHandler(stream_handler)
 
     file_handler = logging.FileHandler(log_path, encoding="utf-8")
     file_handler.setFormatter(formatter)
-    root.addHandler(file_handler)
+
+    # Workers only enqueue; one listener thread formats and writes, so the handler
+    # locks and file I/O are off the hot path.
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    root.addHandler(_DeferredQueueHandler(log_queue))
+    _LISTENER = logging.handlers.QueueListener(
+        log_queue, stream_handler, file_handler, respect_handler_level=True
+    )
+    with _LISTENER_LOCK:
+        _LISTENER.start()
+        _LISTENER_RUNNING = True
+    atexit.register(_stop_listener)
 
     _LOG_CONFIGURED = True
     return log_path
 
 
+def _stop_listener() -> bool:
+    global _LISTENER_RUNNING
+    with _LISTENER_LOCK:
+        if _LISTENER is None or not _LISTENER_RUNNING:
+            return False
+        _LISTENER.stop()
+        _LISTENER_RUNNING = False
+        return True
+
+
+def flush_logging() -> None:
+    """Drain queued records to the handlers; the listener restarts for later events."""
+    global _LISTENER_RUNNING
+    if _stop_listener():
+        with _LISTENER_LOCK:
+            assert _LISTENER is not None
+            _LISTENER.start()
+            _LISTENER_RUNNING = True
+
+
+def _keep(event: str) -> float | None:
+    rate = _SAMPLE_RATES.get(event)
+    if rate is None or rate >= 1:
+        return 1.0
+    if rate <= 0:
+        return None
+    # Deterministic 1-in-N so sampled counts can be scaled back up exactly; rates that are
+    # not 1/N round to the nearest N, and the rate reported is the one actually applied.
+    every = max(1, round(1 / rate))
+    with _SAMPLE_LOCK:
+        counter = _SAMPLE_COUNTERS.setdefault(event, itertools.count())
+        seen = next(counter)
+    return 1 / every if seen % every == 0 else None
+
+
 def log_event(logger: logging.Logger, event: str, **fields: Any) -> None:
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    rate = _keep(event)
+    if rate is None:
+        return
     payload = {"event": event, **fields}
-    logger.info(json.dumps(payload, ensure_ascii=True, sort_keys=True))
+    if rate < 1:
+        payload["sample_rate"] = rate
+    logger.info(_EventMessage(payload))
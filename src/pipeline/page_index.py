@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import re
+import sqlite3
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Iterable
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS page_index_documents (
+    source_pdf TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    first_rowid INTEGER NOT NULL,
+    page_count INTEGER NOT NULL,
+    indexed_at TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+    source_pdf UNINDEXED,
+    page UNINDEXED,
+    text,
+    tokenize = 'porter unicode61'
+);
+"""
+
+
+@dataclass
+class PageHit:
+    source_pdf: str
+    page: int
+    score: float
+    snippet: str
+
+
+class PageIndex:
+    """Corpus-wide FTS5 index of page text, stored next to the extraction tables."""
+
+    def __init__(self, sqlite_path: Path) -> None:
+        sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the workers; writes are serialised by the lock anyway.
+        self._conn = sqlite3.connect(sqlite_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _stored_row(self, source_pdf: str) -> tuple[str, int, int] | None:
+        return self._conn.execute(
+            "SELECT content_hash, first_rowid, page_count FROM page_index_documents"
+            " WHERE source_pdf = ?",
+            (source_pdf,),
+        ).fetchone()
+
+    def index_document(self, source_pdf: str, pages: Iterable[str], content_hash: str) -> bool:
+        """(Re)index one document's pages; returns False when the stored hash matches.
+
+        `pages` is consumed into a spool file before the lock is taken: reading, stripping
+        and scoring pages runs in parallel across workers, only the SQL writes serialise.
+        """
+        with self._lock:
+            row = self._stored_row(source_pdf)
+        if row and row[0] == content_hash:
+            return False
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+            for text in pages:
+                spool.write(json.dumps(text) + "\n")
+            spool.seek(0)
+            return self._write_document(source_pdf, spool, content_hash)
+
+    def _write_document(self, source_pdf: str, spool: IO[str], content_hash: str) -> bool:
+        with self._lock:
+            # Another worker may have indexed the same content while this one scanned.
+            row = self._stored_row(source_pdf)
+            if row and row[0] == content_hash:
+                return False
+            with self._conn:
+                if row:
+                    # Each document owns a contiguous rowid range, so replacing it is a
+                    # range delete instead of a scan over the UNINDEXED source_pdf column.
+                    self._conn.execute(
+                        "DELETE FROM pages_fts WHERE rowid BETWEEN ? AND ?",
+                        (row[1], row[1] + row[2] - 1),
+                    )
+                first_rowid = self._conn.execute(
+                    "SELECT COALESCE(MAX(rowid), 0) + 1 FROM pages_fts"
+                ).fetchone()[0]
+                page_count = 0
+                rows = []
+                for page_count, line in enumerate(spool, start=1):
+                    rows.append(
+                        (first_rowid + page_count - 1, source_pdf, page_count, json.loads(line))
+                    )
+                    if len(rows) >= 256:
+                        self._insert(rows)
+                        rows = []
+                self._insert(rows)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO page_index_documents"
+                    " (source_pdf, content_hash, first_rowid, page_count, indexed_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (
+                        source_pdf,
+                        content_hash,
+                        first_rowid,
+                        page_count,
+                        datetime.now(timezone.utc).isoformat(),
+                    ),
+                )
+            return True
+
+    def _insert(self, rows: list[tuple[int, str, int, str]]) -> None:
+        if rows:
+            self._conn.executemany(
+                "INSERT INTO pages_fts (rowid, source_pdf, page, text) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _quote_terms(query: str) -> str:
+    return " ".join(f'"{term}"' for term in re.findall(r"\w[\w.'-]*", query))
+
+
+def search_pages(
+    sqlite_path: Path,
+    query: str,
+    limit: int = 20,
+    source_pdf: str | None = None,
+    snippet_tokens: int = 16,
+) -> list[PageHit]:
+    """Rank pages with FTS5 bm25(); plain text that is not valid FTS syntax is quoted.
+
+    Raises FileNotFoundError for a missing database and ValueError when it holds no page
+    index, instead of reporting either as a search without hits.
+    """
+    if not sqlite_path.exists():
+        raise FileNotFoundError(f"No SQLite database at {sqlite_path}")
+    pdf_filter = " AND source_pdf = ?" if source_pdf else ""
+    sql = (
+        "SELECT source_pdf, page, bm25(pages_fts) AS score,"
+        " snippet(pages_fts, 2, '[', ']', ' ... ', ?) FROM pages_fts"
+        f" WHERE pages_fts MATCH ?{pdf_filter} ORDER BY score LIMIT ?"
+    )
+
+    def _params(match: str) -> list[object]:
+        params: list[object] = [snippet_tokens, match]
+        if source_pdf:
+            params.append(source_pdf)
+        return params + [limit]
+
+    # Read-only, so searching never creates or modifies the database file.
+    conn = sqlite3.connect(f"{sqlite_path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'pages_fts'").fetchone():
+            raise ValueError(f"{sqlite_path} has no page index (pages_fts table)")
+        try:
+            rows = conn.execute(sql, _params(query)).fetchall()
+        except sqlite3.OperationalError:
+            # With the table in place, a failing MATCH is a query FTS5 cannot parse.
+            quoted = _quote_terms(query)
+            if not quoted:
+                return []
+            rows = conn.execute(sql, _params(quoted)).fetchall()
+        return [
+            PageHit(
+                source_pdf=row[0],
+                page=int(row[1]),
+                score=-float(row[2]),
+                snippet=" ".join(row[3].split()),
+            )
+            for row in rows
+        ]
+    finally:
+        conn.close()
+
+
+_CURRENT: contextvars.ContextVar[PageIndex | None] = contextvars.ContextVar(
+    "page_index", default=None
+)
+
+
+def set_page_index(index: PageIndex | None) -> contextvars.Token:
+    return _CURRENT.set(index)
+
+
+def reset_page_index(token: contextvars.Token) -> None:
+    _CURRENT.reset(token)
+
+
+def index_pages(source_pdf: str, pages: Iterable[str], content_hash: str) -> str | None:
+    """Index pages into the run's PageIndex: "indexed", "unchanged", or None when disabled.
+
+    `pages` may be a one-shot iterable; it is only consumed when the document changed.
+    """
+    index = _CURRENT.get()
+    if index is None:
+        return None
+    changed = index.index_document(source_pdf, pages, content_hash)
+    return "indexed" if changed else "unchanged"
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, Sequence, overload
+
+
+class PageProvider(Sequence[str]):
+    """Read-only page sequence over a JSONL page file, holding at most `cache_size` pages.
+
+    Anything that takes `Sequence[str]` (selector, utils, build_context) can use it in place
+    of a list; pages are decoded on access and evicted least-recently-used. `total_chars`
+    counts the pages as written to the file, before any transform.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        offsets: Sequence[int],
+        cache_size: int = 64,
+        transform: Callable[[str], str] | None = None,
+        total_chars: int | None = None,
+        transform_key: str = "",
+    ) -> None:
+        self.path = path
+        self.offsets = list(offsets)
+        self.total_chars = total_chars
+        self.transform_key = transform_key
+        self.cache_size = max(1, cache_size)
+        self.transform = transform
+        self.loads = 0
+        self.hits = 0
+        self._pages: OrderedDict[int, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._handle: BinaryIO | None = None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        with self._lock:
+            cached = self._pages.get(index)
+            if cached is not None:
+                self._pages.move_to_end(index)
+                self.hits += 1
+                return cached
+            text = self._read(index)
+            self._pages[index] = text
+            if len(self._pages) > self.cache_size:
+                self._pages.popitem(last=False)
+            self.loads += 1
+            return text
+
+    def __iter__(self) -> Iterator[str]:
+        # Sequential scans (boilerplate, BM25, ranking) go through the same bounded cache.
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def _read(self, index: int) -> str:
+        if self._handle is None:
+            self._handle = self.path.open("rb")
+        handle = self._handle
+        handle.seek(self.offsets[index])
+        text = json.loads(handle.readline())
+        return self.transform(text) if self.transform else text
+
+    def with_transform(self, transform: Callable[[str], str], key: str) -> PageProvider:
+        """A view over the same file whose pages pass through `transform` (own cache).
+
+        `key` identifies the transform in `content_digest`, so two views that return
+        different pages never share a digest. `loads` carries over, so the view's count
+        covers every read of the file.
+        """
+        view = PageProvider(
+            self.path,
+            self.offsets,
+            self.cache_size,
+            transform,
+            total_chars=self.total_chars,
+            transform_key=key,
+        )
+        view.loads = self.loads
+        return view
+
+    def content_digest(self) -> str:
+        """Content key for caches: the page file's bytes plus the transform key.
+
+        Streams the file instead of decoding pages, so it costs no page loads.
+        """
+        digest = hashlib.sha256()
+        with self.path.open("rb") as handle:
+            for chunk in iter(partial(handle.read, 1 << 20), b""):
+                digest.update(chunk)
+        digest.update(b"\0" + self.transform_key.encode("utf-8"))
+        return digest.hexdigest()[:24]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            self._pages.clear()
+
+
+def write_pages(path: Path, pages: Iterable[str]) -> tuple[list[int], int]:
+    """Write one JSON string per line; returns line offsets and total characters."""
+    offsets: list[int] = []
+    chars = 0
+    position = 0
+    with path.open("wb") as handle:
+        for text in pages:
+            line = (json.dumps(text) + "\n").encode("utf-8")
+            offsets.append(position)
+            handle.write(line)
+            position += len(line)
+            chars += len(text)
+    return offsets, chars
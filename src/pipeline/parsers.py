@@ -2,9 +2,15 @@ from __future__ import annotations
 
 import hashlib
 import json
+import os
 import re
 import subprocess
 from pathlib import Path
+from typing import Iterable, Iterator
+
+from .pages import PageProvider, write_pages
+
+PAGE_CACHE_FORMAT = 2
 
 
 class ParseResult:
@@ -33,43 +39,24 @@ def _cache_path(pdf_path: Path, cache_dir: Path) -> Path:
     return cache_dir / f"{pdf_path.stem}-{digest}.json"
 
 
-def extract_pdf_pages(pdf_path: Path, cache_dir: Path | None = None) -> tuple[list[str], bool]:
-    cache_hit = False
-    signature = _cache_signature(pdf_path)
-    if cache_dir:
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        cache_path = _cache_path(pdf_path, cache_dir)
-        if cache_path.exists():
-            try:
-                payload = json.loads(cache_path.read_text(encoding="utf-8"))
-            except json.JSONDecodeError:
-                payload = None
-            if isinstance(payload, dict) and payload.get("signature") == signature:
-                cached_pages = payload.get("pages", [])
-                if isinstance(cached_pages, list):
-                    cache_hit = True
-                    return cached_pages, cache_hit
+def _pages_path(cache_path: Path) -> Path:
+    return cache_path.with_suffix(".pages.jsonl")
+
 
+def _iter_pdf_pages(pdf_path: Path) -> Iterator[str]:
     page_count = get_pdf_page_count(pdf_path)
     if page_count <= 0:
         # Fallback: extract all text when pdfinfo is missing or fails.
         try:
-            text = subprocess.check_output(
+            yield subprocess.check_output(
                 ["pdftotext", "-layout", str(pdf_path), "-"],
                 text=True,
                 errors="ignore",
             )
         except subprocess.CalledProcessError:
-            text = ""
-        single_pages = [text]
-        if cache_dir:
-            cache_path = _cache_path(pdf_path, cache_dir)
-            cache_path.write_text(
-                json.dumps({"signature": signature, "pages": single_pages}), encoding="utf-8"
-            )
-        return single_pages, cache_hit
+            yield ""
+        return
 
-    pages: list[str] = []
     for page_num in range(1, page_count + 1):
         try:
             text = subprocess.check_output(
@@ -88,13 +75,64 @@ def extract_pdf_pages(pdf_path: Path, cache_dir: Path | None = None) -> tuple[li
             )
         except subprocess.CalledProcessError:
             text = ""
-        pages.append(text)
-    if cache_dir:
-        cache_path = _cache_path(pdf_path, cache_dir)
-        cache_path.write_text(
-            json.dumps({"signature": signature, "pages": pages}), encoding="utf-8"
-        )
-    return pages, cache_hit
+        yield text
+
+
+def write_page_cache(
+    pdf_path: Path, cache_dir: Path, pages: Iterable[str], cache_size: int = 64
+) -> PageProvider:
+    """Stream pages into the cache (one JSON line each) and return a provider over them."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cache_path = _cache_path(pdf_path, cache_dir)
+    pages_path = _pages_path(cache_path)
+    tmp_pages = pages_path.with_name(f".{pages_path.name}.tmp")
+    offsets, chars = write_pages(tmp_pages, pages)
+    os.replace(tmp_pages, pages_path)
+    # The metadata file is written last, so a half-written page file is never trusted.
+    payload = {
+        "signature": _cache_signature(pdf_path),
+        "format": PAGE_CACHE_FORMAT,
+        "offsets": offsets,
+        "chars": chars,
+    }
+    tmp_meta = cache_path.with_name(f".{cache_path.name}.tmp")
+    tmp_meta.write_text(json.dumps(payload), encoding="utf-8")
+    os.replace(tmp_meta, cache_path)
+    return PageProvider(pages_path, offsets, cache_size, total_chars=chars)
+
+
+def open_page_cache(
+    pdf_path: Path, cache_dir: Path, cache_size: int = 64
+) -> tuple[PageProvider, bool]:
+    """Return a lazy page provider, extracting the PDF into the cache on a miss."""
+    cache_path = _cache_path(pdf_path, cache_dir)
+    payload = None
+    if cache_path.exists():
+        try:
+            payload = json.loads(cache_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            payload = None
+    if isinstance(payload, dict) and payload.get("signature") == _cache_signature(pdf_path):
+        pages_path = _pages_path(cache_path)
+        if payload.get("format") == PAGE_CACHE_FORMAT and pages_path.exists():
+            provider = PageProvider(
+                pages_path, payload["offsets"], cache_size, total_chars=payload.get("chars")
+            )
+            return provider, True
+        if isinstance(payload.get("pages"), list):
+            # Single-JSON caches from older runs are converted once, then read lazily.
+            return write_page_cache(pdf_path, cache_dir, payload["pages"], cache_size), True
+    return write_page_cache(pdf_path, cache_dir, _iter_pdf_pages(pdf_path), cache_size), False
+
+
+def extract_pdf_pages(pdf_path: Path, cache_dir: Path | None = None) -> tuple[list[str], bool]:
+    if not cache_dir:
+        return list(_iter_pdf_pages(pdf_path)), False
+    provider, cache_hit = open_page_cache(pdf_path, cache_dir)
+    try:
+        return list(provider), cache_hit
+    finally:
+        provider.close()
 
 
 def parse_pdf_to_markdown(pdf_path: Path, llama_api_key: str | None) -> ParseResult:
@@ -1,18 +1,38 @@
 from __future__ import annotations
 
-import json
+import contextvars
 import logging
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import AbstractContextManager, contextmanager, nullcontext
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import TypeVar
+from typing import Any, Callable, Iterable, Iterator, Sequence, TypeVar, cast
 
 from pydantic import BaseModel
 
+from .bm25 import Bm25Builder, Bm25Index, load_cached_index, save_index
+from .budget import BudgetController
+from .checkpoints import load_checkpoint, run_dir, write_checkpoint
 from .config import Settings
+from .context import ContextUnit, PackedContext, merge_units, pack_context, page_units
 from .embeddings import EmbeddingSettings, EmbeddingStore
-from .llm import SECTION_TASKS, extract_structured, extract_with_schema
+from .llm import SECTION_TASKS, estimate_prompt_tokens, extract_structured, extract_with_schema
+from .manifest import MANIFEST_JSON, MANIFEST_JSONL, ManifestWriter, compact_manifest
+from .metrics import (
+    CASCADE_SECTIONS,
+    DOCUMENT_SECONDS,
+    DOCUMENTS,
+    DOCUMENTS_IN_PROGRESS,
+    QUEUE_DEPTH,
+    STAGE_SECONDS,
+    record_cache,
+    start_http_server,
+    write_textfile,
+)
+from .mock_llm import SimulationSettings, get_simulated_provider
 from .models import (
     EconomicsResult,
     ExtractionResult,
@@ -20,23 +40,47 @@ from .models import (
     ReservesResult,
     ResourcesResult,
 )
-from .observability import configure_logging, log_event
-from .parsers import extract_pdf_pages, parse_pdf_to_markdown
+from .observability import configure_logging, flush_logging, log_event, parse_sample_rates
+from .page_index import PageIndex, index_pages, reset_page_index, set_page_index
+from .pages import PageProvider
+from .parsers import open_page_cache, parse_pdf_to_markdown
+from .planner import PlanHistory, load_history, parse_workers, plan_document, summarize_plan
+from .profiling import RunProfiler, profile_stage
 from .quality import apply_quality_checks
-from .selector import FALLBACK_SECTION_CONFIGS, SECTION_CONFIGS, build_context, select_pages
-from .storage import save_csvs, save_json, save_sqlite
+from .resilience import RetryPolicy, collect_calls, summarize_calls
+from .selector import (
+    FALLBACK_SECTION_CONFIGS,
+    SECTION_CONFIGS,
+    PageSignals,
+    build_context,
+    page_signals,
+    select_scored_pages,
+)
+from .storage import save_csvs, save_json, save_parquet, save_sqlite
 from .table_extractor import (
-    build_table_context,
     extract_tables_for_pages,
     filter_tables_for_section,
+    format_table,
 )
+from .table_parser import parse_statement_tables
+from .tracing import configure_tracing, export_otlp_json, set_attributes, span
+from .usage import collect_usage, merge_usage, summarize_usage, usage_section, write_usage
 from .utils import (
     NO_ECONOMICS_PATTERNS,
     NO_RESERVES_PATTERNS,
     clamp_text,
     extract_relevant_page_snippets,
     file_sha256,
-    find_pages_with_patterns,
+    find_boilerplate_lines,
+    matches_any_pattern,
+    strip_page_boilerplate,
+)
+from .workpackage import (
+    WorkPackage,
+    list_packages,
+    load_package,
+    source_name,
+    write_package,
 )
 
 SchemaModel = TypeVar("SchemaModel", bound=BaseModel)
@@ -74,13 +118,55 @@ def _has_economics(econ) -> bool:
 
 
 def _build_embedding_settings(settings: Settings) -> EmbeddingSettings:
-    enabled = settings.embeddings_enabled and bool(settings.gemini_api_key)
+    enabled = settings.embeddings_enabled and (
+        settings.embedding_provider == "local" or bool(settings.gemini_api_key)
+    )
     return EmbeddingSettings(
         enabled=enabled,
         api_key=settings.gemini_api_key,
         model_name=settings.embedding_model,
         max_chars=settings.embedding_max_chars,
         max_pages=settings.embedding_max_pages,
+        provider=settings.embedding_provider,
+        dimensions=settings.embedding_dimensions,
+        retry=_build_retry_policy(settings),
+    )
+
+
+def _build_retry_policy(settings: Settings) -> RetryPolicy:
+    # Simulated runs compress provider latency; compress backoff by the same factor.
+    scale = settings.sim_time_scale if settings.llm_provider == "simulated" else 1.0
+    return RetryPolicy(
+        max_attempts=max(1, settings.call_max_attempts),
+        base_delay_sec=settings.call_backoff_base_sec * scale,
+        max_delay_sec=settings.call_backoff_max_sec * scale,
+        deadline_sec=settings.call_deadline_sec * scale,
+        hedge_percentile=settings.call_hedge_percentile,
+        concurrency=max(1, settings.max_workers),
+    )
+
+
+@contextmanager
+def _stage(name: str, **attributes: object) -> Iterator[None]:
+    """One pipeline stage: a trace span, a latency observation and, if sampled, a profile."""
+    start = time.perf_counter()
+    with span(f"stage:{name}", **attributes), profile_stage(name):
+        yield
+    STAGE_SECONDS.observe(time.perf_counter() - start, stage=name)
+
+
+def _build_simulation_settings(settings: Settings) -> SimulationSettings | None:
+    if settings.llm_provider != "simulated":
+        return None
+    return SimulationSettings(
+        seed=settings.sim_seed,
+        latency_ms=settings.sim_latency_ms,
+        latency_per_1k_tokens_ms=settings.sim_latency_per_1k_tokens_ms,
+        latency_sigma=settings.sim_latency_sigma,
+        error_rate_429=settings.sim_error_rate_429,
+        error_rate_500=settings.sim_error_rate_500,
+        rpm_limit=settings.sim_rpm_limit,
+        time_scale=settings.sim_time_scale,
     )
 
 
@@ -90,17 +176,15 @@ def _resolve_sections(settings: Settings) -> set[str]:
     return {"metadata", "resources", "reserves", "economics"}
 
 
-def _combine_contexts(table_context: str, text_context: str, max_chars: int) -> str:
-    if not table_context:
-        return text_context
-    if not text_context:
-        return table_context
-    # Keep a budget for tables because they carry dense numeric signals.
-    table_budget = int(max_chars * 0.4)
-    text_budget = max_chars - table_budget - 2
-    table_part = clamp_text(table_context, table_budget)
-    text_part = clamp_text(text_context, text_budget)
-    return f"{table_part}\n\n{text_part}"
+SECTION_SCHEMAS: dict[str, type[BaseModel]] = {
+    "metadata": MetadataResult,
+    "resources": ResourcesResult,
+    "reserves": ReservesResult,
+    "economics": EconomicsResult,
+}
+# Economics tends to be sparse; keep full context to avoid losing values.
+FOCUSED_SECTIONS = ("resources", "reserves")
+TABLE_BUDGET_SHARE = 0.4
 
 
 def _focus_context(context: str, keywords: list[str], settings: Settings) -> str:
@@ -114,55 +198,222 @@ def _focus_context(context: str, keywords: list[str], settings: Settings) -> str
     return context
 
 
+def _section_units(
+    text_context: str,
+    page_scores: dict[int, float],
+    tables: list[dict[str, str]],
+) -> list[ContextUnit]:
+    units = []
+    for rank, table in enumerate(tables):
+        formatted = format_table(table)
+        if formatted:
+            label, text = formatted
+            # Tables arrive sorted by table score; keep that order within the table pool.
+            units.append(ContextUnit(label, text, score=float(len(tables) - rank), kind="table"))
+    units.extend(page_units(text_context, page_scores))
+    return units
+
+
+def _pack_section_context(
+    text_context: str,
+    page_scores: dict[int, float],
+    tables: list[dict[str, str]],
+    settings: Settings,
+) -> PackedContext:
+    return pack_context(
+        _section_units(text_context, page_scores, tables),
+        settings.section_token_budget,
+        table_share=TABLE_BUDGET_SHARE,
+    )
+
+
 def _build_two_stage_contexts(
     pdf_path: Path,
     settings: Settings,
     sections: set[str],
-) -> tuple[list[str], dict[str, str], dict[str, list[int]], dict]:
+) -> tuple[
+    Sequence[str],
+    dict[str, str],
+    dict[str, list[int]],
+    dict[str, dict[int, float]],
+    Bm25Index | None,
+    dict,
+]:
     page_start = time.perf_counter()
-    pages, cache_hit = extract_pdf_pages(
-        pdf_path,
-        cache_dir=Path(settings.output_dir) / "cache" / "pages",
-    )
+    with _stage("page_extract"):
+        # Pages stay on disk; every pass below reads through a bounded LRU, so memory per
+        # worker depends on page_lru_size rather than on report length.
+        raw_pages, cache_hit = open_page_cache(
+            pdf_path,
+            cache_dir=Path(settings.output_dir) / "cache" / "pages",
+            cache_size=settings.page_lru_size,
+        )
     page_duration = time.perf_counter() - page_start
+    pages = raw_pages
+    boilerplate: set[str] = set()
+    if settings.strip_boilerplate:
+        # Running headers/footers repeat on every page; strip them as pages are loaded.
+        boilerplate = find_boilerplate_lines(
+            raw_pages, min_fraction=settings.boilerplate_min_fraction
+        )
+        if boilerplate:
+            pages = raw_pages.with_transform(
+                partial(strip_page_boilerplate, boilerplate=boilerplate),
+                key="strip_boilerplate:" + "\n".join(sorted(boilerplate)),
+            )
+            raw_pages.close()
+    index_start = time.perf_counter()
+    # The digest streams the page file, so the caches are checked before any page is read.
+    digest = pages.content_digest()
+    index_dir = Path(settings.output_dir) / "cache" / "index"
+    index = load_cached_index(index_dir, digest) if settings.bm25_enabled else None
+    index_cache_hit = index is not None
+    builder = Bm25Builder() if settings.bm25_enabled and index is None else None
+    # Keyword hits are only ranked when BM25 is off; BM25 replaces them otherwise.
+    keyword_configs = (
+        []
+        if settings.bm25_enabled
+        else [config for section, config in SECTION_CONFIGS.items() if section in sections]
+    )
+    signals: list[PageSignals] = []
+    no_reserves_pages: list[int] = []
+    no_economics_pages: list[int] = []
+    chars = 0
+
+    def _scan() -> Iterator[str]:
+        nonlocal chars
+        for idx, text in enumerate(pages):
+            chars += len(text)
+            if builder is not None:
+                builder.add(text)
+            signals.append(page_signals(text, keyword_configs))
+            # Explicit "no reserves/economics" statements explain empty outputs.
+            if matches_any_pattern(text, NO_RESERVES_PATTERNS):
+                no_reserves_pages.append(idx + 1)
+            if matches_any_pattern(text, NO_ECONOMICS_PATTERNS):
+                no_economics_pages.append(idx + 1)
+            yield text
+
+    # One pass feeds the char count, the BM25 build, the FTS page index, the page signals
+    # every section ranks on and the "no reserves/economics" checks: with a page LRU
+    # smaller than the document, every extra pass would re-read the whole file. Only the
+    # boilerplate scan runs before it, since stripping needs the whole document's counts;
+    # after it, pages are read only for embedding candidates and the selected contexts.
+    scan = _scan()
+    with _stage("index"):
+        page_index = index_pages(pdf_path.name, scan, digest)
+        for _ in scan:
+            # The page index skipped the document (disabled or unchanged).
+            pass
+        if builder is not None:
+            index = builder.build()
+            save_index(index, index_dir, digest)
+    index_duration = time.perf_counter() - index_start
+    scan_loads = pages.loads
+    raw_chars = raw_pages.total_chars if raw_pages.total_chars is not None else chars
     embed_settings = _build_embedding_settings(settings)
     cache_dir = Path(settings.output_dir) / "cache" / "embeddings"
     embed_store = EmbeddingStore(cache_dir, embed_settings)
 
     contexts: dict[str, str] = {}
     page_indices_by_section: dict[str, list[int]] = {}
+    page_scores_by_section: dict[str, dict[int, float]] = {}
     selection_durations: dict[str, float] = {}
     for section, config in SECTION_CONFIGS.items():
         if section not in sections:
             continue
         select_start = time.perf_counter()
-        page_indices = select_pages(pages, config, embed_store, embed_settings)
+        with _stage(f"select:{section}"):
+            scored = select_scored_pages(
+                pages,
+                config,
+                embed_store,
+                embed_settings,
+                index=index,
+                bm25_weight=settings.bm25_weight,
+                signals=signals,
+            )
         selection_durations[section] = time.perf_counter() - select_start
+        page_indices = [idx for idx, _ in scored]
         page_indices_by_section[section] = page_indices
+        page_scores_by_section[section] = dict(scored)
         contexts[section] = build_context(pages, page_indices)
 
     metrics = {
         "page_count": len(pages),
+        "scan_page_loads": scan_loads,
         "page_extract_sec": page_duration,
         "cache_hit": cache_hit,
         "selection_sec": selection_durations,
+        "boilerplate_lines": len(boilerplate),
+        "boilerplate_chars": raw_chars - chars,
+        "chars": chars,
+        "index_sec": index_duration,
+        "index_cache_hit": index_cache_hit,
+        "page_index": page_index,
+        "no_reserves_pages": no_reserves_pages,
+        "no_economics_pages": no_economics_pages,
     }
-    return pages, contexts, page_indices_by_section, metrics
+    return pages, contexts, page_indices_by_section, page_scores_by_section, index, metrics
 
 
 def _fallback_context(
-    pages: list[str],
+    pages: Sequence[str],
     settings: Settings,
     section: str,
-) -> str:
+    sent_pages: Sequence[int] = (),
+    logger: logging.Logger | None = None,
+    pdf_name: str | None = None,
+    index: Bm25Index | None = None,
+) -> tuple[str, dict]:
     embed_settings = _build_embedding_settings(settings)
     cache_dir = Path(settings.output_dir) / "cache" / "embeddings"
     embed_store = EmbeddingStore(cache_dir, embed_settings)
     fallback = FALLBACK_SECTION_CONFIGS.get(section)
+    stats: dict = {"saved_chars": 0, "budget": {}}
     if not fallback:
-        return ""
-    page_indices = select_pages(pages, fallback, embed_store, embed_settings)
-    return build_context(pages, page_indices)
+        return "", stats
+    scored = select_scored_pages(
+        pages, fallback, embed_store, embed_settings, index=index, bm25_weight=settings.bm25_weight
+    )
+    page_indices = [idx for idx, _ in scored]
+    skipped: list[int] = []
+    if settings.retry_delta_only and sent_pages:
+        # The primary attempt already paid for these pages and came back empty; only send
+        # new pages and mention the reviewed ones so source_pages stays consistent.
+        sent = set(sent_pages)
+        skipped = [idx for idx in page_indices if idx in sent]
+        page_indices = [idx for idx in page_indices if idx not in sent]
+        stats["saved_chars"] = len(build_context(pages, skipped))
+
+    packed = _pack_section_context(build_context(pages, page_indices), dict(scored), [], settings)
+    context, stats["budget"] = packed.text, packed.stats()
+    if context and skipped:
+        reviewed = ", ".join(str(idx + 1) for idx in skipped)
+        context = f"Pages already reviewed without results: {reviewed}\n\n{context}"
+    if logger and sent_pages and settings.retry_delta_only:
+        log_event(
+            logger,
+            "fallback_context_built",
+            pdf=pdf_name,
+            section=section,
+            pages=page_indices,
+            skipped_pages=skipped,
+            saved_chars=stats["saved_chars"],
+        )
+    return context, stats
+
+
+def _section_missing(section: str, result: BaseModel) -> bool:
+    if isinstance(result, MetadataResult):
+        return not result.metadata.project_name and not result.metadata.company_name
+    if isinstance(result, ResourcesResult):
+        return not result.resources
+    if isinstance(result, ReservesResult):
+        return not result.reserves
+    if isinstance(result, EconomicsResult):
+        return not _has_economics(result.economics)
+    return False
 
 
 def _extract_section(
@@ -171,12 +422,14 @@ def _extract_section(
     schema_model,
     task_key: str,
     retry: bool = False,
+    model_name: str | None = None,
 ):
-    model_name = (
-        settings.retry_model
-        if (retry and settings.use_retry_model and settings.retry_model)
-        else settings.model_name
-    )
+    if model_name is None:
+        model_name = (
+            settings.retry_model
+            if (retry and settings.use_retry_model and settings.retry_model)
+            else settings.model_name
+        )
     return extract_with_schema(
         document_text=clamp_text(context, settings.max_chars),
         model_name=model_name,
@@ -184,6 +437,9 @@ def _extract_section(
         provider=settings.llm_provider,
         schema_model=schema_model,
         task=SECTION_TASKS.get(task_key),
+        structured_output=settings.structured_output,
+        simulation=_build_simulation_settings(settings),
+        retry_policy=_build_retry_policy(settings),
     )
 
 
@@ -196,6 +452,8 @@ def _extract_section_with_metrics(
     pdf_name: str,
     section: str,
     retry: bool = False,
+    model_name: str | None = None,
+    tier: int = 0,
 ) -> tuple[SchemaModel, float, int]:
     input_chars = len(context)
     if settings.dry_run:
@@ -210,7 +468,11 @@ def _extract_section_with_metrics(
         return schema_model(), 0.0, input_chars
 
     start = time.perf_counter()
-    result = _extract_section(context, settings, schema_model, task_key, retry=retry)
+    label = section + (":retry" if retry else "") + (f":tier{tier}" if tier else "")
+    with _stage(f"llm:{label}", input_chars=input_chars), usage_section(label):
+        result = _extract_section(
+            context, settings, schema_model, task_key, retry=retry, model_name=model_name
+        )
     duration = time.perf_counter() - start
     log_event(
         logger,
@@ -218,13 +480,162 @@ def _extract_section_with_metrics(
         pdf=pdf_name,
         section=section,
         retry=retry,
+        tier=tier,
         duration_sec=round(duration, 3),
         input_chars=input_chars,
     )
     return result, duration, input_chars
 
 
-def process_pdf_two_stage(pdf_path: Path, settings: Settings) -> tuple[ExtractionResult, dict]:
+def _tier_stats(model: str) -> dict[str, Any]:
+    return {
+        "model": model,
+        "calls": 0,
+        "latency_sec": 0.0,
+        "sections": 0,
+        "escalated": 0,
+        "unresolved": 0,
+    }
+
+
+def _cascade_summary(cascades: Iterable[dict | None]) -> list[dict[str, Any]] | None:
+    """Per-tier calls, latency and escalation rate over the run, for tuning the cascade."""
+    totals: dict[str, dict[str, Any]] = {}
+    for cascade in cascades:
+        for stats in (cascade or {}).get("tiers", []):
+            tier = totals.setdefault(stats["model"], _tier_stats(stats["model"]))
+            for key in ("calls", "sections", "escalated", "unresolved"):
+                tier[key] += stats[key]
+            tier["latency_sec"] = round(tier["latency_sec"] + stats["latency_sec"], 3)
+    if not totals:
+        return None
+    for tier in totals.values():
+        tier["escalation_rate"] = (
+            round(tier["escalated"] / tier["sections"], 3) if tier["sections"] else None
+        )
+        tier["mean_latency_sec"] = (
+            round(tier["latency_sec"] / tier["calls"], 3) if tier["calls"] else None
+        )
+    return list(totals.values())
+
+
+def _configured_tiers(settings: Settings) -> list[str]:
+    return [model.strip() for model in settings.cascade_models.split(",") if model.strip()]
+
+
+def _cascade_tiers(settings: Settings) -> list[str]:
+    """Models tried cheapest first; empty when the cascade is off."""
+    if settings.dry_run:
+        return []
+    return _configured_tiers(settings)
+
+
+def _projected_prompt_tokens(
+    context: str, settings: Settings, schema_model: type[BaseModel], task_key: str
+) -> int:
+    return estimate_prompt_tokens(
+        clamp_text(context, settings.max_chars),
+        schema_model,
+        SECTION_TASKS.get(task_key),
+        settings.structured_output,
+    )
+
+
+def _plan(metrics: dict, settings: Settings, history: PlanHistory) -> dict[str, Any]:
+    """Capacity plan for a dry-run document (see planner.plan_document)."""
+    tiers = _configured_tiers(settings)
+    if tiers:
+        model, retry_model = tiers[0], tiers[-1]
+    else:
+        model = settings.model_name
+        retry_model = (
+            settings.retry_model
+            if settings.use_retry_model and settings.retry_model
+            else settings.model_name
+        )
+    return plan_document(
+        metrics.get("projected_prompt_tokens") or {},
+        history,
+        model,
+        retry_model,
+        tiers=tiers,
+        cpu_sec=metrics["durations_sec"]["total"],
+        latency_sec=settings.sim_latency_ms / 1000,
+        latency_per_1k_tokens_sec=settings.sim_latency_per_1k_tokens_ms / 1000,
+    )
+
+
+def _section_issues(section: str, result: BaseModel, declared_absent: bool) -> list[str]:
+    partial = ExtractionResult(**{section: getattr(result, section)})
+    _, metrics, _ = apply_quality_checks(partial, sections={section})
+    issues = metrics["quality_issues"].get(section, [])
+    if declared_absent:
+        # The report says the section is not there; a stronger model will not find it.
+        issues = [issue for issue in issues if issue not in ("no_rows", "no_values")]
+    return issues
+
+
+def _escalate_section(
+    result: SchemaModel,
+    context: str,
+    settings: Settings,
+    schema_model: type[SchemaModel],
+    section: str,
+    tiers: list[str],
+    tier_stats: list[dict[str, Any]],
+    declared_absent: bool,
+    logger: logging.Logger,
+    pdf_name: str,
+) -> tuple[SchemaModel, dict, dict[str, float], dict[str, int]]:
+    """Re-extract `section` on stronger tiers while quality checks flag its result."""
+    trail: dict = {"models": [tiers[0]], "issues": []}
+    durations: dict[str, float] = {}
+    inputs: dict[str, int] = {}
+    tier = 0
+    while True:
+        issues = _section_issues(section, result, declared_absent)
+        trail["issues"].append(issues)
+        tier_stats[tier]["sections"] += 1
+        if not issues or tier + 1 >= len(tiers):
+            # Issues left on the last tier are not fixable by escalation.
+            tier_stats[tier]["unresolved"] += bool(issues)
+            CASCADE_SECTIONS.inc(tier=tiers[tier], outcome="unresolved" if issues else "accepted")
+            break
+        CASCADE_SECTIONS.inc(tier=tiers[tier], outcome="escalated")
+        tier_stats[tier]["escalated"] += 1
+        tier += 1
+        log_event(
+            logger,
+            "section_escalated",
+            pdf=pdf_name,
+            section=section,
+            from_model=tiers[tier - 1],
+            to_model=tiers[tier],
+            issues=issues,
+        )
+        key = f"{section}_tier{tier}"
+        result, durations[key], inputs[key] = _extract_section_with_metrics(
+            context,
+            settings,
+            schema_model,
+            section,
+            logger,
+            pdf_name,
+            section,
+            model_name=tiers[tier],
+            tier=tier,
+        )
+        tier_stats[tier]["calls"] += 1
+        tier_stats[tier]["latency_sec"] = round(tier_stats[tier]["latency_sec"] + durations[key], 3)
+        trail["models"].append(tiers[tier])
+    trail["final_model"] = tiers[tier]
+    return result, trail, durations, inputs
+
+
+def _prepare_document(
+    pdf_path: Path, settings: Settings
+) -> tuple[WorkPackage, Sequence[str], Bm25Index | None, dict[str, list[int]]]:
+    """CPU stages: pages, selection, tables, table parser, context packing."""
     logger = logging.getLogger("pipeline")
     pdf_name = pdf_path.name
     sections = _resolve_sections(settings)
@@ -232,12 +643,15 @@ def process_pdf_two_stage(pdf_path: Path, settings: Settings) -> tuple[Extractio
     pdf_start = time.perf_counter()
     log_event(logger, "pdf_start", pdf=pdf_name, strategy="two_stage", sections=sorted(sections))
 
-    pages, contexts, page_indices, context_metrics = _build_two_stage_contexts(
+    pages, contexts, page_indices, page_scores, index, context_metrics = _build_two_stage_contexts(
         pdf_path, settings, sections
     )
-    # Detect explicit "no reserves/economics" statements to explain empty outputs.
-    no_reserves_pages = find_pages_with_patterns(pages, NO_RESERVES_PATTERNS)
-    no_economics_pages = find_pages_with_patterns(pages, NO_ECONOMICS_PATTERNS)
+    record_cache("pages", context_metrics["cache_hit"])
+    if settings.bm25_enabled:
+        record_cache("bm25_index", context_metrics["index_cache_hit"])
+    set_attributes(page_count=context_metrics["page_count"], chars=context_metrics["chars"])
+    no_reserves_pages = context_metrics["no_reserves_pages"]
+    no_economics_pages = context_metrics["no_economics_pages"]
     log_event(
         logger,
         "pages_extracted",
@@ -263,52 +677,32 @@ def process_pdf_two_stage(pdf_path: Path, settings: Settings) -> tuple[Extractio
             page_count=context_metrics.get("page_count"),
         )
 
-    resources_context = contexts.get("resources", "")
-    reserves_context = contexts.get("reserves", "")
-    economics_context = contexts.get("economics", "")
-    if "resources" in sections:
-        resources_context = _focus_context(
-            resources_context,
-            SECTION_CONFIGS["resources"].keywords + SECTION_CONFIGS["resources"].table_keywords,
-            settings,
-        )
-    if "reserves" in sections:
-        reserves_context = _focus_context(
-            reserves_context,
-            SECTION_CONFIGS["reserves"].keywords + SECTION_CONFIGS["reserves"].table_keywords,
-            settings,
-        )
-    # Economics tends to be sparse; keep full context to avoid losing values.
+    for section in FOCUSED_SECTIONS:
+        if section in sections:
+            contexts[section] = _focus_context(
+                contexts.get(section, ""),
+                SECTION_CONFIGS[section].keywords + SECTION_CONFIGS[section].table_keywords,
+                settings,
+            )
 
     table_counts: dict[str, int] = {}
     table_selected: dict[str, int] = {}
     table_durations: dict[str, float] = {}
+    section_tables: dict[str, list[dict[str, str]]] = {}
     for key in ["resources", "reserves", "economics"]:
         if key not in sections:
             continue
         pages_for_section = page_indices.get(key, [])
         table_start = time.perf_counter()
-        tables = extract_tables_for_pages(pdf_path, pages_for_section)
-        filtered_tables = filter_tables_for_section(
-            tables, key, max_tables=TABLE_LIMITS.get(key, 6)
-        )
+        with _stage(f"tables:{key}"):
+            tables = extract_tables_for_pages(pdf_path, pages_for_section)
+            filtered_tables = filter_tables_for_section(
+                tables, key, max_tables=TABLE_LIMITS.get(key, 6)
+            )
         table_durations[key] = time.perf_counter() - table_start
         table_counts[key] = len(tables)
         table_selected[key] = len(filtered_tables)
-        table_context = build_table_context(filtered_tables)
-        if table_context:
-            if key == "resources":
-                resources_context = _combine_contexts(
-                    table_context, resources_context, settings.max_chars
-                )
-            elif key == "reserves":
-                reserves_context = _combine_contexts(
-                    table_context, reserves_context, settings.max_chars
-                )
-            else:
-                economics_context = _combine_contexts(
-                    table_context, economics_context, settings.max_chars
-                )
+        section_tables[key] = filtered_tables
         log_event(
             logger,
             "tables_extracted",
@@ -320,201 +714,318 @@ def process_pdf_two_stage(pdf_path: Path, settings: Settings) -> tuple[Extractio
             duration_sec=round(table_durations[key], 3),
         )
 
-    llm_durations: dict[str, float] = {}
-    llm_inputs: dict[str, int] = {}
-    metadata_result = MetadataResult()
-    resources_result = ResourcesResult()
-    reserves_result = ReservesResult()
-    economics_result = EconomicsResult()
-
-    if "metadata" in sections:
-        metadata_result, llm_durations["metadata"], llm_inputs["metadata"] = (
-            _extract_section_with_metrics(
-                contexts.get("metadata", ""),
-                settings,
-                MetadataResult,
-                "metadata",
-                logger,
-                pdf_name,
-                "metadata",
-            )
+    context_budget: dict[str, dict] = {}
+    packed_units: dict[str, list[ContextUnit]] = {}
+    for section in SECTION_SCHEMAS:
+        if section not in sections:
+            continue
+        packed = _pack_section_context(
+            contexts.get(section, ""),
+            page_scores.get(section, {}),
+            section_tables.get(section, []),
+            settings,
         )
-    if "resources" in sections:
-        resources_result, llm_durations["resources"], llm_inputs["resources"] = (
-            _extract_section_with_metrics(
-                resources_context,
-                settings,
-                ResourcesResult,
-                "resources",
+        contexts[section] = packed.text
+        context_budget[section] = packed.stats()
+        packed_units[section] = packed.units
+
+    section_paths: dict[str, str] = {}
+    table_rows: dict[str, list[dict]] = {}
+    table_parser_confidence: dict[str, float] = {}
+    if settings.table_parser_enabled:
+        # Clean statement tables map straight onto rows; the LLM only sees the rest.
+        for section in ("resources", "reserves"):
+            if section not in sections:
+                continue
+            parsed = parse_statement_tables(section_tables.get(section, []), section)
+            table_parser_confidence[section] = parsed.confidence
+            if not parsed.rows or parsed.confidence < settings.table_parser_min_confidence:
+                continue
+            table_rows[section] = [row.model_dump(mode="json") for row in parsed.rows]
+            section_paths[section] = "table_parser"
+            log_event(
                 logger,
-                pdf_name,
-                "resources",
+                "table_parser_used",
+                pdf=pdf_name,
+                section=section,
+                rows=len(parsed.rows),
+                confidence=parsed.confidence,
+                page=parsed.page,
             )
-        )
-    if "reserves" in sections:
-        reserves_result, llm_durations["reserves"], llm_inputs["reserves"] = (
+    llm_sections = [section for section in packed_units if section not in section_paths]
+
+    # Short reports select nearly the same pages for every section; one combined call
+    # then replaces several prompts that would carry the same content.
+    combined_units = merge_units(packed_units[section] for section in llm_sections)
+    combined_tokens = sum(unit.tokens for unit in combined_units)
+    use_combined = (
+        settings.combined_call_max_tokens > 0
+        and len(llm_sections) > 1
+        and combined_tokens <= settings.combined_call_max_tokens
+    )
+    extraction_path = "combined" if use_combined else "per_section"
+    log_event(
+        logger,
+        "extraction_path_selected",
+        pdf=pdf_name,
+        path=extraction_path,
+        combined_tokens=combined_tokens,
+        section_tokens=sum(stats["used_tokens"] for stats in context_budget.values()),
+    )
+
+    combined_context = None
+    sent_pages: dict[str, list[int]] = dict(page_indices)
+    if use_combined:
+        combined = pack_context(combined_units, 0)
+        context_budget["combined"] = combined.stats()
+        combined_context = combined.text
+        all_sent = sorted({idx for indices in page_indices.values() for idx in indices})
+        sent_pages = {section: all_sent for section in llm_sections}
+
+    package = WorkPackage(
+        source_pdf=pdf_name,
+        sha256=file_sha256(pdf_path),
+        sections=sorted(sections),
+        llm_sections=llm_sections,
+        extraction_path=extraction_path,
+        contexts={section: contexts.get(section, "") for section in llm_sections},
+        combined_context=combined_context,
+        section_paths=section_paths,
+        table_rows=table_rows,
+        table_parser_confidence=table_parser_confidence,
+        selected_pages=page_indices,
+        table_counts=table_counts,
+        table_selected=table_selected,
+        no_reserves_pages=no_reserves_pages,
+        no_economics_pages=no_economics_pages,
+        context_budget=context_budget,
+        stats={
+            "page_count": context_metrics["page_count"],
+            "scan_page_loads": context_metrics["scan_page_loads"],
+            "cache_hit": context_metrics["cache_hit"],
+            "boilerplate_lines": context_metrics["boilerplate_lines"],
+            "boilerplate_chars": context_metrics["boilerplate_chars"],
+            "index_cache_hit": context_metrics["index_cache_hit"],
+            "page_index": context_metrics["page_index"],
+            "durations_sec": {
+                "page_extract": round(context_metrics["page_extract_sec"], 3),
+                "index": round(context_metrics["index_sec"], 3),
+                "selection": {k: round(v, 3) for k, v in context_metrics["selection_sec"].items()},
+                "table_extract": {k: round(v, 3) for k, v in table_durations.items()},
+                "prepare": round(time.perf_counter() - pdf_start, 3),
+            },
+        },
+    )
+    return package, pages, index, sent_pages
+
+
+def extract_document(
+    package: WorkPackage,
+    settings: Settings,
+    fallback: Callable[[str], tuple[str, dict]] | None = None,
+) -> tuple[ExtractionResult, dict]:
+    """LLM stages for a prepared document: extraction, cascade, retries, quality checks.
+
+    `fallback` builds a section's retry context on demand; without it the context
+    precomputed in the package is used.
+    """
+    logger = logging.getLogger("pipeline")
+    pdf_name = package.source_pdf
+    sections = set(package.sections)
+    llm_sections = package.llm_sections
+    contexts = package.contexts
+    context_budget = dict(package.context_budget)
+    section_paths = dict(package.section_paths)
+    extract_start = time.perf_counter()
+
+    section_results: dict[str, BaseModel] = {
+        section: schema_model() for section, schema_model in SECTION_SCHEMAS.items()
+    }
+    for section, rows in package.table_rows.items():
+        section_results[section] = SECTION_SCHEMAS[section](**{section: rows})
+
+    llm_durations: dict[str, float] = {}
+    llm_inputs: dict[str, int] = {}
+    tiers = _cascade_tiers(settings)
+    first_model = tiers[0] if tiers else None
+    tier_stats = [_tier_stats(model) for model in tiers]
+    if package.combined_context is not None:
+        combined_result, llm_durations["combined"], llm_inputs["combined"] = (
             _extract_section_with_metrics(
-                reserves_context,
+                package.combined_context,
                 settings,
-                ReservesResult,
-                "reserves",
+                ExtractionResult,
+                "combined",
                 logger,
                 pdf_name,
-                "reserves",
+                "combined",
+                model_name=first_model,
             )
         )
-    if "economics" in sections:
-        economics_result, llm_durations["economics"], llm_inputs["economics"] = (
-            _extract_section_with_metrics(
-                economics_context,
-                settings,
-                EconomicsResult,
-                "economics",
-                logger,
-                pdf_name,
-                "economics",
+        if tiers:
+            tier_stats[0]["calls"] += 1
+            tier_stats[0]["latency_sec"] = round(llm_durations["combined"], 3)
+        for section in llm_sections:
+            section_results[section] = SECTION_SCHEMAS[section](
+                **{section: getattr(combined_result, section)}
             )
+            section_paths[section] = "combined"
+    else:
+        for section, schema_model in SECTION_SCHEMAS.items():
+            if section not in llm_sections:
+                continue
+            section_paths[section] = "llm"
+            section_results[section], llm_durations[section], llm_inputs[section] = (
+                _extract_section_with_metrics(
+                    contexts.get(section, ""),
+                    settings,
+                    schema_model,
+                    section,
+                    logger,
+                    pdf_name,
+                    section,
+                    model_name=first_model,
+                )
+            )
+            if tiers:
+                tier_stats[0]["calls"] += 1
+                tier_stats[0]["latency_sec"] = round(
+                    tier_stats[0]["latency_sec"] + llm_durations[section], 3
+                )
+
+    empty_reasons = {
+        "reserves": ("no reserves reported in document", package.no_reserves_pages),
+        "economics": ("economics not reported in document", package.no_economics_pages),
+    }
+    cascade_sections: dict[str, dict] = {}
+    for section in llm_sections if tiers else []:
+        # Escalation re-sends the section's own packed context, also after a combined call.
+        section_results[section], cascade_sections[section], durations, inputs = _escalate_section(
+            section_results[section],
+            contexts.get(section, ""),
+            settings,
+            SECTION_SCHEMAS[section],
+            section,
+            tiers,
+            tier_stats,
+            bool(empty_reasons.get(section, ("", []))[1]),
+            logger,
+            pdf_name,
         )
+        llm_durations.update(durations)
+        llm_inputs.update(inputs)
 
     warnings: list[str] = []
+    retry_saved_chars: dict[str, int] = {}
 
-    if "metadata" in sections and not settings.dry_run:
-        if not metadata_result.metadata.project_name and not metadata_result.metadata.company_name:
-            if settings.retries_enabled:
-                warnings.append("metadata missing; retrying with fallback selection")
-                fallback_context = _fallback_context(pages, settings, "metadata")
-                if fallback_context:
-                    (
-                        metadata_result,
-                        llm_durations["metadata_retry"],
-                        llm_inputs["metadata_retry"],
-                    ) = _extract_section_with_metrics(
-                        fallback_context,
-                        settings,
-                        MetadataResult,
-                        "metadata",
-                        logger,
-                        pdf_name,
-                        "metadata",
-                        retry=True,
-                    )
-            else:
-                warnings.append("metadata missing; retries disabled")
-
-    if "resources" in sections and not settings.dry_run:
-        if not resources_result.resources:
-            if settings.retries_enabled:
-                warnings.append("resources missing; retrying with fallback selection")
-                fallback_context = _fallback_context(pages, settings, "resources")
-                if fallback_context:
-                    (
-                        resources_result,
-                        llm_durations["resources_retry"],
-                        llm_inputs["resources_retry"],
-                    ) = _extract_section_with_metrics(
-                        fallback_context,
-                        settings,
-                        ResourcesResult,
-                        "resources",
-                        logger,
-                        pdf_name,
-                        "resources",
-                        retry=True,
-                    )
-            else:
-                warnings.append("resources missing; retries disabled")
-
-    if "reserves" in sections and not settings.dry_run:
-        if not reserves_result.reserves:
-            if settings.retries_enabled:
-                warnings.append("reserves missing; retrying with fallback selection")
-                fallback_context = _fallback_context(pages, settings, "reserves")
-                if fallback_context:
-                    (
-                        reserves_result,
-                        llm_durations["reserves_retry"],
-                        llm_inputs["reserves_retry"],
-                    ) = _extract_section_with_metrics(
-                        fallback_context,
-                        settings,
-                        ReservesResult,
-                        "reserves",
-                        logger,
-                        pdf_name,
-                        "reserves",
-                        retry=True,
-                    )
-            else:
-                warnings.append("reserves missing; retries disabled")
-            if no_reserves_pages:
-                warnings.append(
-                    f"no reserves reported in document (pages: {', '.join(map(str, no_reserves_pages))})"
-                )
-
-    if "economics" in sections and not settings.dry_run:
-        if not _has_economics(economics_result.economics):
-            if settings.retries_enabled:
-                warnings.append("economics missing; retrying with fallback selection")
-                fallback_context = _fallback_context(pages, settings, "economics")
-                if fallback_context:
-                    (
-                        economics_result,
-                        llm_durations["economics_retry"],
-                        llm_inputs["economics_retry"],
-                    ) = _extract_section_with_metrics(
-                        fallback_context,
-                        settings,
-                        EconomicsResult,
-                        "economics",
-                        logger,
-                        pdf_name,
-                        "economics",
-                        retry=True,
-                    )
+    for section, schema_model in SECTION_SCHEMAS.items():
+        if section not in sections or settings.dry_run:
+            continue
+        if not _section_missing(section, section_results[section]):
+            continue
+        if settings.retries_enabled:
+            warnings.append(f"{section} missing; retrying with fallback selection")
+            if fallback is not None:
+                fallback_context, fallback_stats = fallback(section)
             else:
-                warnings.append("economics missing; retries disabled")
-            if no_economics_pages:
-                warnings.append(
-                    f"economics not reported in document (pages: {', '.join(map(str, no_economics_pages))})"
+                prepared = package.fallback.get(section, {})
+                fallback_context = prepared.get("context", "")
+                fallback_stats = prepared.get("stats", {"saved_chars": 0, "budget": {}})
+            retry_saved_chars[section] = fallback_stats["saved_chars"]
+            if fallback_context:
+                retry_key = f"{section}_retry"
+                context_budget[retry_key] = fallback_stats["budget"]
+                (
+                    section_results[section],
+                    llm_durations[retry_key],
+                    llm_inputs[retry_key],
+                ) = _extract_section_with_metrics(
+                    fallback_context,
+                    settings,
+                    schema_model,
+                    section,
+                    logger,
+                    pdf_name,
+                    section,
+                    retry=True,
+                    model_name=tiers[-1] if tiers else None,
                 )
+        else:
+            warnings.append(f"{section} missing; retries disabled")
+        reason, reason_pages = empty_reasons.get(section, ("", []))
+        if reason_pages:
+            warnings.append(f"{reason} (pages: {', '.join(map(str, reason_pages))})")
 
     result = ExtractionResult(
-        metadata=metadata_result.metadata,
-        resources=resources_result.resources,
-        reserves=reserves_result.reserves,
-        economics=economics_result.economics,
+        metadata=cast(MetadataResult, section_results["metadata"]).metadata,
+        resources=cast(ResourcesResult, section_results["resources"]).resources,
+        reserves=cast(ReservesResult, section_results["reserves"]).reserves,
+        economics=cast(EconomicsResult, section_results["economics"]).economics,
         warnings=warnings,
     )
 
     result.metadata.source_pdf = pdf_name
-    result, quality_metrics, quality_warnings = apply_quality_checks(result, sections=sections)
+    with _stage("quality"):
+        result, quality_metrics, quality_warnings = apply_quality_checks(result, sections=sections)
     result.warnings.extend(quality_warnings)
+    projected: dict[str, int] = {}
     if settings.dry_run:
         result.warnings.append("dry_run: extraction skipped")
+        # What the skipped calls would have sent, for the capacity plan.
+        if package.combined_context is not None:
+            projected["combined"] = _projected_prompt_tokens(
+                package.combined_context, settings, ExtractionResult, "combined"
+            )
+        for section in llm_sections:
+            tokens = _projected_prompt_tokens(
+                contexts.get(section, ""), settings, SECTION_SCHEMAS[section], section
+            )
+            if package.combined_context is None:
+                projected[section] = tokens
+            # Escalations re-send the section's own context, also after a combined call.
+            for tier in range(1, len(_configured_tiers(settings))):
+                projected[f"{section}:tier{tier}"] = tokens
+            if settings.retries_enabled:
+                # Fallback contexts are packed to the same budget; history refines this.
+                projected[f"{section}:retry"] = tokens
 
     if result.confidence is None:
         result.confidence = _score_result(result)
 
-    total_duration = time.perf_counter() - pdf_start
+    stats = package.stats
+    prepare_durations = dict(stats["durations_sec"])
+    total_duration = prepare_durations.pop("prepare") + time.perf_counter() - extract_start
     metrics = {
         "source_pdf": pdf_name,
-        "sha256": file_sha256(pdf_path),
+        "sha256": package.sha256,
         "sections": sorted(sections),
-        "page_count": context_metrics["page_count"],
-        "cache_hit": context_metrics["cache_hit"],
-        "selected_pages": page_indices,
-        "table_counts": table_counts,
-        "table_selected": table_selected,
-        "no_reserves_pages": no_reserves_pages,
-        "no_economics_pages": no_economics_pages,
+        "page_count": stats["page_count"],
+        "cache_hit": stats["cache_hit"],
+        "boilerplate_lines": stats["boilerplate_lines"],
+        "boilerplate_chars": stats["boilerplate_chars"],
+        "index_cache_hit": stats["index_cache_hit"],
+        "page_index": stats["page_index"],
+        "scan_page_loads": stats.get("scan_page_loads"),
+        "page_loads": stats.get("page_loads"),
+        "selected_pages": package.selected_pages,
+        "table_counts": package.table_counts,
+        "table_selected": package.table_selected,
+        "no_reserves_pages": package.no_reserves_pages,
+        "no_economics_pages": package.no_economics_pages,
         "durations_sec": {
-            "page_extract": round(context_metrics["page_extract_sec"], 3),
-            "selection": {k: round(v, 3) for k, v in context_metrics["selection_sec"].items()},
-            "table_extract": {k: round(v, 3) for k, v in table_durations.items()},
+            **prepare_durations,
             "llm": {k: round(v, 3) for k, v in llm_durations.items()},
             "total": round(total_duration, 3),
         },
         "llm_input_chars": llm_inputs,
+        "projected_prompt_tokens": projected or None,
+        "extraction_path": package.extraction_path,
+        "section_paths": section_paths,
+        "table_parser_confidence": package.table_parser_confidence,
+        "llm_calls_avoided": sum(1 for path in section_paths.values() if path == "table_parser"),
+        "context_budget": context_budget,
+        "retry_saved_chars": retry_saved_chars,
+        "cascade": {"tiers": tier_stats, "sections": cascade_sections} if tiers else None,
         "warnings": result.warnings,
         "confidence": result.confidence,
         **quality_metrics,
@@ -534,6 +1045,54 @@ def process_pdf_two_stage(pdf_path: Path, settings: Settings) -> tuple[Extractio
     return result, metrics
 
 
+def prepare_document(pdf_path: Path, settings: Settings) -> WorkPackage:
+    """Run the CPU stages and precompute retry contexts so the package stands alone."""
+    package, pages, index, sent_pages = _prepare_document(pdf_path, settings)
+    try:
+        if settings.retries_enabled and not settings.dry_run:
+            with _stage("fallback_contexts"):
+                for section in package.llm_sections:
+                    context, stats = _fallback_context(
+                        pages,
+                        settings,
+                        section,
+                        sent_pages=sent_pages.get(section, []),
+                        index=index,
+                    )
+                    package.fallback[section] = {"context": context, "stats": stats}
+    finally:
+        if isinstance(pages, PageProvider):
+            package.stats["page_loads"] = pages.loads
+            pages.close()
+    return package
+
+
+def process_pdf_two_stage(pdf_path: Path, settings: Settings) -> tuple[ExtractionResult, dict]:
+    package, pages, index, sent_pages = _prepare_document(pdf_path, settings)
+    logger = logging.getLogger("pipeline")
+
+    def _fallback(section: str) -> tuple[str, dict]:
+        # In-process runs only build a retry context for sections that come back empty.
+        return _fallback_context(
+            pages,
+            settings,
+            section,
+            sent_pages=sent_pages.get(section, []),
+            logger=logger,
+            pdf_name=package.source_pdf,
+            index=index,
+        )
+
+    try:
+        result, metrics = extract_document(package, settings, _fallback)
+    finally:
+        if isinstance(pages, PageProvider):
+            pages.close()
+    if isinstance(pages, PageProvider):
+        metrics["page_loads"] = pages.loads
+    return result, metrics
+
+
 def process_pdf(pdf_path: Path, settings: Settings) -> tuple[ExtractionResult, dict]:
     logger = logging.getLogger("pipeline")
     pdf_name = pdf_path.name
@@ -543,7 +1102,8 @@ def process_pdf(pdf_path: Path, settings: Settings) -> tuple[ExtractionResult, d
     log_event(logger, "pdf_start", pdf=pdf_name, strategy="single", sections=sorted(sections))
 
     parse_start = time.perf_counter()
-    parsed = parse_pdf_to_markdown(pdf_path, settings.llama_parse_api_key)
+    with _stage("parse"):
+        parsed = parse_pdf_to_markdown(pdf_path, settings.llama_parse_api_key)
     parse_duration = time.perf_counter() - parse_start
     text = clamp_text(parsed.text, settings.max_chars)
 
@@ -552,12 +1112,16 @@ def process_pdf(pdf_path: Path, settings: Settings) -> tuple[ExtractionResult, d
         result = ExtractionResult()
     else:
         llm_start = time.perf_counter()
-        result = extract_structured(
-            document_text=text,
-            model_name=settings.model_name,
-            api_key=settings.gemini_api_key,
-            provider=settings.llm_provider,
-        )
+        with _stage("llm:full"), usage_section("full"):
+            result = extract_structured(
+                document_text=text,
+                model_name=settings.model_name,
+                api_key=settings.gemini_api_key,
+                provider=settings.llm_provider,
+                structured_output=settings.structured_output,
+                simulation=_build_simulation_settings(settings),
+                retry_policy=_build_retry_policy(settings),
+            )
         llm_duration = time.perf_counter() - llm_start
 
     result.metadata.source_pdf = pdf_name
@@ -566,7 +1130,8 @@ def process_pdf(pdf_path: Path, settings: Settings) -> tuple[ExtractionResult, d
     if parsed.parser_name != "llama_parse":
         result.warnings.append("llama_parse not used; parsing quality may be lower")
 
-    result, quality_metrics, quality_warnings = apply_quality_checks(result, sections=sections)
+    with _stage("quality"):
+        result, quality_metrics, quality_warnings = apply_quality_checks(result, sections=sections)
     result.warnings.extend(quality_warnings)
     if settings.dry_run:
         result.warnings.append("dry_run: extraction skipped")
@@ -606,79 +1171,394 @@ def process_pdf(pdf_path: Path, settings: Settings) -> tuple[ExtractionResult, d
     return result, metrics
 
 
+def prepare_packages(
+    data_dir: Path,
+    packages_dir: Path,
+    sqlite_path: Path,
+    settings: Settings,
+    limit: int | None = None,
+) -> list[Path]:
+    """CPU half of a split run: write one work package per PDF for a later extract run."""
+    if not logging.getLogger().handlers:
+        configure_logging(
+            Path(settings.log_dir) if settings.log_dir else packages_dir / "logs",
+            settings.log_level,
+            parse_sample_rates(settings.log_sample_rates),
+        )
+    logger = logging.getLogger("pipeline")
+    pdfs = sorted(Path(data_dir).glob("*.pdf"))
+    if limit:
+        pdfs = pdfs[:limit]
+    page_index = PageIndex(sqlite_path) if settings.page_index_enabled else None
+    page_index_token = set_page_index(page_index)
+    start = time.perf_counter()
+    log_event(
+        logger,
+        "prepare_start",
+        pdfs=len(pdfs),
+        packages_dir=str(packages_dir),
+        max_workers=settings.max_workers,
+    )
+
+    def _prepare(pdf_path: Path) -> Path | None:
+        doc_start = time.perf_counter()
+        try:
+            package = prepare_document(pdf_path, settings)
+            path = write_package(package, packages_dir)
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            logger.exception("package_failed %s", pdf_path.name)
+            log_event(logger, "package_failed", pdf=pdf_path.name, error=error[:500])
+            return None
+        log_event(
+            logger,
+            "package_written",
+            pdf=pdf_path.name,
+            path=str(path),
+            llm_sections=package.llm_sections,
+            extraction_path=package.extraction_path,
+            duration_sec=round(time.perf_counter() - doc_start, 3),
+        )
+        return path
+
+    try:
+        if settings.max_workers > 1 and len(pdfs) > 1:
+            with ThreadPoolExecutor(max_workers=settings.max_workers) as executor:
+                futures = [
+                    executor.submit(contextvars.copy_context().run, _prepare, pdf) for pdf in pdfs
+                ]
+                written = [future.result() for future in futures]
+        else:
+            written = [_prepare(pdf) for pdf in pdfs]
+    finally:
+        reset_page_index(page_index_token)
+        if page_index:
+            page_index.close()
+
+    paths = [path for path in written if path is not None]
+    log_event(
+        logger,
+        "prepare_end",
+        packages=len(paths),
+        failed=len(pdfs) - len(paths),
+        duration_sec=round(time.perf_counter() - start, 3),
+    )
+    return paths
+
+
 def run_pipeline(
     data_dir: Path,
     output_dir: Path,
     sqlite_path: Path,
     settings: Settings,
     limit: int | None = None,
+    resume_run_id: str | None = None,
+    packages_dir: Path | None = None,
 ) -> list[ExtractionResult]:
+    """Process every PDF in `data_dir`, or every work package in `packages_dir` when set.
+
+    With `packages_dir` only the LLM stages run (see `prepare_packages`); results, the
+    manifest, checkpoints and budgets behave the same as for a full run.
+    """
     if not logging.getLogger().handlers:
         configure_logging(
-            Path(settings.log_dir) if settings.log_dir else output_dir / "logs", settings.log_level
+            Path(settings.log_dir) if settings.log_dir else output_dir / "logs",
+            settings.log_level,
+            parse_sample_rates(settings.log_sample_rates),
         )
     logger = logging.getLogger("pipeline")
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    pdfs = sorted(Path(data_dir).glob("*.pdf"))
+    if packages_dir is not None:
+        pdfs = list_packages(packages_dir)
+    else:
+        pdfs = sorted(Path(data_dir).glob("*.pdf"))
     if limit:
         pdfs = pdfs[:limit]
 
-    run_id = datetime.now(timezone.utc).isoformat()
+    started_at = datetime.now(timezone.utc)
+    # Run ids name a directory, so keep them free of ':' and other path-hostile characters.
+    run_id = resume_run_id or started_at.strftime("%Y%m%dT%H%M%S%fZ")
+    checkpoint_dir = run_dir(output_dir, run_id) / "checkpoints"
+    if resume_run_id and not checkpoint_dir.exists():
+        raise FileNotFoundError(f"No checkpoints found for run {resume_run_id}: {checkpoint_dir}")
     run_start = time.perf_counter()
+    profiler: RunProfiler | None = None
+    if settings.profile_enabled:
+        profiler = RunProfiler(
+            run_dir(output_dir, run_id) / "profiles",
+            sample_rate=settings.profile_sample_rate,
+            top_n=settings.profile_top_n,
+            memory=settings.profile_memory,
+        )
+        profiler.start()
+
+    def _profiled(name: str, force: bool = False) -> AbstractContextManager:
+        return profiler.document(name, force=force) if profiler else nullcontext()
+
+    tracer = configure_tracing(settings.tracing_enabled)
+    page_index = PageIndex(sqlite_path) if settings.page_index_enabled else None
+    page_index_token = set_page_index(page_index)
+    if settings.metrics_port:
+        start_http_server(settings.metrics_port)
+    metrics_textfile = Path(settings.metrics_textfile) if settings.metrics_textfile else None
+
+    results: list[ExtractionResult | None] = [None] * len(pdfs)
+    metrics: list[dict | None] = [None] * len(pdfs)
+    pending: list[int] = []
+    for idx, pdf in enumerate(pdfs):
+        restored = load_checkpoint(checkpoint_dir, pdf) if resume_run_id else None
+        if restored:
+            result, info = restored
+            info["resumed"] = True
+            results[idx], metrics[idx] = result, info
+        else:
+            pending.append(idx)
+
     log_event(
         logger,
         "run_start",
         run_id=run_id,
         pdfs=len(pdfs),
-        strategy=settings.extraction_strategy,
+        resumed=len(pdfs) - len(pending),
+        strategy="packages" if packages_dir is not None else settings.extraction_strategy,
         max_workers=settings.max_workers,
         dry_run=settings.dry_run,
     )
 
-    results: list[ExtractionResult | None] = [None] * len(pdfs)
-    metrics: list[dict | None] = [None] * len(pdfs)
-
-    def _process(pdf_path: Path) -> tuple[ExtractionResult, dict]:
-        if settings.extraction_strategy == "two_stage":
-            return process_pdf_two_stage(pdf_path, settings)
-        return process_pdf(pdf_path, settings)
-
-    if settings.max_workers > 1 and len(pdfs) > 1:
-        with ThreadPoolExecutor(max_workers=settings.max_workers) as executor:
-            future_map = {executor.submit(_process, pdf): idx for idx, pdf in enumerate(pdfs)}
-            for future in as_completed(future_map):
-                idx = future_map[future]
-                result, info = future.result()
-                results[idx] = result
-                metrics[idx] = info
-    else:
-        for idx, pdf in enumerate(pdfs):
-            result, info = _process(pdf)
-            results[idx] = result
-            metrics[idx] = info
-
-    final_results = [result for result in results if result is not None]
-    save_json(final_results, output_dir)
-    save_csvs(final_results, output_dir)
-    save_sqlite(final_results, sqlite_path)
-
     settings_dict = settings.__dict__.copy()
     if settings_dict.get("gemini_api_key"):
         settings_dict["gemini_api_key"] = "set"
     if settings_dict.get("llama_parse_api_key"):
         settings_dict["llama_parse_api_key"] = "set"
 
+    plan_history = None
+    if settings.dry_run:
+        # Read before the new manifest replaces the previous run's.
+        history_paths = [Path(p.strip()) for p in settings.plan_history.split(",") if p.strip()]
+        plan_history = load_history(history_paths or [output_dir / MANIFEST_JSONL])
+
+    simulation = _build_simulation_settings(settings)
+    if simulation is not None:
+        # The provider outlives the run (shared quota); its attempt counter must not.
+        get_simulated_provider(simulation).reset()
+
+    manifest = ManifestWriter(output_dir / MANIFEST_JSONL)
+    manifest.header(
+        run_id=run_id,
+        started_at=started_at.isoformat(),
+        run_dir=str(run_dir(output_dir, run_id)),
+        resumed_from=resume_run_id,
+        settings=settings_dict,
+    )
+    budget = BudgetController.from_settings(
+        settings, total_documents=len(pdfs), context_shrinkable=packages_dir is None
+    )
+    for restored_metrics in metrics:
+        if restored_metrics is not None:
+            manifest.document(restored_metrics)
+            if budget:
+                # Spend from the interrupted attempt of this run counts against its budget.
+                budget.observe(restored_metrics, None)
+
+    def _record_budget_decisions() -> None:
+        for decision in budget.pop_decisions() if budget else []:
+            log_event(logger, "budget_decision", run_id=run_id, **decision)
+            manifest.budget(decision)
+
+    def _next_document() -> tuple[int, Settings, list[str]] | None:
+        if not queue or (budget and not budget.can_schedule()):
+            _record_budget_decisions()
+            return None
+        doc_settings, degraded = budget.apply(settings) if budget else (settings, [])
+        return queue.popleft(), doc_settings, degraded
+
+    def _process(
+        pdf_path: Path, doc_settings: Settings, degraded: list[str]
+    ) -> tuple[ExtractionResult | None, dict]:
+        QUEUE_DEPTH.dec()
+        DOCUMENTS_IN_PROGRESS.inc()
+        doc_start = time.perf_counter()
+        try:
+            result, info = _process_document(pdf_path, doc_settings)
+        finally:
+            DOCUMENTS_IN_PROGRESS.dec()
+        doc_duration = time.perf_counter() - doc_start
+        DOCUMENT_SECONDS.observe(doc_duration)
+        DOCUMENTS.inc(status=info["status"])
+        if degraded:
+            info["budget_degraded"] = degraded
+        manifest.document(info)
+        if budget:
+            budget.observe(info, doc_duration)
+            _record_budget_decisions()
+        if metrics_textfile:
+            write_textfile(metrics_textfile)
+        return result, info
+
+    def _process_document(
+        pdf_path: Path, settings: Settings
+    ) -> tuple[ExtractionResult | None, dict]:
+        name = source_name(pdf_path)
+        usage_written = False
+        with collect_calls() as calls, collect_usage() as usage:
+            # One bad document must not take the rest of the batch down with it: a file
+            # removed mid-run or a failed usage/checkpoint write fails this document only.
+            try:
+                with (
+                    span("document", pdf=name, bytes=pdf_path.stat().st_size),
+                    _profiled(name),
+                ):
+                    try:
+                        if packages_dir is not None:
+                            result, info = extract_document(load_package(pdf_path), settings)
+                        elif settings.extraction_strategy == "two_stage":
+                            result, info = process_pdf_two_stage(pdf_path, settings)
+                        else:
+                            result, info = process_pdf(pdf_path, settings)
+                    except Exception as exc:
+                        set_attributes(status="failed", error=f"{type(exc).__name__}: {exc}"[:500])
+                        raise
+                    set_attributes(status="ok")
+                info["status"] = "ok"
+                if plan_history is not None:
+                    info["plan"] = _plan(info, settings, plan_history)
+                info["call_stats"] = summarize_calls(calls)
+                info["usage"] = summarize_usage(usage)
+                write_usage(sqlite_path, run_id, name, usage)
+                usage_written = True
+                write_checkpoint(checkpoint_dir, pdf_path, result, info)
+                return result, info
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                logger.exception("pdf_failed %s", name)
+                log_event(logger, "pdf_failed", pdf=name, error=error[:500])
+                if not usage_written:
+                    try:
+                        # Failed documents still spent tokens on the calls that did succeed.
+                        write_usage(sqlite_path, run_id, name, usage)
+                    except Exception:
+                        logger.exception("usage_write_failed %s", name)
+                return None, {
+                    "source_pdf": name,
+                    "status": "failed",
+                    "error": error,
+                    "call_stats": summarize_calls(calls),
+                    "usage": summarize_usage(usage),
+                }
+
+    queue = deque(pending)
+    QUEUE_DEPTH.inc(len(pending))
+    with span("run", run_id=run_id, pdfs=len(pdfs), workers=settings.max_workers):
+        if settings.max_workers > 1 and len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=settings.max_workers) as executor:
+                # Submit one document per free worker so budget decisions apply to the next
+                # document scheduled instead of a queue that was filled up front.
+                running: dict[Future, int] = {}
+                while True:
+                    while len(running) < settings.max_workers:
+                        scheduled = _next_document()
+                        if scheduled is None:
+                            break
+                        idx, doc_settings, degraded = scheduled
+                        # Copy the context per task so document spans nest under the run span.
+                        future = executor.submit(
+                            contextvars.copy_context().run,
+                            _process,
+                            pdfs[idx],
+                            doc_settings,
+                            degraded,
+                        )
+                        running[future] = idx
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        idx = running.pop(future)
+                        results[idx], metrics[idx] = future.result()
+        else:
+            while (scheduled := _next_document()) is not None:
+                idx, doc_settings, degraded = scheduled
+                results[idx], metrics[idx] = _process(pdfs[idx], doc_settings, degraded)
+
+        for idx in queue:
+            # Left unscheduled by the budget; no checkpoint, so --resume picks them up.
+            QUEUE_DEPTH.dec()
+            DOCUMENTS.inc(status="skipped")
+            skipped = {
+                "source_pdf": source_name(pdfs[idx]),
+                "status": "skipped",
+                "reason": "budget",
+            }
+            metrics[idx] = skipped
+            manifest.document(skipped)
+
+        final_results = [result for result in results if result is not None]
+        with _profiled("_run", force=True), _stage("storage", documents=len(final_results)):
+            save_json(final_results, output_dir)
+            save_csvs(final_results, output_dir)
+            save_sqlite(final_results, sqlite_path)
+            if settings.parquet_enabled:
+                save_parquet(
+                    final_results,
+                    Path(settings.parquet_dir) if settings.parquet_dir else output_dir / "parquet",
+                    run_id=run_id,
+                    ingest_date=started_at.date(),
+                    row_group_size=settings.parquet_row_group_size,
+                )
+    reset_page_index(page_index_token)
+    if page_index:
+        page_index.close()
+    profile_summary = profiler.finish() if profiler else None
+    trace_path = None
+    if tracer:
+        trace_path = export_otlp_json(tracer.drain(), run_dir(output_dir, run_id) / "trace.json")
+    if metrics_textfile:
+        write_textfile(metrics_textfile)
+
     run_duration = time.perf_counter() - run_start
-    manifest = {
-        "run_id": run_id,
-        "started_at": run_id,
-        "duration_sec": round(run_duration, 3),
-        "settings": settings_dict,
-        "pdfs": [m for m in metrics if m is not None],
-    }
-    manifest_path = output_dir / "run_manifest.json"
-    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    failed = [m["source_pdf"] for m in metrics if m is not None and m.get("status") == "failed"]
+    run_usage = merge_usage(m.get("usage") for m in metrics if m is not None)
+    plan = None
+    if plan_history is not None:
+        plan = summarize_plan(
+            (m.get("plan") for m in metrics if m is not None),
+            parse_workers(settings.plan_workers, settings.max_workers),
+            settings.plan_rpm,
+            history_documents=plan_history.documents,
+        )
+        if plan:
+            log_event(
+                logger,
+                "capacity_plan",
+                run_id=run_id,
+                **{key: value for key, value in plan.items() if key != "by_label"},
+            )
+    manifest.footer(
+        run_id=run_id,
+        duration_sec=round(run_duration, 3),
+        failed_pdfs=failed,
+        usage=run_usage,
+        skipped_pdfs=[
+            m["source_pdf"] for m in metrics if m is not None and m.get("status") == "skipped"
+        ],
+        budget=budget.summary() if budget else None,
+        cascade=_cascade_summary(m.get("cascade") for m in metrics if m is not None),
+        plan=plan,
+        trace_path=str(trace_path) if trace_path else None,
+        profile=(
+            {
+                "dir": str(profiler.output_dir),
+                "documents": profile_summary["documents"],
+                "stages": profile_summary["stages"],
+            }
+            if profiler and profile_summary
+            else None
+        ),
+    )
+    manifest.close()
+    if settings.manifest_json:
+        compact_manifest(manifest.path, output_dir / MANIFEST_JSON)
 
     log_event(
         logger,
@@ -686,5 +1566,10 @@ def run_pipeline(
         run_id=run_id,
         duration_sec=round(run_duration, 3),
         pdfs=len(final_results),
+        failed=len(failed),
+        prompt_tokens=run_usage["prompt_tokens"],
+        output_tokens=run_usage["output_tokens"],
+        cost_usd=run_usage["cost_usd"],
     )
+    flush_logging()
     return final_results
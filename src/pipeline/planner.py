@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from .manifest import iter_records
+from .pricing import ModelPrice, cost_usd
+
+# Used when no historical manifest has seen the section or label.
+DEFAULT_RETRY_PROBABILITY = 0.25
+DEFAULT_ESCALATION_PROBABILITY = 0.25
+DEFAULT_OUTPUT_TOKENS = 300
+
+
+@dataclass
+class PlanHistory:
+    """Per-section retry and escalation rates and per-label/per-model call stats from past runs.
+
+    `escalation_probability` is keyed by `<section>:tier<N>`: the share of cascaded sections
+    that reached tier N. `tier_escalation_rate` is the per-tier rate over all sections, used
+    for sections the history has not cascaded.
+    """
+
+    documents: int = 0
+    retry_probability: dict[str, float] = field(default_factory=dict)
+    escalation_probability: dict[str, float] = field(default_factory=dict)
+    tier_escalation_rate: dict[int, float] = field(default_factory=dict)
+    prompt_tokens: dict[str, float] = field(default_factory=dict)
+    output_tokens: dict[str, float] = field(default_factory=dict)
+    latency_sec: dict[str, float] = field(default_factory=dict)
+
+
+def _mean(totals: dict[str, list[float]]) -> dict[str, float]:
+    return {key: value / calls for key, (value, calls) in totals.items() if calls}
+
+
+def _accumulate(target: dict[str, list[float]], key: str, value: float, calls: float) -> None:
+    slot = target.setdefault(key, [0.0, 0.0])
+    slot[0] += value
+    slot[1] += calls
+
+
+def load_history(paths: Iterable[Path]) -> PlanHistory:
+    """Aggregate finished, non-dry-run documents from run manifests (.jsonl or .json)."""
+    documents = 0
+    attempted: dict[str, int] = {}
+    retried: dict[str, int] = {}
+    cascaded: dict[str, int] = {}
+    reached: dict[str, int] = {}
+    tier_totals: dict[int, list[int]] = {}
+    prompt: dict[str, list[float]] = {}
+    output: dict[str, list[float]] = {}
+    latency: dict[str, list[float]] = {}
+    for path in paths:
+        if not path.exists():
+            continue
+        dry_run = False
+        for record in iter_records(path):
+            if record.get("record") == "header":
+                dry_run = bool((record.get("settings") or {}).get("dry_run"))
+            if dry_run or record.get("record") != "pdf" or record.get("status") != "ok":
+                continue
+            usage = record.get("usage") or {}
+            by_section = usage.get("by_section") or {}
+            documents += 1
+            for section, path_kind in (record.get("section_paths") or {}).items():
+                if path_kind not in ("llm", "combined"):
+                    continue
+                attempted[section] = attempted.get(section, 0) + 1
+                if by_section.get(f"{section}:retry", {}).get("calls"):
+                    retried[section] = retried.get(section, 0) + 1
+            cascade = record.get("cascade") or {}
+            tiers = cascade.get("tiers") or []
+            for index, stats in enumerate(tiers):
+                slot = tier_totals.setdefault(index, [0, 0])
+                slot[0] += stats.get("escalated") or 0
+                slot[1] += stats.get("sections") or 0
+            for section, trail in (cascade.get("sections") or {}).items():
+                cascaded[section] = cascaded.get(section, 0) + 1
+                models = trail.get("models") or []
+                for tier in range(1, len(tiers)):
+                    label = f"{section}:tier{tier}"
+                    reached[label] = reached.get(label, 0) + (len(models) > tier)
+            for label, totals in by_section.items():
+                calls = totals.get("calls") or 0
+                _accumulate(prompt, label, totals.get("prompt_tokens") or 0, calls)
+                _accumulate(output, label, totals.get("output_tokens") or 0, calls)
+            for model, totals in (usage.get("by_model") or {}).items():
+                _accumulate(
+                    latency, model, totals.get("latency_sec") or 0.0, totals.get("calls") or 0
+                )
+    return PlanHistory(
+        documents=documents,
+        retry_probability={
+            section: retried.get(section, 0) / count for section, count in attempted.items()
+        },
+        escalation_probability={
+            label: count / cascaded[label.partition(":")[0]] for label, count in reached.items()
+        },
+        tier_escalation_rate={
+            tier: escalated / sections
+            for tier, (escalated, sections) in tier_totals.items()
+            if sections
+        },
+        prompt_tokens=_mean(prompt),
+        output_tokens=_mean(output),
+        latency_sec=_mean(latency),
+    )
+
+
+def _escalation_probability(history: PlanHistory, section: str, tier: int) -> float:
+    label = f"{section}:tier{tier}"
+    if label in history.escalation_probability:
+        return history.escalation_probability[label]
+    # Reaching tier N means escalating out of every tier below it.
+    probability = 1.0
+    for lower in range(tier):
+        probability *= history.tier_escalation_rate.get(lower, DEFAULT_ESCALATION_PROBABILITY)
+    return probability
+
+
+def plan_document(
+    projected_prompt_tokens: dict[str, int],
+    history: PlanHistory,
+    model: str,
+    retry_model: str,
+    tiers: list[str] | None = None,
+    cpu_sec: float = 0.0,
+    latency_sec: float = 0.8,
+    latency_per_1k_tokens_sec: float = 0.06,
+    prices: dict[str, ModelPrice] | None = None,
+) -> dict[str, Any]:
+    """Expected calls, tokens, cost and latency for one dry-run document.
+
+    Primary labels are certain; `<section>:retry` labels are weighted by the historical
+    retry probability and `<section>:tier<N>` labels (cascade escalations to `tiers[N]`)
+    by the probability of reaching that tier. Latency comes from history for the model
+    when available, else from the fixed + per-1k-prompt-token model.
+    """
+    calls: list[dict[str, Any]] = []
+    for label, tokens in projected_prompt_tokens.items():
+        section, _, suffix = label.partition(":")
+        retry = suffix == "retry"
+        tier = int(suffix[4:]) if suffix.startswith("tier") else 0
+        if retry:
+            probability = history.retry_probability.get(section, DEFAULT_RETRY_PROBABILITY)
+            call_model = retry_model
+        elif tier and tiers:
+            probability = _escalation_probability(history, section, tier)
+            call_model = tiers[tier]
+        else:
+            probability = 1.0
+            call_model = model
+        prompt_tokens = round(history.prompt_tokens.get(label, tokens)) if suffix else tokens
+        output_tokens = round(history.output_tokens.get(label, DEFAULT_OUTPUT_TOKENS))
+        latency = history.latency_sec.get(
+            call_model, latency_sec + latency_per_1k_tokens_sec * prompt_tokens / 1000
+        )
+        cost = cost_usd(call_model, prompt_tokens, output_tokens, prices=prices)
+        calls.append(
+            {
+                "label": label,
+                "model": call_model,
+                "probability": round(probability, 3),
+                "prompt_tokens": prompt_tokens,
+                "output_tokens": output_tokens,
+                "latency_sec": round(latency, 3),
+                "cost_usd": round(cost * probability, 6) if cost is not None else None,
+            }
+        )
+    costs = [call["cost_usd"] for call in calls]
+    return {
+        "calls": calls,
+        "expected_calls": round(sum(call["probability"] for call in calls), 3),
+        "prompt_tokens": round(sum(c["prompt_tokens"] * c["probability"] for c in calls)),
+        "output_tokens": round(sum(c["output_tokens"] * c["probability"] for c in calls)),
+        "cost_usd": None if None in costs else round(sum(costs), 6),
+        "cpu_sec": round(cpu_sec, 3),
+    }
+
+
+def simulate_makespan(plans: list[dict[str, Any]], workers: int, rpm: int = 0) -> float:
+    """Wall time to run `plans` on `workers` threads under an `rpm` request quota.
+
+    Each document runs its CPU time, then its calls in order, as the pipeline does. Retry
+    calls are expected values: they take `probability` of their latency and of a quota
+    slot. The quota spaces request starts evenly (no burst), in order of readiness.
+    """
+    interval = 60.0 / rpm if rpm > 0 else 0.0
+    steps = [
+        [(plan.get("cpu_sec", 0.0), 0.0)]
+        + [
+            (call["latency_sec"] * call["probability"], call["probability"])
+            for call in plan["calls"]
+        ]
+        for plan in plans
+    ]
+    next_slot = 0.0
+    finished = 0.0
+    queue = list(range(len(steps)))
+    queue.reverse()
+    # (ready time, worker, document, step)
+    events: list[tuple[float, int, int, int]] = []
+    for worker in range(max(1, workers)):
+        if queue:
+            heapq.heappush(events, (0.0, worker, queue.pop(), 0))
+    while events:
+        ready, worker, doc, step = heapq.heappop(events)
+        if step == len(steps[doc]):
+            finished = max(finished, ready)
+            if queue:
+                heapq.heappush(events, (ready, worker, queue.pop(), 0))
+            continue
+        duration, requests = steps[doc][step]
+        start = ready
+        if requests and interval:
+            start = max(ready, next_slot)
+            next_slot = start + interval * requests
+        heapq.heappush(events, (start + duration, worker, doc, step + 1))
+    return finished
+
+
+def summarize_plan(
+    documents: Iterable[dict[str, Any] | None],
+    workers: list[int],
+    rpm: int = 0,
+    history_documents: int = 0,
+) -> dict[str, Any] | None:
+    """Run totals, per-label totals and the simulated makespan for each worker count."""
+    plans = [plan for plan in documents if plan]
+    if not plans:
+        return None
+    by_label: dict[str, dict[str, Any]] = {}
+    for plan in plans:
+        for call in plan["calls"]:
+            totals = by_label.setdefault(
+                call["label"], {"expected_calls": 0.0, "prompt_tokens": 0, "cost_usd": 0.0}
+            )
+            totals["expected_calls"] = round(totals["expected_calls"] + call["probability"], 3)
+            totals["prompt_tokens"] += round(call["prompt_tokens"] * call["probability"])
+            if totals["cost_usd"] is not None and call["cost_usd"] is not None:
+                totals["cost_usd"] = round(totals["cost_usd"] + call["cost_usd"], 6)
+            else:
+                totals["cost_usd"] = None
+    costs = [plan["cost_usd"] for plan in plans]
+    expected_calls = sum(plan["expected_calls"] for plan in plans)
+    makespan = []
+    for count in workers:
+        seconds = simulate_makespan(plans, count, rpm)
+        makespan.append(
+            {
+                "workers": count,
+                "rpm": rpm or None,
+                "makespan_sec": round(seconds, 3),
+                "mean_rpm": round(expected_calls / seconds * 60, 1) if seconds else None,
+            }
+        )
+    return {
+        "documents": len(plans),
+        "history_documents": history_documents,
+        "expected_calls": round(expected_calls, 3),
+        "prompt_tokens": sum(plan["prompt_tokens"] for plan in plans),
+        "output_tokens": sum(plan["output_tokens"] for plan in plans),
+        "cost_usd": None if None in costs else round(sum(costs), 6),
+        "cpu_sec": round(sum(plan["cpu_sec"] for plan in plans), 3),
+        "by_label": by_label,
+        "makespan": makespan,
+    }
+
+
+def parse_workers(value: str, default: int) -> list[int]:
+    counts = [int(part) for part in value.split(",") if part.strip()]
+    return counts or [default]
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """USD per 1M tokens. Cached prompt tokens are billed at `cached_input_per_1m`."""
+
+    input_per_1m: float
+    output_per_1m: float
+    cached_input_per_1m: float = 0.0
+
+
+# Published list prices (standard tier, prompts <= 200k tokens). Keys are model names
+# without the "models/" prefix; the longest matching prefix wins, so dated or "-latest"
+# variants resolve to their family.
+PRICES: dict[str, ModelPrice] = {
+    "gemini-2.5-pro": ModelPrice(1.25, 10.00, 0.31),
+    "gemini-2.5-flash-lite": ModelPrice(0.10, 0.40, 0.025),
+    "gemini-2.5-flash": ModelPrice(0.30, 2.50, 0.075),
+    "gemini-2.0-flash-lite": ModelPrice(0.075, 0.30, 0.0),
+    "gemini-2.0-flash": ModelPrice(0.10, 0.40, 0.025),
+    "gemini-flash-lite-latest": ModelPrice(0.10, 0.40, 0.025),
+    "gemini-flash-latest": ModelPrice(0.30, 2.50, 0.075),
+    "gemini-pro-latest": ModelPrice(1.25, 10.00, 0.31),
+    "gemini-embedding-001": ModelPrice(0.15, 0.0),
+    "text-embedding-004": ModelPrice(0.0, 0.0),
+}
+
+
+def _normalize(model: str) -> str:
+    return model.removeprefix("models/").strip().lower()
+
+
+def price_for(model: str, prices: dict[str, ModelPrice] | None = None) -> ModelPrice | None:
+    table = PRICES if prices is None else prices
+    name = _normalize(model)
+    matches = [key for key in table if name.startswith(_normalize(key))]
+    if not matches:
+        return None
+    return table[max(matches, key=len)]
+
+
+def parse_price_overrides(specs: list[str] | None) -> dict[str, ModelPrice]:
+    """Parse `model=input,output[,cached]` (USD per 1M tokens) into a pricing table."""
+    prices = dict(PRICES)
+    for spec in specs or []:
+        model, _, values = spec.partition("=")
+        numbers = [float(value) for value in values.split(",") if value.strip()]
+        if not model.strip() or len(numbers) not in (2, 3):
+            raise ValueError(
+                f"Invalid price override {spec!r}; expected model=input,output[,cached]"
+            )
+        prices[_normalize(model)] = ModelPrice(*numbers)
+    return prices
+
+
+def cost_usd(
+    model: str,
+    prompt_tokens: int,
+    output_tokens: int,
+    cached_tokens: int = 0,
+    prices: dict[str, ModelPrice] | None = None,
+) -> float | None:
+    """Cost of one call; None when the model has no known price."""
+    price = price_for(model, prices)
+    if price is None:
+        return None
+    # Gemini reports cached tokens as part of the prompt count.
+    uncached = max(0, prompt_tokens - cached_tokens)
+    return (
+        uncached * price.input_per_1m
+        + cached_tokens * price.cached_input_per_1m
+        + output_tokens * price.output_per_1m
+    ) / 1_000_000
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import contextvars
+import io
+import json
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+# cProfile, pstats and tracemalloc are imported where used: only profiled runs need them.
+if TYPE_CHECKING:
+    import cProfile
+
+
+@dataclass
+class StageProfile:
+    calls: int = 0
+    wall_sec: float = 0.0
+    alloc_kb: float = 0.0
+    peak_kb: float = 0.0
+    profiled: bool = True
+
+
+@dataclass
+class DocumentProfile:
+    name: str
+    stages: dict[str, StageProfile] = field(default_factory=dict)
+    profiles: list[cProfile.Profile] = field(default_factory=list)
+    memory: bool = True
+    prof_path: Path | None = None
+
+
+_CURRENT: contextvars.ContextVar[DocumentProfile | None] = contextvars.ContextVar(
+    "document_profile", default=None
+)
+
+
+def _sampled(name: str, rate: float) -> bool:
+    # Hash the document name so the same documents are sampled on every rerun.
+    if rate >= 1:
+        return True
+    return (zlib.crc32(name.encode("utf-8")) % 10_000) < rate * 10_000
+
+
+@contextmanager
+def profile_stage(name: str) -> Iterator[None]:
+    """Profile a pipeline stage when the current document is sampled; no-op otherwise."""
+    document = _CURRENT.get()
+    if document is None:
+        yield
+        return
+    import cProfile
+    import tracemalloc
+
+    stage = document.stages.setdefault(name, StageProfile())
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        profiled = True
+    except ValueError:
+        # Python 3.12+ allows one active cProfile at a time; overlapping stages from
+        # other workers still get wall time and memory.
+        profiled = False
+        stage.profiled = False
+    memory = document.memory and tracemalloc.is_tracing()
+    if memory:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage.wall_sec += time.perf_counter() - start
+        stage.calls += 1
+        if profiled:
+            profiler.disable()
+            document.profiles.append(profiler)
+        if memory:
+            # tracemalloc is process-wide, so with several workers these are upper bounds.
+            current, peak = tracemalloc.get_traced_memory()
+            stage.alloc_kb += (current - before) / 1024
+            stage.peak_kb = max(stage.peak_kb, (peak - before) / 1024)
+
+
+class RunProfiler:
+    """Samples documents, writes one .prof per document and a merged hotspot report."""
+
+    def __init__(
+        self, output_dir: Path, sample_rate: float = 1.0, top_n: int = 30, memory: bool = True
+    ) -> None:
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        self.top_n = top_n
+        self.memory = memory
+        self.documents: list[DocumentProfile] = []
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+        self._traced_documents = 0
+
+    def start(self) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    def _trace_memory(self, active: bool) -> None:
+        # Trace allocations only while a sampled document runs; tracemalloc is
+        # process-wide, so unsampled documents overlapping with one are traced too.
+        import tracemalloc
+
+        with self._lock:
+            if active:
+                if self._traced_documents == 0 and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._started_tracemalloc = True
+                self._traced_documents += 1
+                return
+            self._traced_documents -= 1
+            if self._traced_documents == 0 and self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    @contextmanager
+    def document(self, name: str, force: bool = False) -> Iterator[DocumentProfile | None]:
+        if not force and not _sampled(name, self.sample_rate):
+            yield None
+            return
+        profile = DocumentProfile(name=name, memory=self.memory)
+        if self.memory:
+            self._trace_memory(True)
+        token = _CURRENT.set(profile)
+        try:
+            yield profile
+        finally:
+            _CURRENT.reset(token)
+            if self.memory:
+                self._trace_memory(False)
+            self._write_document(profile)
+            with self._lock:
+                self.documents.append(profile)
+
+    def _prof_path(self, name: str) -> Path:
+        return self.output_dir / f"{Path(name).stem}.prof"
+
+    def _write_document(self, profile: DocumentProfile) -> None:
+        if not profile.profiles:
+            return
+        import pstats
+
+        stats = pstats.Stats(profile.profiles[0])
+        for extra in profile.profiles[1:]:
+            stats.add(extra)
+        profile.prof_path = self._prof_path(profile.name)
+        stats.dump_stats(str(profile.prof_path))
+        # Drop the raw profilers once dumped; long runs would otherwise keep them all.
+        profile.profiles = []
+
+    def finish(self) -> dict:
+        stages: dict[str, dict[str, float]] = {}
+        for document in self.documents:
+            for name, stage in document.stages.items():
+                total = stages.setdefault(
+                    name, {"calls": 0, "wall_sec": 0.0, "alloc_kb": 0.0, "peak_kb": 0.0}
+                )
+                total["calls"] += stage.calls
+                total["wall_sec"] += stage.wall_sec
+                total["alloc_kb"] += stage.alloc_kb
+                total["peak_kb"] = max(total["peak_kb"], stage.peak_kb)
+        summary = {
+            "documents": [document.name for document in self.documents],
+            "sample_rate": self.sample_rate,
+            "stages": {
+                name: {key: round(value, 3) for key, value in values.items()}
+                for name, values in sorted(
+                    stages.items(), key=lambda item: item[1]["wall_sec"], reverse=True
+                )
+            },
+            "documents_detail": {
+                document.name: {
+                    name: {
+                        "wall_sec": round(stage.wall_sec, 3),
+                        "alloc_kb": round(stage.alloc_kb, 1),
+                        "peak_kb": round(stage.peak_kb, 1),
+                        "profiled": stage.profiled,
+                    }
+                    for name, stage in document.stages.items()
+                }
+                for document in self.documents
+            },
+        }
+        (self.output_dir / "profile_summary.json").write_text(
+            json.dumps(summary, indent=2), encoding="utf-8"
+        )
+        self._write_hotspots(summary)
+        return summary
+
+    def _write_hotspots(self, summary: dict) -> None:
+        # Only this run's profiles: the output dir may still hold .prof files of earlier runs.
+        prof_files = [str(document.prof_path) for document in self.documents if document.prof_path]
+        lines = ["# Profile hotspots", "", "## Stages (wall time across sampled documents)"]
+        for name, values in summary["stages"].items():
+            lines.append(
+                f"{name:28} {values['wall_sec']:>9.3f}s  calls={int(values['calls'])}"
+                f"  alloc={values['alloc_kb']:.0f}KB  peak={values['peak_kb']:.0f}KB"
+            )
+        if prof_files:
+            import pstats
+
+            merged = pstats.Stats(*prof_files, stream=io.StringIO())
+            for sort_key in ("cumulative", "tottime"):
+                buffer = io.StringIO()
+                merged.stream = buffer  # type: ignore[attr-defined]
+                merged.sort_stats(sort_key).print_stats(self.top_n)
+                lines.extend(["", f"## Top {self.top_n} by {sort_key}", buffer.getvalue()])
+        (self.output_dir / "hotspots.txt").write_text("\n".join(lines), encoding="utf-8")
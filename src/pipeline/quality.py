@@ -62,6 +62,7 @@ def apply_quality_checks(
 ) -> tuple[ExtractionResult, dict[str, Any], list[str]]:
     active_sections = sections or {"metadata", "resources", "reserves", "economics"}
     warnings: list[str] = []
+    reserve_warnings: list[str] = []
 
     if "reserves" in active_sections:
         filtered_reserves, reserve_warnings = _filter_reserves(result.reserves)
@@ -72,6 +73,32 @@ def apply_quality_checks(
     resource_empty = sum(1 for row in result.resources if not _resource_row_has_values(row))
     reserve_empty = sum(1 for row in result.reserves if not _reserve_row_has_values(row))
     economics_has_values = _economics_has_values(result.economics)
+    metadata_filled = bool(result.metadata.project_name or result.metadata.company_name)
+
+    # Low-quality signals per section; the model cascade escalates on these.
+    issues: dict[str, list[str]] = {}
+    if "metadata" in active_sections and not metadata_filled:
+        issues["metadata"] = ["metadata_missing"]
+    for section, rows, empty_rows in (
+        ("resources", result.resources, resource_empty),
+        ("reserves", result.reserves, reserve_empty),
+    ):
+        if section not in active_sections:
+            continue
+        section_issues = []
+        if section == "reserves" and reserve_warnings:
+            section_issues.append("filtered_category")
+        if not rows:
+            section_issues.append("no_rows")
+        if empty_rows:
+            section_issues.append("empty_quantities")
+        if section_issues:
+            issues[section] = section_issues
+    if "economics" in active_sections:
+        if not economics_has_values:
+            issues["economics"] = ["no_values"]
+        elif not result.economics.currency:
+            issues["economics"] = ["missing_currency"]
 
     metrics = {
         "resources_count": len(result.resources),
@@ -79,7 +106,8 @@ def apply_quality_checks(
         "resource_empty_rows": resource_empty,
         "reserve_empty_rows": reserve_empty,
         "economics_has_values": economics_has_values,
-        "metadata_filled": bool(result.metadata.project_name or result.metadata.company_name),
+        "metadata_filled": metadata_filled,
+        "quality_issues": issues,
     }
 
     if "resources" in active_sections and resource_empty:
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import contextvars
+import logging
+import random
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, TypeVar
+
+from .metrics import CALL_ATTEMPTS, CALLS, CALLS_IN_FLIGHT
+from .observability import log_event
+from .tracing import span
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+_TRANSIENT_NAMES = ("Timeout", "ConnectError", "RemoteProtocolError", "ConnectionReset")
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 4
+    base_delay_sec: float = 1.0
+    max_delay_sec: float = 30.0
+    multiplier: float = 2.0
+    deadline_sec: float = 0.0  # whole call, including backoff; 0 disables
+    hedge_percentile: float = 0.0  # e.g. 0.95 launches a duplicate after p95 latency; 0 disables
+    hedge_min_samples: int = 20
+    # Callers that may be in a call at once (document workers); sizes the attempt pool.
+    concurrency: int = 1
+
+
+@dataclass
+class CallRecord:
+    name: str
+    attempts: int = 0
+    hedges: int = 0
+    errors: list[str] = field(default_factory=list)
+    wasted_sec: float = 0.0
+    duration_sec: float = 0.0
+    outcome: str = "ok"
+
+
+class LatencyTracker:
+    """Rolling window of successful attempt latencies for one call type."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float, min_samples: int) -> float | None:
+        with self._lock:
+            if len(self._samples) < max(1, min_samples):
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+_TRACKERS: dict[str, LatencyTracker] = {}
+_TRACKERS_LOCK = threading.Lock()
+_POOL: ThreadPoolExecutor | None = None
+_POOL_SIZE = 0
+_ABANDONED = 0
+_POOL_LOCK = threading.Lock()
+_RECORDER: contextvars.ContextVar[list[CallRecord] | None] = contextvars.ContextVar(
+    "call_recorder", default=None
+)
+_RNG = random.Random()
+
+
+def _tracker(name: str) -> LatencyTracker:
+    with _TRACKERS_LOCK:
+        return _TRACKERS.setdefault(name, LatencyTracker())
+
+
+def _submit(fn: Callable[[], T], policy: RetryPolicy) -> Future[T]:
+    """Submit one attempt to the shared pool, grown so no attempt waits against its deadline.
+
+    Room is kept for every caller plus its hedge, and for attempts abandoned at a deadline
+    or lost to a hedge, which keep a thread until the provider call returns. Growing shuts
+    the previous pool down, so the pool is picked and submitted to under one lock.
+    """
+    global _POOL, _POOL_SIZE
+    per_caller = 2 if policy.hedge_percentile else 1
+    wanted = max(1, policy.concurrency) * per_caller
+    # Each attempt runs in its own copy of the caller's context (logging/tracing state).
+    context = contextvars.copy_context()
+    with _POOL_LOCK:
+        wanted += _ABANDONED
+        if _POOL is None or _POOL_SIZE < wanted:
+            previous = _POOL
+            _POOL = ThreadPoolExecutor(max_workers=wanted, thread_name_prefix="call-attempt")
+            _POOL_SIZE = wanted
+            if previous is not None:
+                # Running attempts finish on the old threads; new ones go to the new pool.
+                previous.shutdown(wait=False)
+        return _POOL.submit(context.run, fn)
+
+
+def _release_abandoned(_: Future) -> None:
+    global _ABANDONED
+    with _POOL_LOCK:
+        _ABANDONED -= 1
+
+
+def _abandon(futures: set[Future[T]]) -> None:
+    global _ABANDONED
+    with _POOL_LOCK:
+        _ABANDONED += len(futures)
+    for future in futures:
+        future.add_done_callback(_release_abandoned)
+
+
+def _status_code(exc: BaseException) -> int | None:
+    for candidate in (exc, getattr(exc, "response", None)):
+        for attr in ("code", "status_code"):
+            value = getattr(candidate, attr, None)
+            if isinstance(value, int) and 100 <= value < 600:
+                return value
+    return None
+
+
+def classify_error(exc: BaseException) -> str:
+    """Return rate_limited | transient | deadline | fatal."""
+    if isinstance(exc, DeadlineExceeded):
+        return "deadline"
+    code = _status_code(exc)
+    if code == 429:
+        return "rate_limited"
+    if code in RETRYABLE_STATUS:
+        return "transient"
+    if code is not None:
+        return "fatal"
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return "transient"
+    if any(name in type(exc).__name__ for name in _TRANSIENT_NAMES):
+        return "transient"
+    return "fatal"
+
+
+def backoff_delay(attempt: int, kind: str, policy: RetryPolicy, rng: random.Random = _RNG) -> float:
+    cap = policy.base_delay_sec * policy.multiplier ** max(0, attempt - 1)
+    if kind == "rate_limited":
+        # Quotas refill on the provider's clock; back off harder than for server errors.
+        cap *= 2
+    # Full jitter spreads retries from concurrent workers instead of synchronising them.
+    return rng.uniform(0, min(policy.max_delay_sec, cap))
+
+
+def _attempt(
+    fn: Callable[[], T],
+    policy: RetryPolicy,
+    tracker: LatencyTracker,
+    record: CallRecord,
+    deadline: float | None,
+) -> T:
+    hedge_after = (
+        tracker.percentile(policy.hedge_percentile, policy.hedge_min_samples)
+        if policy.hedge_percentile
+        else None
+    )
+    if deadline is None and hedge_after is None:
+        start = time.monotonic()
+        result = fn()
+        tracker.add(time.monotonic() - start)
+        return result
+
+    started: dict[Future[T], float] = {_submit(fn, policy): time.monotonic()}
+    if hedge_after is not None and (deadline is None or time.monotonic() + hedge_after < deadline):
+        done, _ = wait(started, timeout=hedge_after)
+        if not done:
+            record.hedges += 1
+            started[_submit(fn, policy)] = time.monotonic()
+
+    pending = set(started)
+    error: BaseException | None = None
+    while pending:
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            exc = future.exception()
+            if exc is None:
+                now = time.monotonic()
+                tracker.add(now - started[future])
+                # Losing duplicates keep running in the pool; count their time as waste.
+                record.wasted_sec += sum(now - started[other] for other in pending)
+                _abandon(pending)
+                return future.result()
+            error = exc
+    if pending:
+        now = time.monotonic()
+        record.wasted_sec += sum(now - started[other] for other in pending)
+        _abandon(pending)
+        raise DeadlineExceeded(f"{record.name} exceeded its {policy.deadline_sec}s deadline")
+    assert error is not None
+    raise error
+
+
+def call_with_retries(
+    fn: Callable[[], T],
+    policy: RetryPolicy,
+    name: str,
+    sleep: Callable[[float], None] = time.sleep,
+) -> T:
+    """Run `fn` with classified retries, jittered backoff, a deadline and optional hedging."""
+    record = CallRecord(name=name)
+    tracker = _tracker(name)
+    start = time.monotonic()
+    deadline = start + policy.deadline_sec if policy.deadline_sec > 0 else None
+    logger = logging.getLogger("pipeline")
+    call_kind = name.split(":", 1)[0]
+    CALLS_IN_FLIGHT.inc(kind=call_kind)
+    with span(f"call:{name}") as call_span:
+        try:
+            while True:
+                record.attempts += 1
+                attempt_start = time.monotonic()
+                try:
+                    return _attempt(fn, policy, tracker, record, deadline)
+                except Exception as exc:
+                    kind = classify_error(exc)
+                    record.errors.append(kind)
+                    record.wasted_sec += time.monotonic() - attempt_start
+                    if kind in ("fatal", "deadline") or record.attempts >= policy.max_attempts:
+                        record.outcome = kind if kind in ("fatal", "deadline") else "exhausted"
+                        raise
+                    delay = backoff_delay(record.attempts, kind, policy)
+                    if deadline is not None and time.monotonic() + delay >= deadline:
+                        record.outcome = "deadline"
+                        raise DeadlineExceeded(
+                            f"{name} exceeded its {policy.deadline_sec}s deadline"
+                        ) from exc
+                    log_event(
+                        logger,
+                        "call_retry",
+                        call=name,
+                        attempt=record.attempts,
+                        error=kind,
+                        delay_sec=round(delay, 3),
+                        detail=str(exc)[:200],
+                    )
+                    sleep(delay)
+                    record.wasted_sec += delay
+        finally:
+            record.duration_sec = time.monotonic() - start
+            CALLS_IN_FLIGHT.dec(kind=call_kind)
+            CALLS.inc(kind=call_kind, outcome=record.outcome)
+            CALL_ATTEMPTS.inc(record.attempts, kind=call_kind)
+            if call_span is not None:
+                call_span.attributes.update(
+                    attempts=record.attempts,
+                    hedges=record.hedges,
+                    outcome=record.outcome,
+                    wasted_sec=round(record.wasted_sec, 3),
+                )
+            calls = _RECORDER.get()
+            if calls is not None:
+                calls.append(record)
+
+
+@contextmanager
+def collect_calls() -> Iterator[list[CallRecord]]:
+    """Collect the CallRecords of every resilient call made in this context."""
+    calls: list[CallRecord] = []
+    token = _RECORDER.set(calls)
+    try:
+        yield calls
+    finally:
+        _RECORDER.reset(token)
+
+
+def summarize_calls(calls: list[CallRecord]) -> dict:
+    errors: Counter[str] = Counter(kind for call in calls for kind in call.errors)
+    return {
+        "calls": len(calls),
+        "attempts": sum(call.attempts for call in calls),
+        "retries": sum(max(0, call.attempts - 1) for call in calls),
+        "hedges": sum(call.hedges for call in calls),
+        "failed": sum(1 for call in calls if call.outcome != "ok"),
+        "errors": dict(errors),
+        "wasted_sec": round(sum(call.wasted_sec for call in calls), 3),
+    }
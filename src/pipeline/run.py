@@ -6,27 +6,70 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 from .config import Settings
-from .observability import configure_logging
-from .pipeline import run_pipeline
+from .observability import configure_logging, parse_sample_rates
 
 
 def main() -> None:
     load_dotenv()
 
     parser = argparse.ArgumentParser(description="Extract NI 43-101 data into structured outputs")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        default="run",
+        choices=["run", "prepare", "extract"],
+        help="run: full pipeline; prepare: write work packages (CPU stages only); "
+        "extract: LLM stages from work packages",
+    )
     parser.add_argument("--data-dir", default="data", help="Directory with PDFs")
     parser.add_argument("--output-dir", default="output", help="Output directory for JSON/CSV")
     parser.add_argument("--sqlite-path", default="output/extractions.db", help="SQLite DB path")
+    parser.add_argument(
+        "--packages-dir",
+        default="output/packages",
+        help="Work package directory written by prepare and read by extract",
+    )
     parser.add_argument("--limit", type=int, default=None, help="Limit number of PDFs")
     parser.add_argument("--mode", default=None, choices=["full", "smart"], help="Extraction mode")
-    parser.add_argument("--provider", default=None, choices=["gemini", "mock"], help="LLM provider")
+    parser.add_argument(
+        "--provider", default=None, choices=["gemini", "mock", "simulated"], help="LLM provider"
+    )
     parser.add_argument(
         "--no-embeddings", action="store_true", help="Disable embedding-based ranking"
     )
+    parser.add_argument(
+        "--embedding-provider",
+        default=None,
+        choices=["gemini", "local"],
+        help="Embedding backend for page ranking",
+    )
     parser.add_argument("--no-retries", action="store_true", help="Disable fallback retries")
+    parser.add_argument(
+        "--cascade-models",
+        default=None,
+        help="Comma-separated models, cheapest first; sections escalate on quality issues",
+    )
     parser.add_argument(
         "--dry-run", action="store_true", help="Skip LLM calls and only score/select pages"
     )
+    parser.add_argument(
+        "--plan-workers",
+        default=None,
+        help="With --dry-run: worker counts to simulate for the capacity plan, e.g. 8,16,32",
+    )
+    parser.add_argument(
+        "--plan-rpm", type=int, default=None, help="With --dry-run: request quota (RPM) to plan for"
+    )
+    parser.add_argument(
+        "--plan-history",
+        default=None,
+        help="With --dry-run: comma-separated past manifests for retry rates and latency",
+    )
+    parser.add_argument(
+        "--parquet",
+        action="store_true",
+        help="Also write typed Parquet datasets partitioned by ingest date and run id",
+    )
     parser.add_argument(
         "--only-resources", action="store_true", help="Extract only resources section"
     )
@@ -36,7 +79,50 @@ def main() -> None:
     parser.add_argument(
         "--workers", type=int, default=None, help="Parallel workers for PDF processing"
     )
+    parser.add_argument(
+        "--profile", action="store_true", help="Profile sampled documents per stage"
+    )
+    parser.add_argument(
+        "--profile-sample-rate",
+        type=float,
+        default=None,
+        help="Fraction of documents to profile (default 0.1)",
+    )
+    parser.add_argument(
+        "--trace", action="store_true", help="Write run/document/stage/call spans as OTLP JSON"
+    )
+    parser.add_argument(
+        "--metrics-port", type=int, default=None, help="Serve Prometheus metrics on this port"
+    )
+    parser.add_argument(
+        "--metrics-textfile", default=None, help="Write Prometheus metrics to this .prom file"
+    )
+    parser.add_argument(
+        "--budget-usd",
+        type=float,
+        default=None,
+        help="Hard LLM spend cap for the run; degrades first, then stops scheduling PDFs",
+    )
+    parser.add_argument(
+        "--budget-wall-sec", type=float, default=None, help="Hard wall-time cap for the run"
+    )
+    parser.add_argument(
+        "--budget-fallback-model",
+        default=None,
+        help="Cheaper model to switch to when the run is over its soft budget",
+    )
+    parser.add_argument(
+        "--resume",
+        default=None,
+        metavar="RUN_ID",
+        help="Resume a run from output/runs/<RUN_ID>/checkpoints, skipping finished PDFs",
+    )
     parser.add_argument("--log-level", default=None, help="Logging level (e.g., INFO, DEBUG)")
+    parser.add_argument(
+        "--log-sample-rates",
+        default=None,
+        help="Keep a fraction of high-volume events, e.g. pages_selected=0.1,tables_extracted=0.5",
+    )
     parser.add_argument("--log-dir", default=None, help="Directory for log files")
 
     args = parser.parse_args()
@@ -51,14 +137,44 @@ def main() -> None:
         settings.llm_provider = args.provider
     if args.no_embeddings:
         settings.embeddings_enabled = False
+    if args.embedding_provider:
+        settings.embedding_provider = args.embedding_provider
     if args.no_retries:
         settings.retries_enabled = False
+    if args.cascade_models is not None:
+        settings.cascade_models = args.cascade_models
     if args.dry_run:
         settings.dry_run = True
+    if args.plan_workers:
+        settings.plan_workers = args.plan_workers
+    if args.plan_rpm is not None:
+        settings.plan_rpm = args.plan_rpm
+    if args.plan_history:
+        settings.plan_history = args.plan_history
+    if args.parquet:
+        settings.parquet_enabled = True
     if args.workers is not None:
         settings.max_workers = args.workers
+    if args.profile:
+        settings.profile_enabled = True
+    if args.profile_sample_rate is not None:
+        settings.profile_sample_rate = args.profile_sample_rate
+    if args.trace:
+        settings.tracing_enabled = True
+    if args.metrics_port is not None:
+        settings.metrics_port = args.metrics_port
+    if args.metrics_textfile:
+        settings.metrics_textfile = args.metrics_textfile
+    if args.budget_usd is not None:
+        settings.budget_usd = args.budget_usd
+    if args.budget_wall_sec is not None:
+        settings.budget_wall_sec = args.budget_wall_sec
+    if args.budget_fallback_model:
+        settings.budget_fallback_model = args.budget_fallback_model
     if args.log_level:
         settings.log_level = args.log_level
+    if args.log_sample_rates is not None:
+        settings.log_sample_rates = args.log_sample_rates
     if args.log_dir:
         settings.log_dir = args.log_dir
 
@@ -73,13 +189,28 @@ def main() -> None:
     configure_logging(
         Path(settings.log_dir) if settings.log_dir else Path(settings.output_dir) / "logs",
         settings.log_level,
+        parse_sample_rates(settings.log_sample_rates),
     )
+    # Imported after argument parsing so --help and argument errors return immediately.
+    from .pipeline import prepare_packages, run_pipeline
+
+    if args.command == "prepare":
+        prepare_packages(
+            data_dir=Path(args.data_dir),
+            packages_dir=Path(args.packages_dir),
+            sqlite_path=Path(args.sqlite_path),
+            settings=settings,
+            limit=args.limit,
+        )
+        return
     run_pipeline(
         data_dir=Path(args.data_dir),
         output_dir=Path(args.output_dir),
         sqlite_path=Path(args.sqlite_path),
         settings=settings,
         limit=args.limit,
+        resume_run_id=args.resume,
+        packages_dir=Path(args.packages_dir) if args.command == "extract" else None,
     )
 
 
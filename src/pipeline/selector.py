@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Sequence
+from typing import Iterable, Sequence
 
+from .bm25 import Bm25Index, tokenize
+from .config import DEFAULT_BM25_WEIGHT
 from .embeddings import EmbeddingSettings, EmbeddingStore, cosine_similarity
 from .utils import is_toc_page, normalize_whitespace
 
@@ -53,28 +55,78 @@ def _truncate(text: str, max_chars: int) -> str:
     return text[:max_chars]
 
 
+@dataclass
+class PageSignals:
+    """Section-independent features of one page, computed once for every section."""
+
+    toc: bool
+    table_hit: bool
+    table_number_hit: bool
+    numeric_density: float
+    keyword_hits: dict[tuple[str, ...], int]
+
+
+def _section_keywords(config: SectionConfig) -> tuple[str, ...]:
+    return tuple(config.keywords + config.table_keywords)
+
+
+def page_signals(text: str, configs: Iterable[SectionConfig] = ()) -> PageSignals:
+    """Features `rank_pages` needs from a page; keyword hits only for `configs`."""
+    return PageSignals(
+        toc=is_toc_page(text),
+        table_hit=_has_table_signal(text),
+        table_number_hit=_table_number_hit(text),
+        numeric_density=_numeric_density(text),
+        keyword_hits={
+            _section_keywords(config): _keyword_hits(text, config.keywords + config.table_keywords)
+            for config in configs
+        },
+    )
+
+
+def section_terms(config: SectionConfig) -> list[str]:
+    terms = tokenize(config.query)
+    for keyword in config.keywords + config.table_keywords:
+        terms.extend(tokenize(keyword))
+    return terms
+
+
 def rank_pages(
     page_texts: Sequence[str],
     config: SectionConfig,
     embed_store: EmbeddingStore,
     embed_settings: EmbeddingSettings,
+    index: Bm25Index | None = None,
+    bm25_weight: float = DEFAULT_BM25_WEIGHT,
+    signals: Sequence[PageSignals] | None = None,
 ) -> list[tuple[int, float]]:
-    toc_pages = {idx for idx, text in enumerate(page_texts) if is_toc_page(text)}
+    """Score pages for a section; with `index`, BM25 scaled by `bm25_weight` replaces raw
+    keyword hits. `signals` from an earlier scan spare a pass over `page_texts`; without
+    `index` they must carry this section's keyword hits."""
+    if signals is None:
+        configs = [config] if index is None else []
+        signals = [page_signals(text, configs) for text in page_texts]
+    keywords = _section_keywords(config)
     base_scores: list[tuple[int, float]] = []
+    bm25_scores = index.score(section_terms(config)) if index is not None else {}
+    bm25_top = max(bm25_scores.values(), default=0.0)
 
-    for idx, text in enumerate(page_texts):
-        if idx in toc_pages:
+    for idx, page in enumerate(signals):
+        if page.toc:
             continue
-        hits = _keyword_hits(text, config.keywords + config.table_keywords)
-        table_hit = _has_table_signal(text)
-        table_number_hit = _table_number_hit(text)
-        numeric_density = _numeric_density(text)
+        if index is not None:
+            # BM25 weighs rare terms up, so words like "project" or "grade" that appear
+            # on every page stop dominating the keyword signal.
+            keyword_score = bm25_scores.get(idx, 0.0) / bm25_top if bm25_top else 0.0
+            keyword_score *= bm25_weight
+        else:
+            keyword_score = page.keyword_hits[keywords] * config.keyword_weight
         # Blend textual signals (keywords/tables) with numeric density for ranking.
         score = (
-            hits * config.keyword_weight
-            + (config.table_weight if table_hit else 0.0)
-            + (config.table_weight * 0.5 if table_number_hit else 0.0)
-            + numeric_density * config.numeric_weight
+            keyword_score
+            + (config.table_weight if page.table_hit else 0.0)
+            + (config.table_weight * 0.5 if page.table_number_hit else 0.0)
+            + page.numeric_density * config.numeric_weight
         )
         base_scores.append((idx, score))
 
@@ -98,11 +150,14 @@ def rank_pages(
     sim_scores: dict[int, float] = {}
     if embed_settings.enabled:
         # Embeddings are optional; when disabled we rely only on heuristics above.
-        query_embedding = embed_store.embed_text(config.query)
+        # Embed query and candidates as one batch so local vectors share IDF weights.
+        texts = [config.query] + [
+            _truncate(page_texts[idx], embed_settings.max_chars) for idx in candidates
+        ]
+        embeddings = embed_store.embed_texts(texts)
+        query_embedding = embeddings[0]
         if query_embedding:
-            for idx in candidates:
-                text = _truncate(page_texts[idx], embed_settings.max_chars)
-                page_embedding = embed_store.embed_text(text)
+            for idx, page_embedding in zip(candidates, embeddings[1:]):
                 sim_scores[idx] = cosine_similarity(page_embedding, query_embedding)
 
     ranked: list[tuple[int, float]] = []
@@ -115,27 +170,57 @@ def rank_pages(
     return ranked
 
 
-def select_pages(
+def select_scored_pages(
     page_texts: Sequence[str],
     config: SectionConfig,
     embed_store: EmbeddingStore,
     embed_settings: EmbeddingSettings,
-) -> list[int]:
-    toc_pages = {idx for idx, text in enumerate(page_texts) if is_toc_page(text)}
-    ranked = rank_pages(page_texts, config, embed_store, embed_settings)
+    index: Bm25Index | None = None,
+    bm25_weight: float = DEFAULT_BM25_WEIGHT,
+    signals: Sequence[PageSignals] | None = None,
+) -> list[tuple[int, float]]:
+    ranked = rank_pages(
+        page_texts,
+        config,
+        embed_store,
+        embed_settings,
+        index=index,
+        bm25_weight=bm25_weight,
+        signals=signals,
+    )
+    rank_scores = dict(ranked)
     selected = [idx for idx, score in ranked[: config.top_k] if score > 0]
 
     if not selected:
         selected = [idx for idx, _ in ranked[: config.top_k]]
 
-    expanded: set[int] = set()
+    # Window pages keep their own rank score so budgeting can drop them first.
+    # TOC pages are never ranked, so they fall out here as well.
+    expanded: dict[int, float] = {}
     for idx in selected:
         start = max(0, idx - config.window)
         end = min(len(page_texts), idx + config.window + 1)
-        expanded.update(range(start, end))
+        for neighbor in range(start, end):
+            if neighbor in rank_scores:
+                expanded[neighbor] = rank_scores[neighbor]
+
+    return sorted(expanded.items())
 
-    expanded.difference_update(toc_pages)
-    return sorted(expanded)
+
+def select_pages(
+    page_texts: Sequence[str],
+    config: SectionConfig,
+    embed_store: EmbeddingStore,
+    embed_settings: EmbeddingSettings,
+    index: Bm25Index | None = None,
+    bm25_weight: float = DEFAULT_BM25_WEIGHT,
+) -> list[int]:
+    return [
+        idx
+        for idx, _ in select_scored_pages(
+            page_texts, config, embed_store, embed_settings, index=index, bm25_weight=bm25_weight
+        )
+    ]
 
 
 def build_context(page_texts: Sequence[str], page_indices: Sequence[int]) -> str:
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import csv
+import os
+import shutil
 import sqlite3
+from datetime import date
 from pathlib import Path
-from typing import Iterable, Mapping, Sequence
+from typing import Any, Iterable, Mapping, Sequence
 
 from .models import ExtractionResult
 
@@ -49,11 +52,11 @@ def _write_csv(path: Path, rows: Sequence[Mapping[str, object]]) -> None:
         writer.writerows(rows)
 
 
-def save_csvs(results: Iterable[ExtractionResult], output_dir: Path) -> None:
-    metadata_rows = []
-    resource_rows = []
-    reserve_rows = []
-    economics_rows = []
+def _output_rows(results: Iterable[ExtractionResult]) -> dict[str, list[dict[str, Any]]]:
+    metadata_rows: list[dict[str, Any]] = []
+    resource_rows: list[dict[str, Any]] = []
+    reserve_rows: list[dict[str, Any]] = []
+    economics_rows: list[dict[str, Any]] = []
 
     for result in results:
         meta = result.metadata
@@ -118,19 +121,130 @@ def save_csvs(results: Iterable[ExtractionResult], output_dir: Path) -> None:
             }
         )
 
-    _write_csv(output_dir / "metadata.csv", metadata_rows)
-    _write_csv(output_dir / "resources.csv", resource_rows)
-    _write_csv(output_dir / "reserves.csv", reserve_rows)
-    _write_csv(output_dir / "economics.csv", economics_rows)
+    return {
+        "metadata": metadata_rows,
+        "resources": resource_rows,
+        "reserves": reserve_rows,
+        "economics": economics_rows,
+    }
+
+
+def save_csvs(results: Iterable[ExtractionResult], output_dir: Path) -> None:
+    for table, rows in _output_rows(results).items():
+        _write_csv(output_dir / f"{table}.csv", rows)
+
+
+_QUANTITY_COLUMNS = ("tonnes", "grade", "contained")
+_ECONOMICS_COLUMNS = ("capex", "opex", "npv", "irr")
+
+
+def _parquet_schemas(pa: Any) -> dict[str, Any]:
+    def quantities(names: Sequence[str]) -> list:
+        fields = []
+        for name in names:
+            fields += [
+                pa.field(f"{name}_value", pa.float64()),
+                pa.field(f"{name}_unit", pa.string()),
+            ]
+        return fields
+
+    category = [
+        pa.field("source_pdf", pa.string()),
+        pa.field("category", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("metal", pa.dictionary(pa.int32(), pa.string())),
+        *quantities(_QUANTITY_COLUMNS),
+        pa.field("source_pages", pa.string()),
+    ]
+    return {
+        "metadata": pa.schema(
+            [
+                pa.field("source_pdf", pa.string()),
+                pa.field("project_name", pa.string()),
+                pa.field("company_name", pa.string()),
+                pa.field("location_country", pa.string()),
+                pa.field("location_region", pa.string()),
+                pa.field("report_date", pa.date32()),
+                pa.field("report_date_raw", pa.string()),
+            ]
+        ),
+        "resources": pa.schema(category),
+        "reserves": pa.schema(category),
+        "economics": pa.schema(
+            [
+                pa.field("source_pdf", pa.string()),
+                *quantities(_ECONOMICS_COLUMNS),
+                pa.field("currency", pa.string()),
+                pa.field("source_pages", pa.string()),
+            ]
+        ),
+    }
+
+
+def _iso_date(value: object) -> date | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        return date.fromisoformat(value.strip()[:10])
+    except ValueError:
+        return None
+
+
+def save_parquet(
+    results: Iterable[ExtractionResult],
+    dataset_dir: Path,
+    run_id: str,
+    ingest_date: date,
+    row_group_size: int = 50_000,
+) -> dict[str, Path]:
+    """Write each table as a hive-partitioned Parquet dataset.
+
+    Every run owns `<table>/ingest_date=<date>/run_id=<run_id>/`, so incremental runs add
+    partitions and only a rerun of the same run_id replaces its own files. A run resumed on
+    a later day moves to the new date: its partitions under other dates are removed.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError(
+            "pyarrow is required for Parquet output. Install with: pip install pyarrow"
+        ) from exc
+
+    schemas = _parquet_schemas(pa)
+    written: dict[str, Path] = {}
+    for table, rows in _output_rows(results).items():
+        current = dataset_dir / table / f"ingest_date={ingest_date.isoformat()}"
+        for stale in (dataset_dir / table).glob(f"ingest_date=*/run_id={run_id}"):
+            if stale.parent != current or not rows:
+                shutil.rmtree(stale)
+                if not any(stale.parent.iterdir()):
+                    stale.parent.rmdir()
+        if not rows:
+            continue
+        if table == "metadata":
+            rows = [{**row, "report_date": _iso_date(row["report_date"])} for row in rows]
+        partition = current / f"run_id={run_id}"
+        partition.mkdir(parents=True, exist_ok=True)
+        path = partition / "part-0.parquet"
+        tmp_path = partition / ".part-0.parquet.tmp"
+        schema = schemas[table]
+        with pq.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+            for start in range(0, len(rows), row_group_size):
+                batch = pa.Table.from_pylist(rows[start : start + row_group_size], schema=schema)
+                writer.write_table(batch, row_group_size=row_group_size)
+        os.replace(tmp_path, path)
+        written[table] = path
+    return written
 
 
 def save_sqlite(results: Iterable[ExtractionResult], sqlite_path: Path, reset: bool = True) -> None:
     sqlite_path.parent.mkdir(parents=True, exist_ok=True)
-    if reset and sqlite_path.exists():
-        sqlite_path.unlink()
-
     conn = sqlite3.connect(sqlite_path)
     cur = conn.cursor()
+    if reset:
+        # Drop only the extraction tables; the page index in the same file is incremental.
+        for table in ("documents", "resources", "reserves", "economics"):
+            cur.execute(f"DROP TABLE IF EXISTS {table}")
 
     cur.execute(
         """
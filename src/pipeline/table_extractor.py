@@ -3,15 +3,17 @@ from __future__ import annotations
 import hashlib
 from pathlib import Path
 
+from .utils import optional_module
+
 
 def _tables_from_camelot(pdf_path: Path, pages: list[int]) -> list[dict[str, str]]:
     tables: list[dict[str, str]] = []
     if not pages:
         return tables
     pages_str = ",".join(str(p) for p in pages)
-    try:
-        import camelot
-    except Exception:
+    # Camelot pulls in OpenCV and pandas; load it only once a table stage needs it.
+    camelot = optional_module("camelot")
+    if camelot is None:
         return tables
 
     for flavor in ("lattice", "stream"):
@@ -40,9 +42,8 @@ def _tables_from_pdfplumber(pdf_path: Path, page_indices: list[int]) -> list[dic
     tables: list[dict[str, str]] = []
     if not page_indices:
         return tables
-    try:
-        import pdfplumber
-    except Exception:
+    pdfplumber = optional_module("pdfplumber")
+    if pdfplumber is None:
         return tables
 
     try:
@@ -179,6 +180,26 @@ def extract_tables_for_pages(pdf_path: Path, page_indices: list[int]) -> list[di
     return tables
 
 
+def format_table(
+    table: dict[str, str], max_rows: int = 40, max_chars: int = 20000
+) -> tuple[str, str] | None:
+    page = table.get("page")
+    method = table.get("method")
+    text = table.get("text")
+    if not text:
+        return None
+    rows = text.splitlines()
+    if max_rows and len(rows) > max_rows:
+        rows = rows[:max_rows]
+        text = "\n".join(rows)
+    if max_chars and len(text) > max_chars:
+        text = text[:max_chars]
+    label = f"Page {page}" if page else "Page"
+    if method:
+        label = f"{label} ({method})"
+    return label, text
+
+
 def build_table_context(
     tables: list[dict[str, str]], max_rows: int = 40, max_chars: int = 20000
 ) -> str:
@@ -186,19 +207,9 @@ def build_table_context(
         return ""
     chunks: list[str] = []
     for table in tables:
-        page = table.get("page")
-        method = table.get("method")
-        text = table.get("text")
-        if not text:
+        formatted = format_table(table, max_rows=max_rows, max_chars=max_chars)
+        if not formatted:
             continue
-        rows = text.splitlines()
-        if max_rows and len(rows) > max_rows:
-            rows = rows[:max_rows]
-            text = "\n".join(rows)
-        if max_chars and len(text) > max_chars:
-            text = text[:max_chars]
-        label = f"Page {page}" if page else "Page"
-        if method:
-            label = f"{label} ({method})"
+        label, text = formatted
         chunks.append(f"{label}:\n{text}")
     return "\n\n".join(chunks)
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import csv
+import io
+import re
+from dataclasses import dataclass, field
+from typing import Union
+
+from .models import MineralReserve, MineralResource, Quantity
+
+StatementRow = Union[MineralResource, MineralReserve]
+
+RESOURCE_CATEGORIES = [
+    (
+        re.compile(r"measured\s*(?:and|&|\+)\s*indicated|\bm\s*[&+]\s*i\b", re.I),
+        "Measured + Indicated",
+    ),
+    (re.compile(r"\bmeasured\b", re.I), "Measured"),
+    (re.compile(r"\bindicated\b", re.I), "Indicated"),
+    (re.compile(r"\binferred\b", re.I), "Inferred"),
+]
+
+RESERVE_CATEGORIES = [
+    (
+        re.compile(r"prov(?:en|ed)\s*(?:and|&|\+)\s*probable|\bp\s*[&+]\s*p\b", re.I),
+        "Proven + Probable",
+    ),
+    (re.compile(r"\bprov(?:en|ed)\b", re.I), "Proven"),
+    (re.compile(r"\bprobable\b", re.I), "Probable"),
+]
+
+METALS = {
+    "aueq": "AuEq",
+    "au": "Au",
+    "gold": "Au",
+    "ag": "Ag",
+    "silver": "Ag",
+    "cu": "Cu",
+    "copper": "Cu",
+    "zn": "Zn",
+    "zinc": "Zn",
+    "pb": "Pb",
+    "lead": "Pb",
+    "mo": "Mo",
+    "ni": "Ni",
+}
+_METAL_PATTERN = re.compile(r"\b(" + "|".join(METALS) + r")\b", re.I)
+_UNIT_PATTERN = re.compile(
+    r"g/t|oz/t|%|\bppm\b|\b[km]?oz\b|\b[km]?lbs?\b|\b[km]t\b|\btonnes\b|\bt\b", re.I
+)
+_NUMBER_CLEANUP = re.compile(r"[,\s\u00a0\u202f]")
+_NUMBER = re.compile(r"^-?\d+(?:\.\d+)?$")
+# Parameter columns that look like grades or quantities but are not statement values.
+_PARAMETER_COLUMN = re.compile(
+    r"cut[\s-]*off|\bcog\b|\bnsr\b|recover|strip\s*ratio|\bprice\b", re.I
+)
+_MAX_CATEGORY_CELL = 40
+_MAX_HEADER_ROWS = 4
+
+
+@dataclass
+class TableParse:
+    rows: list[StatementRow] = field(default_factory=list)
+    confidence: float = 0.0
+    page: str | None = None
+    tables_considered: int = 0
+
+
+def _read_rows(text: str) -> list[list[str]]:
+    delimiter = "\t" if "\t" in text else ","
+    rows = [
+        [cell.strip() for cell in row] for row in csv.reader(io.StringIO(text), delimiter=delimiter)
+    ]
+    # Camelot CSVs start with the DataFrame's integer column labels.
+    if rows and all(cell == str(idx) for idx, cell in enumerate(rows[0])):
+        rows = rows[1:]
+    return [row for row in rows if any(row)]
+
+
+def _match_category(row: list[str], section: str) -> str | None:
+    patterns = RESOURCE_CATEGORIES if section == "resources" else RESERVE_CATEGORIES
+    for cell in row[:3]:
+        if not cell or len(cell) > _MAX_CATEGORY_CELL:
+            continue
+        for pattern, category in patterns:
+            if pattern.search(cell):
+                return category
+    return None
+
+
+def _column_role(header: str) -> str | None:
+    lower = header.lower()
+    if not lower or _PARAMETER_COLUMN.search(lower):
+        return None
+    if "contained" in lower or (
+        re.search(r"\b[km]?oz\b|\b[km]?lbs?\b", lower) and "/t" not in lower
+    ):
+        return "contained"
+    if "grade" in lower or re.search(r"g/t|oz/t|%|\bppm\b", lower):
+        return "grade"
+    if re.search(r"tonnes|tonnage|\btons?\b|\b[km]t\b|\bt\b", lower):
+        return "tonnes"
+    return None
+
+
+def _column_metal(header: str) -> str | None:
+    match = _METAL_PATTERN.search(header)
+    return METALS[match.group(1).lower()] if match else None
+
+
+def _column_unit(header: str) -> str | None:
+    bracket = re.search(r"\(([^)]+)\)", header)
+    if bracket:
+        return bracket.group(1).strip()
+    match = _UNIT_PATTERN.search(header)
+    return match.group(0) if match else None
+
+
+def _parse_number(cell: str) -> float | None:
+    cleaned = _NUMBER_CLEANUP.sub("", cell)
+    if not _NUMBER.match(cleaned):
+        return None
+    return float(cleaned)
+
+
+def _quantity(row: list[str], col: int | None, unit: str | None) -> Quantity:
+    if col is None or col >= len(row) or not row[col]:
+        return Quantity()
+    raw = row[col]
+    return Quantity(value=_parse_number(raw), unit=unit, raw=raw)
+
+
+def parse_statement_table(table: dict[str, str], section: str) -> TableParse:
+    """Map one resource/reserve statement table onto model rows with a confidence score."""
+    page = table.get("page")
+    rows = _read_rows(table.get("text") or "")
+    first_data = next((idx for idx, row in enumerate(rows) if _match_category(row, section)), None)
+    if first_data is None or first_data == 0:
+        return TableParse(page=str(page) if page else None)
+
+    header_rows = rows[max(0, first_data - _MAX_HEADER_ROWS) : first_data]
+    width = max(len(row) for row in rows)
+    headers = [
+        " ".join(row[col] for row in header_rows if col < len(row) and row[col])
+        for col in range(width)
+    ]
+    roles = {col: _column_role(header) for col, header in enumerate(headers)}
+    tonnes_col = next((col for col, role in roles.items() if role == "tonnes"), None)
+    grade_cols = [col for col, role in roles.items() if role == "grade"]
+    contained_cols = [col for col, role in roles.items() if role == "contained"]
+
+    # Pair grade and contained columns by metal; a single pair needs no metal label.
+    pairs: list[tuple[str | None, int | None, int | None]] = []
+    if len(grade_cols) <= 1 and len(contained_cols) <= 1:
+        grade_col = grade_cols[0] if grade_cols else None
+        contained_col = contained_cols[0] if contained_cols else None
+        metal = next(
+            (
+                _column_metal(headers[col])
+                for col in (grade_col, contained_col)
+                if col is not None and _column_metal(headers[col])
+            ),
+            None,
+        )
+        pairs.append((metal, grade_col, contained_col))
+    else:
+        metals = {_column_metal(headers[col]) for col in grade_cols + contained_cols}
+        for metal in sorted(metals, key=lambda m: m or ""):
+            grade_col = next((c for c in grade_cols if _column_metal(headers[c]) == metal), None)
+            contained_col = next(
+                (c for c in contained_cols if _column_metal(headers[c]) == metal), None
+            )
+            pairs.append((metal, grade_col, contained_col))
+
+    model = MineralResource if section == "resources" else MineralReserve
+    parsed: list[StatementRow] = []
+    data_rows = 0
+    numeric_rows = 0
+    tonnes_unit = _column_unit(headers[tonnes_col]) if tonnes_col is not None else None
+    for row in rows[first_data:]:
+        category = _match_category(row, section)
+        if not category:
+            continue
+        data_rows += 1
+        tonnes = _quantity(row, tonnes_col, tonnes_unit)
+        complete = tonnes.value is not None
+        for metal, grade_col, contained_col in pairs:
+            grade = _quantity(
+                row, grade_col, _column_unit(headers[grade_col]) if grade_col is not None else None
+            )
+            contained = _quantity(
+                row,
+                contained_col,
+                _column_unit(headers[contained_col]) if contained_col is not None else None,
+            )
+            complete = complete and (grade.value is not None or contained.value is not None)
+            parsed.append(
+                model(
+                    category=category,
+                    tonnes=tonnes,
+                    grade=grade,
+                    metal=metal,
+                    contained_metal=contained,
+                    source_pages=str(page) if page else None,
+                )
+            )
+        numeric_rows += int(complete)
+
+    if not parsed:
+        return TableParse(page=str(page) if page else None)
+    role_score = ((tonnes_col is not None) + bool(grade_cols) + bool(contained_cols)) / 3
+    confidence = role_score * (numeric_rows / max(1, data_rows))
+    # Two columns with the same role and metal mean the pairing above had to guess.
+    role_metals = [(role, _column_metal(headers[col])) for col, role in roles.items() if role]
+    if len(role_metals) != len(set(role_metals)):
+        confidence *= 0.5
+    return TableParse(
+        rows=parsed,
+        confidence=round(confidence, 3),
+        page=str(page) if page else None,
+        tables_considered=1,
+    )
+
+
+def parse_statement_tables(tables: list[dict[str, str]], section: str) -> TableParse:
+    """Pick the best statement among a section's filtered tables."""
+    if section not in ("resources", "reserves"):
+        return TableParse()
+    candidates = [parse_statement_table(table, section) for table in tables]
+    candidates = [candidate for candidate in candidates if candidate.rows]
+    if not candidates:
+        return TableParse(tables_considered=len(tables))
+    candidates.sort(key=lambda candidate: candidate.confidence, reverse=True)
+    best = candidates[0]
+    best.tables_considered = len(tables)
+    # Several plausible statements (areas, deposits, dates) need judgement the rules
+    # cannot make; lower confidence so the LLM handles the section.
+    competing = [c for c in candidates[1:] if c.confidence >= 0.5 and c.page != best.page]
+    if competing:
+        best.confidence = round(best.confidence * 0.5, 3)
+    return best
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+SERVICE_NAME = "ni43101-pipeline"
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def duration_sec(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+class Tracer:
+    """Collects finished spans in memory; export happens once per run."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def record(self, finished: Span) -> None:
+        with self._lock:
+            self.spans.append(finished)
+
+    def drain(self) -> list[Span]:
+        with self._lock:
+            spans, self.spans = self.spans, []
+        return spans
+
+
+_TRACER: Tracer | None = None
+_CURRENT: contextvars.ContextVar[Span | None] = contextvars.ContextVar("current_span", default=None)
+
+
+def configure_tracing(enabled: bool) -> Tracer | None:
+    global _TRACER
+    _TRACER = Tracer() if enabled else None
+    return _TRACER
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Open a child of the current span; a no-op when tracing is disabled."""
+    tracer = _TRACER
+    if tracer is None:
+        yield None
+        return
+    parent = _CURRENT.get()
+    current = Span(
+        name=name,
+        trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+        span_id=os.urandom(8).hex(),
+        parent_id=parent.span_id if parent else None,
+        start_ns=time.time_ns(),
+        attributes=dict(attributes),
+    )
+    token = _CURRENT.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        _CURRENT.reset(token)
+        current.end_ns = time.time_ns()
+        tracer.record(current)
+
+
+def set_attributes(**attributes: Any) -> None:
+    current = _CURRENT.get()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: list[Span], service_name: str = SERVICE_NAME) -> dict[str, Any]:
+    """Render spans as an OTLP/JSON ExportTraceServiceRequest."""
+    otlp_spans = []
+    for item in spans:
+        otlp_span: dict[str, Any] = {
+            "traceId": item.trace_id,
+            "spanId": item.span_id,
+            "name": item.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(item.start_ns),
+            "endTimeUnixNano": str(item.end_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in item.attributes.items()
+                if value is not None
+            ],
+            "status": {"code": 2, "message": item.error} if item.error else {"code": 1},
+        }
+        if item.parent_id:
+            otlp_span["parentSpanId"] = item.parent_id
+        otlp_spans.append(otlp_span)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]
+                },
+                "scopeSpans": [{"scope": {"name": "pipeline"}, "spans": otlp_spans}],
+            }
+        ]
+    }
+
+
+def export_otlp_json(spans: list[Span], path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(to_otlp(spans)), encoding="utf-8")
+    return path
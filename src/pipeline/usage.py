@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import contextvars
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from .pricing import ModelPrice, cost_usd
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_usage (
+    run_id TEXT NOT NULL,
+    source_pdf TEXT NOT NULL,
+    section TEXT,
+    kind TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    cached_tokens INTEGER NOT NULL,
+    latency_sec REAL,
+    cost_usd REAL,
+    estimated INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS llm_usage_run ON llm_usage (run_id, source_pdf);
+"""
+
+_TOTAL_KEYS = ("calls", "prompt_tokens", "output_tokens", "cached_tokens", "estimated_calls")
+
+
+@dataclass
+class UsageRecord:
+    """Token usage of one successful provider call."""
+
+    kind: str  # llm | embed
+    model: str
+    prompt_tokens: int
+    output_tokens: int
+    cached_tokens: int = 0
+    latency_sec: float = 0.0
+    section: str | None = None
+    # True when the counts are local estimates (mock/simulated providers, embeddings).
+    estimated: bool = False
+
+
+_RECORDER: contextvars.ContextVar[list[UsageRecord] | None] = contextvars.ContextVar(
+    "usage_recorder", default=None
+)
+_SECTION: contextvars.ContextVar[str | None] = contextvars.ContextVar("usage_section", default=None)
+
+
+@contextmanager
+def collect_usage() -> Iterator[list[UsageRecord]]:
+    """Collect the UsageRecords of every provider call made in this context."""
+    records: list[UsageRecord] = []
+    token = _RECORDER.set(records)
+    try:
+        yield records
+    finally:
+        _RECORDER.reset(token)
+
+
+@contextmanager
+def usage_section(section: str) -> Iterator[None]:
+    """Attribute calls made in this context to `section`."""
+    token = _SECTION.set(section)
+    try:
+        yield
+    finally:
+        _SECTION.reset(token)
+
+
+def record_usage(
+    kind: str,
+    model: str,
+    prompt_tokens: int,
+    output_tokens: int,
+    cached_tokens: int = 0,
+    latency_sec: float = 0.0,
+    estimated: bool = False,
+) -> UsageRecord | None:
+    records = _RECORDER.get()
+    if records is None:
+        return None
+    record = UsageRecord(
+        kind=kind,
+        model=model,
+        prompt_tokens=prompt_tokens,
+        output_tokens=output_tokens,
+        cached_tokens=cached_tokens,
+        latency_sec=latency_sec,
+        section=_SECTION.get(),
+        estimated=estimated,
+    )
+    # Hedged duplicates that finish after the winner are billed too, so they land here
+    # as well (attempts run in copies of this context that share the list).
+    records.append(record)
+    return record
+
+
+def usage_from_response(response: Any) -> tuple[int, int, int] | None:
+    """(prompt, output, cached) tokens from a GenAI response's usage_metadata."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return None
+    prompt = getattr(usage, "prompt_token_count", None) or 0
+    # Thinking tokens are billed at the output rate.
+    output = (getattr(usage, "candidates_token_count", None) or 0) + (
+        getattr(usage, "thoughts_token_count", None) or 0
+    )
+    cached = getattr(usage, "cached_content_token_count", None) or 0
+    return int(prompt), int(output), int(cached)
+
+
+def _empty() -> dict[str, Any]:
+    totals: dict[str, Any] = {key: 0 for key in _TOTAL_KEYS}
+    totals["latency_sec"] = 0.0
+    totals["cost_usd"] = 0.0
+    return totals
+
+
+def _add(totals: dict[str, Any], other: dict[str, Any]) -> None:
+    for key in _TOTAL_KEYS:
+        totals[key] += other.get(key, 0)
+    totals["latency_sec"] = round(totals["latency_sec"] + other.get("latency_sec", 0.0), 3)
+    if totals["cost_usd"] is None or other.get("cost_usd") is None:
+        totals["cost_usd"] = None
+    else:
+        totals["cost_usd"] = round(totals["cost_usd"] + other["cost_usd"], 6)
+
+
+def _record_totals(record: UsageRecord, prices: dict[str, ModelPrice] | None) -> dict[str, Any]:
+    return {
+        "calls": 1,
+        "prompt_tokens": record.prompt_tokens,
+        "output_tokens": record.output_tokens,
+        "cached_tokens": record.cached_tokens,
+        "estimated_calls": int(record.estimated),
+        "latency_sec": record.latency_sec,
+        "cost_usd": cost_usd(
+            record.model, record.prompt_tokens, record.output_tokens, record.cached_tokens, prices
+        ),
+    }
+
+
+def summarize_usage(
+    records: Iterable[UsageRecord], prices: dict[str, ModelPrice] | None = None
+) -> dict[str, Any]:
+    """Totals plus by_section and by_model breakdowns; cost is None if a model is unpriced."""
+    summary = _empty()
+    by_section: dict[str, dict[str, Any]] = {}
+    by_model: dict[str, dict[str, Any]] = {}
+    for record in records:
+        totals = _record_totals(record, prices)
+        _add(summary, totals)
+        _add(by_section.setdefault(record.section or record.kind, _empty()), totals)
+        _add(by_model.setdefault(record.model, _empty()), totals)
+    summary["by_section"] = by_section
+    summary["by_model"] = by_model
+    return summary
+
+
+def merge_usage(summaries: Iterable[dict[str, Any] | None]) -> dict[str, Any]:
+    """Roll per-document summaries up into run totals (by_model only)."""
+    merged = _empty()
+    by_model: dict[str, dict[str, Any]] = {}
+    for summary in summaries:
+        if not summary:
+            continue
+        _add(merged, summary)
+        for model, totals in summary.get("by_model", {}).items():
+            _add(by_model.setdefault(model, _empty()), totals)
+    merged["by_model"] = by_model
+    return merged
+
+
+def write_usage(
+    sqlite_path: Path, run_id: str, source_pdf: str, records: Iterable[UsageRecord]
+) -> None:
+    """Replace one document's rows for this run in the llm_usage table."""
+    rows = [
+        (
+            run_id,
+            source_pdf,
+            record.section,
+            record.kind,
+            record.model,
+            record.prompt_tokens,
+            record.output_tokens,
+            record.cached_tokens,
+            round(record.latency_sec, 3),
+            cost_usd(
+                record.model, record.prompt_tokens, record.output_tokens, record.cached_tokens
+            ),
+            int(record.estimated),
+        )
+        for record in records
+    ]
+    sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(sqlite_path, timeout=30)
+    try:
+        conn.executescript(_SCHEMA)
+        with conn:
+            conn.execute(
+                "DELETE FROM llm_usage WHERE run_id = ? AND source_pdf = ?", (run_id, source_pdf)
+            )
+            conn.executemany(
+                "INSERT INTO llm_usage (run_id, source_pdf, section, kind, model, prompt_tokens,"
+                " output_tokens, cached_tokens, latency_sec, cost_usd, estimated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+    finally:
+        conn.close()
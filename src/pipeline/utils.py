@@ -1,6 +1,11 @@
 import hashlib
+import importlib
+import math
 import re
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
+from types import ModuleType
 from typing import Sequence
 
 KEYWORDS = [
@@ -54,6 +59,47 @@ def normalize_whitespace(text: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
 
 
+def _boilerplate_key(line: str) -> str:
+    # Page numbers change on every page; mask digits so "Page 3 of 80" lines still match.
+    return re.sub(r"\d+", "#", normalize_whitespace(line)).lower()
+
+
+def _edge_line_indices(lines: Sequence[str], edge_lines: int) -> list[int]:
+    # Running headers and footers live in the first/last few non-empty lines of a page.
+    filled = [idx for idx, line in enumerate(lines) if line.strip()]
+    if len(filled) <= edge_lines * 2:
+        return filled
+    return filled[:edge_lines] + filled[-edge_lines:]
+
+
+def find_boilerplate_lines(
+    page_texts: Sequence[str],
+    min_fraction: float = 0.5,
+    min_pages: int = 4,
+    edge_lines: int = 3,
+) -> set[str]:
+    if len(page_texts) < min_pages:
+        return set()
+    counts: Counter[str] = Counter()
+    for text in page_texts:
+        lines = text.splitlines()
+        counts.update(
+            {_boilerplate_key(lines[idx]) for idx in _edge_line_indices(lines, edge_lines)}
+        )
+    threshold = max(2, math.ceil(len(page_texts) * min_fraction))
+    return {key for key, count in counts.items() if count >= threshold}
+
+
+def strip_page_boilerplate(text: str, boilerplate: set[str], edge_lines: int = 3) -> str:
+    lines = text.splitlines()
+    drop = {
+        idx
+        for idx in _edge_line_indices(lines, edge_lines)
+        if _boilerplate_key(lines[idx]) in boilerplate
+    }
+    return "\n".join(line for idx, line in enumerate(lines) if idx not in drop)
+
+
 def is_toc_page(text: str) -> bool:
     lower = text.lower()
     if any(marker in lower for marker in TOC_MARKERS):
@@ -81,6 +127,10 @@ def find_table_pages(page_texts: Sequence[str], keywords: Sequence[str]) -> set[
     return hits
 
 
+def matches_any_pattern(text: str, patterns: Sequence[re.Pattern[str]]) -> bool:
+    return any(pattern.search(text) for pattern in patterns)
+
+
 def find_pages_with_patterns(
     page_texts: Sequence[str], patterns: Sequence[re.Pattern[str]]
 ) -> list[int]:
@@ -88,7 +138,7 @@ def find_pages_with_patterns(
     if not patterns:
         return hits
     for idx, text in enumerate(page_texts):
-        if any(pattern.search(text) for pattern in patterns):
+        if matches_any_pattern(text, patterns):
             hits.append(idx + 1)
     return hits
 
@@ -225,6 +275,19 @@ def any_value(*values: object | None) -> bool:
     return any(v is not None and v != "" for v in values)
 
 
+@lru_cache(maxsize=None)
+def optional_module(name: str) -> ModuleType | None:
+    """Import an optional dependency on first use; None when it is unavailable.
+
+    Failed imports are not cached by Python, so probing a missing package inside a hot
+    function would search sys.path on every call; the result is cached here instead.
+    """
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        return None
+
+
 def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
     digest = hashlib.sha256()
     with path.open("rb") as handle:
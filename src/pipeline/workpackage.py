@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+PACKAGE_VERSION = 1
+PACKAGE_SUFFIX = ".pkg.json.gz"
+
+
+@dataclass
+class WorkPackage:
+    """Everything the LLM stage needs for one document, produced by the CPU stages.
+
+    `contexts` holds the packed context of each section that still needs the LLM;
+    `fallback` holds the precomputed retry context per section (empty when retries are
+    off). `stats` carries the page/selection/table metrics and prepare-time durations.
+    """
+
+    source_pdf: str
+    sha256: str
+    sections: list[str]
+    llm_sections: list[str]
+    extraction_path: str
+    contexts: dict[str, str] = field(default_factory=dict)
+    combined_context: str | None = None
+    fallback: dict[str, dict[str, Any]] = field(default_factory=dict)
+    section_paths: dict[str, str] = field(default_factory=dict)
+    table_rows: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    table_parser_confidence: dict[str, float] = field(default_factory=dict)
+    selected_pages: dict[str, list[int]] = field(default_factory=dict)
+    table_counts: dict[str, int] = field(default_factory=dict)
+    table_selected: dict[str, int] = field(default_factory=dict)
+    no_reserves_pages: list[int] = field(default_factory=list)
+    no_economics_pages: list[int] = field(default_factory=list)
+    context_budget: dict[str, dict] = field(default_factory=dict)
+    stats: dict[str, Any] = field(default_factory=dict)
+    version: int = PACKAGE_VERSION
+
+
+def package_path(packages_dir: Path, source_pdf: str) -> Path:
+    return packages_dir / f"{source_pdf}{PACKAGE_SUFFIX}"
+
+
+def source_name(path: Path) -> str:
+    """PDF name for a package file (or the file name itself for anything else)."""
+    return path.name.removesuffix(PACKAGE_SUFFIX)
+
+
+def list_packages(packages_dir: Path) -> list[Path]:
+    return sorted(packages_dir.glob(f"*{PACKAGE_SUFFIX}"))
+
+
+def write_package(package: WorkPackage, packages_dir: Path) -> Path:
+    packages_dir.mkdir(parents=True, exist_ok=True)
+    path = package_path(packages_dir, package.source_pdf)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as handle:
+        json.dump(asdict(package), handle, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_package(path: Path) -> WorkPackage:
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        data = json.load(handle)
+    if data.get("version") != PACKAGE_VERSION:
+        raise ValueError(
+            f"Work package {path.name} has version {data.get('version')}; "
+            f"expected {PACKAGE_VERSION}, re-run prepare"
+        )
+    return WorkPackage(**data)
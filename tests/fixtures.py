@@ -0,0 +1,11 @@
+RESOURCE_CSV = "\n".join(
+    [
+        "0,1,2,3,4",
+        "Mineral Resource Estimate,,,,",
+        "Category,Tonnes (kt),Au Grade (g/t),Contained Au (koz),Notes",
+        'Measured,"1,234",5.10,202,',
+        'Indicated,"2,500",4.20,338,',
+        'Measured + Indicated,"3,734",4.50,540,',
+        "Inferred,900,3.90,113,",
+    ]
+)
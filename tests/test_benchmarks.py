@@ -0,0 +1,43 @@
+from benchmarks.run_benchmarks import IMPORT_BUDGET_SEC, compare_results, measure_import
+from benchmarks.synthetic import SyntheticSpec, generate_report, write_pdf
+from pipeline.table_parser import parse_statement_tables
+
+
+def test_synthetic_report_tables_parse():
+    for layout in ("single_metal", "multi_metal", "split_header"):
+        texts, tables = generate_report(SyntheticSpec(pages=20, layout=layout, seed=1))
+        assert len(texts) == 20
+        parsed = parse_statement_tables(tables, "resources")
+        assert parsed.confidence >= 0.8
+        assert {row.category for row in parsed.rows} >= {"Measured", "Inferred"}
+
+
+def test_write_pdf_has_xref(tmp_path):
+    path = tmp_path / "report.pdf"
+    write_pdf(["Page one (a)", "Page two"], path)
+    data = path.read_bytes()
+    assert data.startswith(b"%PDF-1.4")
+    assert b"/Count 2" in data
+    assert data.rstrip().endswith(b"%%EOF")
+
+
+def test_compare_results_flags_regressions():
+    baseline = {"benchmarks": {"stage.a": {"status": "ok", "median_sec": 1.0}}}
+    current = {
+        "benchmarks": {
+            "stage.a": {"status": "ok", "median_sec": 1.5},
+            "stage.b": {"status": "skipped", "reason": "missing"},
+        }
+    }
+    rows = compare_results(current, baseline, threshold=0.2)
+    assert [row["benchmark"] for row in rows] == ["stage.a"]
+    assert rows[0]["regression"] is True
+    assert compare_results(current, baseline, threshold=0.6)[0]["regression"] is False
+
+
+def test_entry_points_import_within_budget_without_heavy_modules():
+    for module in ("pipeline.run", "pipeline.pipeline"):
+        # Best of three keeps a busy CI host from failing the budget on one slow start.
+        runs = [measure_import(module) for _ in range(3)]
+        assert min(seconds for seconds, _ in runs) < IMPORT_BUDGET_SEC, module
+        assert runs[0][1] == [], f"{module} loaded {runs[0][1]} at import time"
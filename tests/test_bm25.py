@@ -0,0 +1,91 @@
+import pytest
+
+from pipeline import pipeline
+from pipeline.bm25 import Bm25Index
+from pipeline.config import Settings
+from pipeline.embeddings import EmbeddingSettings, EmbeddingStore
+from pipeline.parsers import write_page_cache
+from pipeline.selector import SECTION_CONFIGS, rank_pages, select_pages
+
+PAGES = [
+    "The project is a gold project. Project access and project history.",
+    "Mineral reserves are reported as proven and probable reserves for the project.",
+    "Project geology and project mineralization of the project area.",
+]
+
+
+def test_rare_terms_outweigh_common_ones():
+    index = Bm25Index.build(PAGES)
+    scores = index.score(["project", "reserves", "probable"])
+    assert max(scores, key=scores.__getitem__) == 1
+    common_only = index.score(["project"])
+    assert common_only[0] < scores[1]
+
+
+def test_pipeline_reuses_the_cached_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        pipeline,
+        "open_page_cache",
+        lambda pdf_path, cache_dir, cache_size=64: (
+            write_page_cache(pdf_path, cache_dir, PAGES, cache_size),
+            False,
+        ),
+    )
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    settings = Settings()
+    settings.output_dir = str(tmp_path)
+    settings.embeddings_enabled = False
+    settings.bm25_enabled = True
+
+    runs = [pipeline._build_two_stage_contexts(pdf, settings, {"reserves"}) for _ in range(2)]
+
+    (*_, index, first), (*_, cached, second) = runs
+    assert first["index_cache_hit"] is False and second["index_cache_hit"] is True
+    assert cached.score(["reserves"]) == index.score(["reserves"])
+
+
+def test_select_pages_with_index(tmp_path):
+    embed_settings = EmbeddingSettings(
+        enabled=False, api_key=None, model_name="test", max_chars=500, max_pages=10
+    )
+    embed_store = EmbeddingStore(tmp_path, embed_settings)
+    config = SECTION_CONFIGS["reserves"]
+    selected = select_pages(
+        PAGES, config, embed_store, embed_settings, index=Bm25Index.build(PAGES)
+    )
+    assert 1 in selected
+
+
+def test_bm25_is_opt_in_and_weight_comes_from_settings(tmp_path, monkeypatch):
+    monkeypatch.setenv("BM25_WEIGHT", "5")
+    monkeypatch.delenv("BM25_ENABLED", raising=False)
+    settings = Settings()
+    assert not settings.bm25_enabled and settings.bm25_weight == 5.0
+
+    embed_settings = EmbeddingSettings(
+        enabled=False, api_key=None, model_name="test", max_chars=500, max_pages=10
+    )
+    embed_store = EmbeddingStore(tmp_path, embed_settings)
+    config = SECTION_CONFIGS["reserves"]
+    index = Bm25Index.build(PAGES)
+
+    def top_score(weight: float) -> float:
+        ranked = rank_pages(PAGES, config, embed_store, embed_settings, index, weight)
+        return max(score for _, score in ranked)
+
+    assert top_score(settings.bm25_weight) - top_score(1.0) == pytest.approx(4.0)
+
+
+def test_rank_pages_defaults_to_the_settings_bm25_weight(tmp_path, monkeypatch):
+    monkeypatch.delenv("BM25_WEIGHT", raising=False)
+    embed_settings = EmbeddingSettings(
+        enabled=False, api_key=None, model_name="test", max_chars=500, max_pages=10
+    )
+    embed_store = EmbeddingStore(tmp_path, embed_settings)
+    config = SECTION_CONFIGS["reserves"]
+    index = Bm25Index.build(PAGES)
+
+    assert rank_pages(PAGES, config, embed_store, embed_settings, index) == rank_pages(
+        PAGES, config, embed_store, embed_settings, index, Settings().bm25_weight
+    )
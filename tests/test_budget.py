@@ -0,0 +1,103 @@
+import json
+import logging
+
+import pytest
+
+from pipeline import pipeline
+from pipeline.budget import BudgetController
+from pipeline.config import Settings
+from pipeline.models import ExtractionResult, ProjectMetadata
+from pipeline.usage import record_usage
+
+
+def _doc(cost: float) -> dict:
+    return {"usage": {"cost_usd": cost}}
+
+
+def test_budget_degrades_step_by_step_then_stops():
+    now = [0.0]
+    budget = BudgetController(
+        total_documents=10, max_usd=1.0, fallback_model="cheap", clock=lambda: now[0]
+    )
+    settings = Settings()
+    settings.section_token_budget = 32000
+
+    budget.observe(_doc(0.05), 1.0)  # projects 0.5 for the batch: no pressure
+    assert budget.pop_decisions() == []
+    assert budget.apply(settings) == (settings, [])
+
+    budget.observe(_doc(0.2), 1.0)  # projects 1.25 > 1.0
+    budget.observe(_doc(0.2), 1.0)
+    budget.observe(_doc(0.2), 1.0)
+    actions = [decision["action"] for decision in budget.pop_decisions()]
+    assert actions == ["no_retries", "shrink_context", "switch_model"]
+    degraded, applied = budget.apply(settings)
+    assert applied == ["no_retries", "shrink_context", "switch_model"]
+    assert not degraded.retries_enabled
+    assert degraded.section_token_budget == 16000
+    assert degraded.model_name == "cheap"
+    assert settings.retries_enabled and settings.model_name != "cheap"
+    assert budget.can_schedule()
+
+    budget.observe(_doc(0.4), 1.0)  # 1.05 spent: hard cap
+    [decision] = budget.pop_decisions()
+    assert decision["action"] == "stop" and decision["trigger"] == "spend"
+    assert not budget.can_schedule()
+
+
+def test_wall_time_cap_stops_scheduling():
+    now = [0.0]
+    budget = BudgetController(total_documents=3, max_wall_sec=10.0, clock=lambda: now[0])
+    assert budget.can_schedule()
+    now[0] = 11.0
+    assert not budget.can_schedule()
+    assert budget.pop_decisions()[0]["trigger"] == "wall_time"
+
+
+def test_run_pipeline_records_decisions_and_skips_over_budget(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in ("a.pdf", "b.pdf", "c.pdf", "d.pdf"):
+        (data_dir / name).write_bytes(b"%PDF-1.4")
+    output_dir = tmp_path / "out"
+    settings = Settings()
+    settings.embeddings_enabled = False
+    settings.budget_usd = 1.5
+    logging.getLogger().addHandler(logging.NullHandler())
+    seen_retries: list[bool] = []
+
+    def fake_process(pdf_path, settings):
+        seen_retries.append(settings.retries_enabled)
+        # 1M prompt tokens on gemini-2.5-pro costs $1.25.
+        record_usage("llm", "gemini-2.5-pro", 1_000_000 if pdf_path.name != "a.pdf" else 0, 0)
+        result = ExtractionResult(metadata=ProjectMetadata(source_pdf=pdf_path.name))
+        return result, {"source_pdf": pdf_path.name}
+
+    monkeypatch.setattr(pipeline, "process_pdf_two_stage", fake_process)
+    results = pipeline.run_pipeline(data_dir, output_dir, output_dir / "x.db", settings)
+
+    manifest = json.loads((output_dir / "run_manifest.json").read_text(encoding="utf-8"))
+    # a.pdf is free; b.pdf pushes the projection over budget (degrade), c.pdf hits the cap.
+    assert [r.metadata.source_pdf for r in results] == ["a.pdf", "b.pdf", "c.pdf"]
+    assert seen_retries == [True, True, False]
+    assert [d["action"] for d in manifest["budget_decisions"]] == ["no_retries", "stop"]
+    assert manifest["skipped_pdfs"] == ["d.pdf"]
+    assert manifest["pdfs"][2]["budget_degraded"] == ["no_retries"]
+    assert manifest["budget"]["stopped"] is True
+
+
+def test_usd_budget_refuses_unpriced_models_and_skips_no_op_steps():
+    settings = Settings()
+    settings.budget_usd = 5.0
+    settings.embeddings_enabled = False
+    settings.cascade_models = "gemini-2.5-flash,my-private-model"
+    with pytest.raises(ValueError, match="my-private-model"):
+        BudgetController.from_settings(settings, total_documents=3)
+
+    settings.cascade_models = ""
+    budget = BudgetController.from_settings(settings, 3, context_shrinkable=False)
+    assert budget is not None and "shrink_context" not in budget.steps
+
+    # A document whose total is voided by an unpriced call still counts its priced calls.
+    budget.observe({"usage": {"cost_usd": None, "by_model": {"a": {"cost_usd": 0.5}}}}, 1.0)
+    assert budget.spent_usd == 0.5
@@ -0,0 +1,101 @@
+from pipeline.context import ContextUnit, estimate_tokens, merge_units, pack_context, page_units
+
+
+def test_estimate_tokens_counts_digits_individually():
+    prose = "The deposit is located in the northern region of the property."
+    table = "1,234,567 2.35 45,678 0.91"
+    assert estimate_tokens(table) > len(table) / 4
+    assert estimate_tokens(prose) < len(prose) / 2
+
+
+def test_page_units_uses_selection_scores():
+    context = "Page 2:\nalpha text\n\nPage 5:\nbeta text"
+    units = page_units(context, {1: 3.0, 4: 1.0})
+    assert [unit.label for unit in units] == ["Page 2", "Page 5"]
+    assert [unit.score for unit in units] == [3.0, 1.0]
+
+
+def test_page_units_keeps_text_without_a_page_header():
+    context = "Summary of selected pages\n\nPage 2:\nalpha text"
+    units = page_units(context, {1: 3.0})
+    assert [(unit.label, unit.score) for unit in units] == [("", 0.0), ("Page 2", 3.0)]
+    assert units[0].render() == "Summary of selected pages"
+
+    packed = pack_context(units, token_budget=units[1].tokens)
+    assert packed.dropped == ["(unlabeled)"]
+
+
+def test_pack_context_drops_lowest_score_units_whole():
+    units = [
+        ContextUnit("Page 1", "low value", score=0.5, tokens=40),
+        ContextUnit("Page 2", "high value", score=3.0, tokens=40),
+        ContextUnit("Page 3 (camelot_stream)", "a,b\n1,2", score=1.0, kind="table", tokens=30),
+    ]
+    packed = pack_context(units, token_budget=80, table_share=0.4)
+
+    assert packed.dropped == ["Page 1"]
+    assert packed.text.startswith("Page 3 (camelot_stream):")
+    assert "Page 2:\nhigh value" in packed.text
+    stats = packed.stats()
+    assert stats["used_tokens"] == 70
+    assert stats["units_kept"] == 2
+
+
+def test_pack_context_truncates_single_oversized_unit():
+    units = [ContextUnit("Page 1", "x " * 500, score=1.0, tokens=1000)]
+    packed = pack_context(units, token_budget=100)
+    assert packed.units_kept == 1
+    assert len(packed.text) < 300
+
+
+def test_merge_units_dedupes_and_orders_by_page():
+    shared = ContextUnit("Page 4", "shared page", score=1.0)
+    merged = merge_units(
+        [
+            [ContextUnit("Page 9", "economics page", score=2.0), shared],
+            [ContextUnit("Page 4", "shared page", score=3.0)],
+            [ContextUnit("Page 6 (pdfplumber)", "a\tb", score=1.0, kind="table")],
+        ]
+    )
+    assert [unit.label for unit in merged] == ["Page 6 (pdfplumber)", "Page 4", "Page 9"]
+    assert merged[1].score == 3.0
+
+
+def test_merge_units_keeps_the_wider_copy_of_an_overlapping_unit():
+    page = "Proven 5 Mt at 1.1 g/t Au. Probable 2 Mt at 0.9 g/t Au."
+    table = "Category\tTonnes\nProven\t5"
+    merged = merge_units(
+        [
+            [ContextUnit("Page 3", page[:20], score=4.0, tokens=5)],
+            [ContextUnit("Page 3", page, score=1.0)],
+            [ContextUnit("Page 3 (camelot_lattice)", table, score=1.0, kind="table")],
+            [ContextUnit("Page 3 (camelot_lattice)", table[:12], score=2.0, kind="table")],
+            [ContextUnit("Page 3 (camelot_lattice)", "Other\ttable", score=1.0, kind="table")],
+        ]
+    )
+    assert [(unit.kind, unit.text) for unit in merged] == [
+        ("table", table),
+        ("table", "Other\ttable"),
+        ("page", page),
+    ]
+    assert [unit.score for unit in merged] == [2.0, 1.0, 4.0]
+
+
+def test_merge_units_unions_different_snippets_of_one_page():
+    resources = "Measured 1.2 Mt\nIndicated 3.4 Mt\nInferred 5.6 Mt"
+    reserves = "Indicated 3.4 Mt\nProbable 0.9 Mt"
+    merged = merge_units(
+        [
+            [ContextUnit("Page 7", resources, score=2.0)],
+            [ContextUnit("Page 7", reserves, score=3.0)],
+        ]
+    )
+    assert len(merged) == 1
+    assert merged[0].text.splitlines() == [
+        "Measured 1.2 Mt",
+        "Indicated 3.4 Mt",
+        "Inferred 5.6 Mt",
+        "Probable 0.9 Mt",
+    ]
+    assert merged[0].score == 3.0
+    assert merged[0].tokens == estimate_tokens(merged[0].render())
@@ -0,0 +1,50 @@
+from pipeline.embeddings import (
+    EmbeddingSettings,
+    EmbeddingStore,
+    cosine_similarity,
+    local_embeddings,
+)
+from pipeline.selector import SECTION_CONFIGS, rank_pages
+
+
+def _local_settings() -> EmbeddingSettings:
+    return EmbeddingSettings(
+        enabled=True,
+        api_key=None,
+        model_name="local",
+        max_chars=2000,
+        max_pages=10,
+        provider="local",
+        dimensions=128,
+    )
+
+
+def test_local_embeddings_are_deterministic_and_normalized():
+    texts = ["mineral reserves proven probable", "capital cost npv irr"]
+    first = local_embeddings(texts, dimensions=64)
+    second = local_embeddings(texts, dimensions=64)
+    assert first == second
+    assert abs(sum(x * x for x in first[0]) - 1.0) < 1e-5
+
+
+def test_local_store_works_without_api_key(tmp_path):
+    store = EmbeddingStore(tmp_path, _local_settings())
+    query, related, unrelated = store.embed_texts(
+        [
+            "mineral reserves proven probable tonnes grade",
+            "Proven and probable mineral reserves total 12 Mt at 3 g/t",
+            "The property is reached by a paved road from the city",
+        ]
+    )
+    assert cosine_similarity(query, related) > cosine_similarity(query, unrelated)
+
+
+def test_rank_pages_uses_local_similarity(tmp_path):
+    settings = _local_settings()
+    store = EmbeddingStore(tmp_path, settings)
+    pages = [
+        "Access and climate of the property.",
+        "Mineral reserves: proven and probable tonnes, grade and contained metal.",
+    ]
+    ranked = rank_pages(pages, SECTION_CONFIGS["reserves"], store, settings)
+    assert ranked[0][0] == 1
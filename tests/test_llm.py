@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+from pipeline import llm
+from pipeline.models import MetadataResult, ProjectMetadata
+
+
+class _FakeModels:
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def generate_content(self, model, contents, config):
+        self.calls.append({"model": model, "contents": contents, "config": config})
+        return self.response
+
+
+def _patch_client(monkeypatch, response) -> _FakeModels:
+    models = _FakeModels(response)
+    monkeypatch.setattr(llm, "get_genai_client", lambda api_key: SimpleNamespace(models=models))
+    return models
+
+
+def test_extract_json_handles_chatty_response():
+    text = (
+        'Sure! Here it is:\n```json\n{"metadata": {"project_name": "X"}}\n```\nHope {that} helps.'
+    )
+    assert llm._extract_json(text) == {"metadata": {"project_name": "X"}}
+
+
+def test_structured_output_passes_schema_to_provider(monkeypatch):
+    parsed = MetadataResult(metadata=ProjectMetadata(project_name="Segovia"))
+    models = _patch_client(monkeypatch, SimpleNamespace(parsed=parsed, text=""))
+
+    result = llm.extract_with_schema(
+        "Page 1:\nSegovia Operations",
+        model_name="m",
+        api_key="k",
+        provider="gemini",
+        schema_model=MetadataResult,
+        task=llm.SECTION_TASKS["metadata"],
+        structured_output=True,
+    )
+
+    assert result.metadata.project_name == "Segovia"
+    call = models.calls[0]
+    assert call["config"]["response_schema"] is MetadataResult
+    assert call["config"]["response_mime_type"] == "application/json"
+    assert "JSON schema:" not in call["contents"]
+    assert "fields in the response schema" in call["contents"]
+
+
+def test_legacy_prompt_embeds_schema(monkeypatch):
+    models = _patch_client(
+        monkeypatch, SimpleNamespace(text='{"metadata": {"company_name": "Aris"}}')
+    )
+
+    result = llm.extract_with_schema(
+        "Page 1:\nAris Mining",
+        model_name="m",
+        api_key="k",
+        provider="gemini",
+        schema_model=MetadataResult,
+    )
+
+    assert result.metadata.company_name == "Aris"
+    assert "JSON schema:" in models.calls[0]["contents"]
+    assert "fields in the provided JSON schema" in models.calls[0]["contents"]
+    assert "response_schema" not in models.calls[0]["config"]
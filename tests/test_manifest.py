@@ -0,0 +1,42 @@
+import json
+
+from pipeline.manifest import ManifestWriter, compact_manifest, iter_records
+
+
+def test_jsonl_manifest_streams_and_compacts_to_legacy_json(tmp_path):
+    path = tmp_path / "run_manifest.jsonl"
+    with ManifestWriter(path) as manifest:
+        manifest.header(run_id="r1", started_at="2025-01-01T00:00:00+00:00", settings={"a": 1})
+        manifest.document({"source_pdf": "b.pdf", "status": "failed", "error": "boom"})
+        manifest.document({"source_pdf": "a.pdf", "status": "ok"})
+        manifest.footer(run_id="r1", duration_sec=1.5, failed_pdfs=["b.pdf"])
+
+    records = list(iter_records(path))
+    assert [record["record"] for record in records] == ["header", "pdf", "pdf", "footer"]
+
+    legacy = compact_manifest(path, tmp_path / "run_manifest.json")
+    assert list(legacy)[:4] == ["run_id", "started_at", "duration_sec", "failed_pdfs"]
+    assert [pdf["source_pdf"] for pdf in legacy["pdfs"]] == ["a.pdf", "b.pdf"]
+    assert "incomplete" not in legacy
+    assert json.loads((tmp_path / "run_manifest.json").read_text(encoding="utf-8")) == legacy
+
+    legacy_records = list(iter_records(tmp_path / "run_manifest.json"))
+    assert legacy_records[0]["record"] == "header"
+    assert legacy_records[0]["duration_sec"] == 1.5
+    assert [record["source_pdf"] for record in legacy_records[1:]] == ["a.pdf", "b.pdf"]
+
+
+def test_crashed_run_keeps_finished_documents(tmp_path):
+    path = tmp_path / "run_manifest.jsonl"
+    manifest = ManifestWriter(path)
+    manifest.header(run_id="r2")
+    manifest.document({"source_pdf": "a.pdf", "status": "ok"})
+    manifest.document({"source_pdf": "c.pdf", "status": "failed"})
+    manifest.close()
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('{"record": "pdf", "source_pdf": "b.p')
+
+    legacy = compact_manifest(path, tmp_path / "run_manifest.json")
+    assert legacy["incomplete"] is True
+    assert legacy["failed_pdfs"] == ["c.pdf"]
+    assert [pdf["source_pdf"] for pdf in legacy["pdfs"]] == ["a.pdf", "c.pdf"]
@@ -0,0 +1,67 @@
+import pytest
+
+from pipeline.mock_llm import (
+    SimulatedLLMError,
+    SimulatedProvider,
+    SimulationSettings,
+    get_simulated_provider,
+)
+from pipeline.models import ExtractionResult, ResourcesResult
+from tests.fixtures import RESOURCE_CSV
+
+FAST = dict(latency_ms=1.0, latency_per_1k_tokens_ms=0.0, latency_sigma=0.0, time_scale=0.001)
+
+
+def test_canned_response_reads_context_tables():
+    provider = SimulatedProvider(SimulationSettings(**FAST))
+    context = f"Page 12 (camelot_lattice):\n{RESOURCE_CSV}\n\nPage 3:\nThe Segovia Project is..."
+    result = provider.complete(context, ExtractionResult, task=None)
+    assert result.resources
+    assert result.metadata.project_name == "Segovia Project"
+    assert provider.complete(context, ResourcesResult, task="r").resources
+
+
+def test_error_injection_is_deterministic():
+    settings = SimulationSettings(seed=7, error_rate_500=0.5, **FAST)
+
+    def outcomes() -> list[str]:
+        provider = SimulatedProvider(settings)
+        seen = []
+        for idx in range(20):
+            try:
+                provider.complete(f"Page 1:\ntext {idx}", ResourcesResult, task=None)
+                seen.append("ok")
+            except SimulatedLLMError as exc:
+                seen.append(str(exc.code))
+        return seen
+
+    first = outcomes()
+    assert first == outcomes()
+    assert "500" in first and "ok" in first
+
+
+def test_rpm_quota_raises_429():
+    provider = SimulatedProvider(SimulationSettings(rpm_limit=2, **FAST))
+    provider.complete("Page 1:\na", ResourcesResult, task=None)
+    provider.complete("Page 1:\nb", ResourcesResult, task=None)
+    with pytest.raises(SimulatedLLMError) as excinfo:
+        provider.complete("Page 1:\nc", ResourcesResult, task=None)
+    assert excinfo.value.code == 429
+
+
+def test_reset_replays_the_same_draws_on_a_cached_provider():
+    settings = SimulationSettings(seed=3, error_rate_500=0.5, **FAST)
+    provider = get_simulated_provider(settings)
+
+    def outcomes() -> list[bool]:
+        provider.reset()
+        seen = []
+        for _ in range(8):
+            try:
+                provider.complete("Page 1:\nsame prompt", ResourcesResult, task=None)
+                seen.append(True)
+            except SimulatedLLMError:
+                seen.append(False)
+        return seen
+
+    assert outcomes() == outcomes()
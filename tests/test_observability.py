@@ -0,0 +1,60 @@
+import json
+import logging
+
+from pipeline import observability
+from pipeline.observability import configure_logging, flush_logging, log_event, parse_sample_rates
+
+
+class _Unserializable:
+    def __str__(self) -> str:
+        raise AssertionError("payload serialized although the level is disabled")
+
+
+def test_queue_logging_writes_sampled_events(tmp_path, monkeypatch):
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    monkeypatch.setattr(observability, "_LOG_CONFIGURED", False)
+    try:
+        log_path = configure_logging(
+            tmp_path, "INFO", parse_sample_rates("pages_selected=0.25, pdf_end=0")
+        )
+        logger = logging.getLogger("pipeline.test")
+        for page in range(8):
+            log_event(logger, "pages_selected", pdf="a.pdf", pages=[page])
+        log_event(logger, "pdf_end", pdf="a.pdf")
+        log_event(logger, "run_end", pdfs=1)
+        flush_logging()
+        log_event(logger, "run_end", pdfs=2)
+        flush_logging()
+
+        events = [
+            json.loads(line.split(" INFO ", 1)[1])
+            for line in log_path.read_text(encoding="utf-8").splitlines()
+        ]
+    finally:
+        observability._stop_listener()
+        root.handlers[:] = handlers
+        root.setLevel(level)
+        observability._SAMPLE_RATES.clear()
+
+    selected = [event for event in events if event["event"] == "pages_selected"]
+    assert [event["pages"] for event in selected] == [[0], [4]]
+    assert all(event["sample_rate"] == 0.25 for event in selected)
+    assert [event["pdfs"] for event in events if event["event"] == "run_end"] == [1, 2]
+    assert not any(event["event"] == "pdf_end" for event in events)
+
+
+def test_log_event_skips_serialization_when_level_disabled():
+    logger = logging.getLogger("pipeline.test.quiet")
+    logger.setLevel(logging.WARNING)
+    try:
+        log_event(logger, "pages_selected", value=_Unserializable())
+    finally:
+        logger.setLevel(logging.NOTSET)
+
+
+def test_sampled_events_report_the_applied_rate(monkeypatch):
+    monkeypatch.setattr(observability, "_SAMPLE_RATES", parse_sample_rates("pages_selected=0.6"))
+    monkeypatch.setattr(observability, "_SAMPLE_COUNTERS", {})
+    kept = [observability._keep("pages_selected") for _ in range(10)]
+    assert kept == [0.5, None] * 5
@@ -0,0 +1,64 @@
+import sqlite3
+import threading
+
+import pytest
+
+from pipeline.page_index import PageIndex, search_pages
+from pipeline.storage import save_sqlite
+
+
+def test_page_index_is_incremental_and_searchable(tmp_path):
+    db = tmp_path / "extractions.db"
+    index = PageIndex(db)
+    assert index.index_document(
+        "a.pdf", ["Intro", "The Segovia deposit uses a cut-off grade"], "h1"
+    )
+    assert index.index_document("b.pdf", ["Cut-off grade of 0.3 g/t gold"], "h2")
+    assert not index.index_document("a.pdf", ["ignored"], "h1")
+    assert index.index_document("a.pdf", ["Revised", "Segovia cut-off grade raised"], "h3")
+    index.close()
+
+    # Rebuilding the extraction tables must not drop the page index.
+    save_sqlite([], db)
+
+    hits = search_pages(db, '"cut-off grade"')
+    assert sorted((hit.source_pdf, hit.page) for hit in hits) == [("a.pdf", 2), ("b.pdf", 1)]
+    assert "[Segovia]" in search_pages(db, "segovia")[0].snippet
+    assert search_pages(db, "grade", source_pdf="b.pdf")[0].source_pdf == "b.pdf"
+    # Unbalanced quotes are not valid FTS5; fall back to quoted terms.
+    assert [hit.page for hit in search_pages(db, 'intro "')] == []
+    assert [hit.page for hit in search_pages(db, 'revised "')] == [1]
+
+
+def test_page_scan_runs_outside_the_index_lock(tmp_path):
+    index = PageIndex(tmp_path / "extractions.db")
+    other_done = threading.Event()
+
+    def _slow_pages():
+        yield "first page"
+        # Another worker indexes its document while this scan is still reading pages.
+        worker = threading.Thread(
+            target=lambda: index.index_document("b.pdf", ["other"], "h2") and other_done.set()
+        )
+        worker.start()
+        worker.join(timeout=2.0)
+        yield "second page"
+
+    assert index.index_document("a.pdf", _slow_pages(), "h1")
+    index.close()
+    assert other_done.is_set()
+    assert [hit.source_pdf for hit in search_pages(tmp_path / "extractions.db", "other")] == [
+        "b.pdf"
+    ]
+
+
+def test_search_pages_reports_a_missing_index(tmp_path):
+    missing = tmp_path / "typo.db"
+    with pytest.raises(FileNotFoundError):
+        search_pages(missing, "grade")
+    assert not missing.exists()
+
+    other = tmp_path / "other.db"
+    sqlite3.connect(other).close()
+    with pytest.raises(ValueError, match="no page index"):
+        search_pages(other, "grade")
@@ -0,0 +1,59 @@
+import json
+
+from pipeline.pages import PageProvider, write_pages
+from pipeline.parsers import _cache_path, _cache_signature, open_page_cache, write_page_cache
+from pipeline.selector import build_context
+from pipeline.utils import NO_RESERVES_PATTERNS, find_pages_with_patterns
+
+
+def test_provider_reads_pages_lazily_with_bounded_cache(tmp_path):
+    pages = [f"page {idx}\nno mineral reserves" if idx == 7 else f"page {idx}" for idx in range(20)]
+    offsets, chars = write_pages(tmp_path / "pages.jsonl", pages)
+    provider = PageProvider(tmp_path / "pages.jsonl", offsets, cache_size=3)
+
+    assert len(provider) == 20 and chars == sum(len(page) for page in pages)
+    assert list(provider) == pages and provider.loads == 20
+    # The last three pages stay cached; anything older is read from disk again.
+    assert provider[-1] == "page 19" and provider.loads == 20
+    assert provider[2:4] == ["page 2", "page 3"] and provider.loads == 22
+    assert provider[17] == "page 17" and provider.loads == 23
+    assert find_pages_with_patterns(provider, NO_RESERVES_PATTERNS) == [8]
+    assert build_context(provider, [1]) == "Page 2:\npage 1"
+
+    upper = provider.with_transform(str.upper, key="upper")
+    assert upper[5] == "PAGE 5" and provider[5] == "page 5"
+    provider.close()
+    upper.close()
+
+
+def test_open_page_cache_converts_legacy_cache(tmp_path):
+    pdf = tmp_path / "report.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    legacy = {"signature": _cache_signature(pdf), "pages": ["one", "two"]}
+    _cache_path(pdf, cache_dir).write_text(json.dumps(legacy), encoding="utf-8")
+
+    provider, hit = open_page_cache(pdf, cache_dir)
+    assert hit and list(provider) == ["one", "two"] and provider.total_chars == 6
+    provider.close()
+    assert "pages" not in json.loads(_cache_path(pdf, cache_dir).read_text(encoding="utf-8"))
+
+    write_page_cache(pdf, cache_dir, iter(["three"])).close()
+    provider, hit = open_page_cache(pdf, cache_dir, cache_size=1)
+    assert hit and list(provider) == ["three"]
+    provider.close()
+
+
+def test_transform_view_keeps_totals_and_digest_tracks_the_transform(tmp_path):
+    offsets, chars = write_pages(tmp_path / "pages.jsonl", ["a", "b"])
+    provider = PageProvider(tmp_path / "pages.jsonl", offsets, cache_size=1, total_chars=chars)
+    list(provider)
+    upper = provider.with_transform(str.upper, key="upper")
+
+    assert upper.total_chars == 2 and upper.loads == 2
+    assert provider.content_digest() != upper.content_digest()
+    assert (
+        upper.content_digest() == provider.with_transform(str.upper, key="upper").content_digest()
+    )
+    assert provider.loads == 2
@@ -0,0 +1,216 @@
+import json
+import logging
+import re
+import sqlite3
+
+from pipeline import pipeline
+from pipeline.checkpoints import write_checkpoint
+from pipeline.config import Settings
+from pipeline.models import ExtractionResult, ProjectMetadata, ReservesResult, ResourcesResult
+from pipeline.page_index import PageIndex, reset_page_index, set_page_index
+from pipeline.parsers import write_page_cache
+from pipeline.pipeline import _fallback_context
+from pipeline.usage import write_usage
+
+
+def _settings(tmp_path) -> Settings:
+    settings = Settings()
+    settings.output_dir = str(tmp_path)
+    settings.embeddings_enabled = False
+    return settings
+
+
+def test_fallback_context_skips_pages_already_sent(tmp_path):
+    pages = [
+        "Mineral Reserves proven probable estimate",
+        "Reserve conclusions: proven and probable mineral reserves",
+        "Unrelated appendix",
+    ]
+    settings = _settings(tmp_path)
+
+    full, stats = _fallback_context(pages, settings, "reserves")
+    assert "Page 1:" in full
+    assert stats["saved_chars"] == 0
+
+    delta, stats = _fallback_context(pages, settings, "reserves", sent_pages=[0])
+    assert "Page 1:" not in delta
+    assert "Page 2:" in delta
+    assert "already reviewed without results: 1" in delta
+    assert stats["saved_chars"] > 0
+
+
+def test_fallback_context_empty_when_nothing_new(tmp_path):
+    pages = ["Mineral Reserves proven probable estimate"]
+    settings = _settings(tmp_path)
+
+    context, stats = _fallback_context(pages, settings, "reserves", sent_pages=[0])
+    assert context == ""
+    assert stats["saved_chars"] > 0
+
+
+def test_run_pipeline_isolates_failures_and_resumes(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in ("a.pdf", "b.pdf"):
+        (data_dir / name).write_bytes(b"%PDF-1.4")
+    output_dir = tmp_path / "out"
+    settings = _settings(output_dir)
+    logging.getLogger().addHandler(logging.NullHandler())
+    processed: list[str] = []
+    failures = {"b.pdf"}
+
+    def fake_process(pdf_path, settings):
+        processed.append(pdf_path.name)
+        if pdf_path.name in failures:
+            failures.discard(pdf_path.name)
+            raise RuntimeError("boom")
+        result = ExtractionResult(metadata=ProjectMetadata(source_pdf=pdf_path.name))
+        return result, {"source_pdf": pdf_path.name}
+
+    monkeypatch.setattr(pipeline, "process_pdf_two_stage", fake_process)
+
+    results = pipeline.run_pipeline(data_dir, output_dir, output_dir / "x.db", settings)
+    manifest = json.loads((output_dir / "run_manifest.json").read_text(encoding="utf-8"))
+    assert [r.metadata.source_pdf for r in results] == ["a.pdf"]
+    assert manifest["failed_pdfs"] == ["b.pdf"]
+    assert "boom" in manifest["pdfs"][1]["error"]
+    streamed = [
+        json.loads(line)
+        for line in (output_dir / "run_manifest.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    assert [record["record"] for record in streamed] == ["header", "pdf", "pdf", "footer"]
+
+    processed.clear()
+    results = pipeline.run_pipeline(
+        data_dir, output_dir, output_dir / "x.db", settings, resume_run_id=manifest["run_id"]
+    )
+    assert processed == ["b.pdf"]
+    assert [r.metadata.source_pdf for r in results] == ["a.pdf", "b.pdf"]
+    resumed = json.loads((output_dir / "run_manifest.json").read_text(encoding="utf-8"))
+    assert resumed["pdfs"][0]["resumed"] is True
+    assert resumed["failed_pdfs"] == []
+
+
+def test_run_pipeline_isolates_checkpoint_and_usage_write_failures(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        (data_dir / name).write_bytes(b"%PDF-1.4")
+    output_dir = tmp_path / "out"
+    settings = _settings(output_dir)
+    logging.getLogger().addHandler(logging.NullHandler())
+
+    def fake_process(pdf_path, settings):
+        result = ExtractionResult(metadata=ProjectMetadata(source_pdf=pdf_path.name))
+        return result, {"source_pdf": pdf_path.name}
+
+    def failing_checkpoint(checkpoint_dir, pdf_path, result, info):
+        if pdf_path.name == "a.pdf":
+            raise OSError("No space left on device")
+        return write_checkpoint(checkpoint_dir, pdf_path, result, info)
+
+    def failing_usage(sqlite_path, run_id, name, usage):
+        if name == "b.pdf":
+            raise sqlite3.OperationalError("database is locked")
+        return write_usage(sqlite_path, run_id, name, usage)
+
+    monkeypatch.setattr(pipeline, "process_pdf_two_stage", fake_process)
+    monkeypatch.setattr(pipeline, "write_checkpoint", failing_checkpoint)
+    monkeypatch.setattr(pipeline, "write_usage", failing_usage)
+
+    results = pipeline.run_pipeline(data_dir, output_dir, output_dir / "x.db", settings)
+    manifest = json.loads((output_dir / "run_manifest.json").read_text(encoding="utf-8"))
+    assert [r.metadata.source_pdf for r in results] == ["c.pdf"]
+    assert manifest["failed_pdfs"] == ["a.pdf", "b.pdf"]
+    assert "No space left" in manifest["pdfs"][0]["error"]
+    assert "database is locked" in manifest["pdfs"][1]["error"]
+    assert (output_dir / "json" / "c.json").exists()
+
+
+def test_escalate_section_moves_up_only_on_quality_issues(monkeypatch):
+    calls: list[str] = []
+
+    def fake_extract(context, settings, schema_model, task_key, retry=False, model_name=None):
+        calls.append(model_name)
+        rows = [{"category": "Measured", "tonnes": {"value": 1.0}}] if model_name == "pro" else []
+        return schema_model(resources=rows)
+
+    monkeypatch.setattr(pipeline, "_extract_section", fake_extract)
+    settings = Settings()
+    tiers = ["lite", "flash", "pro"]
+    stats = [pipeline._tier_stats(model) for model in tiers]
+    logger = logging.getLogger("test")
+
+    result, trail, durations, _ = pipeline._escalate_section(
+        ResourcesResult(),
+        "ctx",
+        settings,
+        ResourcesResult,
+        "resources",
+        tiers,
+        stats,
+        False,
+        logger,
+        "a.pdf",
+    )
+    assert calls == ["flash", "pro"]
+    assert trail["models"] == tiers and trail["issues"][-1] == []
+    assert set(durations) == {"resources_tier1", "resources_tier2"}
+    assert [s["escalated"] for s in stats] == [1, 1, 0]
+
+    # A section the report declares absent is not escalated for being empty.
+    calls.clear()
+    stats = [pipeline._tier_stats(model) for model in tiers]
+    _, trail, _, _ = pipeline._escalate_section(
+        ReservesResult(),
+        "ctx",
+        settings,
+        ReservesResult,
+        "reserves",
+        tiers,
+        stats,
+        True,
+        logger,
+        "a.pdf",
+    )
+    assert calls == [] and trail["final_model"] == "lite"
+
+    summary = pipeline._cascade_summary([{"tiers": stats}, None])
+    assert summary[0]["escalation_rate"] == 0.0 and summary[1]["calls"] == 0
+
+
+def test_linear_page_passes_read_each_page_once(tmp_path, monkeypatch):
+    pages = [f"Page {idx} mineral reserves text {idx}" for idx in range(12)]
+    pages[3] = "There are no mineral reserves on the property"
+    monkeypatch.setattr(
+        pipeline,
+        "open_page_cache",
+        lambda pdf_path, cache_dir, cache_size=64: (
+            write_page_cache(pdf_path, cache_dir, pages, cache_size),
+            False,
+        ),
+    )
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    settings = _settings(tmp_path)
+    settings.page_lru_size = 2
+    settings.bm25_enabled = True
+    settings.strip_boilerplate = False
+    page_index = PageIndex(tmp_path / "pages.db")
+    token = set_page_index(page_index)
+    try:
+        provider, contexts, _, _, index, metrics = pipeline._build_two_stage_contexts(
+            pdf, settings, {"reserves"}
+        )
+    finally:
+        reset_page_index(token)
+        page_index.close()
+
+    assert metrics["page_index"] == "indexed" and index is not None
+    assert metrics["chars"] == sum(len(page) for page in pages)
+    # Chars, BM25 and the FTS index share one scan; selection reads come after it.
+    assert metrics["scan_page_loads"] == metrics["page_count"] == 12
+    assert metrics["no_reserves_pages"] == [4] and metrics["no_economics_pages"] == []
+    # Ranking works from the scan's page signals; afterwards only the selected pages load.
+    selected = len(re.findall(r"^Page \d+:$", contexts["reserves"], re.M))
+    assert provider.loads <= metrics["scan_page_loads"] + selected
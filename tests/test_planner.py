@@ -0,0 +1,135 @@
+import json
+import logging
+
+import pytest
+
+from pipeline import pipeline
+from pipeline.parsers import write_page_cache
+from pipeline.planner import PlanHistory, load_history, plan_document, simulate_makespan
+
+
+def _write_manifest(path, dry_run, retried):
+    records = [
+        {"record": "header", "settings": {"dry_run": dry_run}},
+        *(
+            {
+                "record": "pdf",
+                "status": "ok",
+                "section_paths": {"reserves": "llm", "metadata": "table_parser"},
+                "usage": {
+                    "by_section": {
+                        "reserves": {"calls": 1, "prompt_tokens": 1000, "output_tokens": 40},
+                        **(
+                            {"reserves:retry": {"calls": 1, "prompt_tokens": 3000}} if retry else {}
+                        ),
+                    },
+                    "by_model": {"m": {"calls": 1 + retry, "latency_sec": 2.0 * (1 + retry)}},
+                },
+            }
+            for retry in retried
+        ),
+    ]
+    path.write_text("\n".join(json.dumps(record) for record in records), encoding="utf-8")
+
+
+def test_history_retry_rate_skips_dry_runs_and_non_llm_sections(tmp_path):
+    _write_manifest(tmp_path / "real.jsonl", False, [True, False, False, True])
+    _write_manifest(tmp_path / "dry.jsonl", True, [True, True])
+
+    history = load_history([tmp_path / "real.jsonl", tmp_path / "dry.jsonl", tmp_path / "x"])
+
+    assert history.documents == 4
+    assert history.retry_probability == {"reserves": 0.5}
+    assert history.prompt_tokens["reserves:retry"] == 3000
+    assert history.latency_sec["m"] == 2.0
+
+
+def test_plan_weights_retries_and_makespan_respects_workers_and_quota():
+    history = PlanHistory(
+        retry_probability={"reserves": 0.5}, latency_sec={"gemini-2.5-flash": 2.0}
+    )
+    plan = plan_document(
+        {"reserves": 10_000, "reserves:retry": 10_000},
+        history,
+        "gemini-2.5-flash",
+        "gemini-2.5-flash",
+    )
+    assert plan["expected_calls"] == 1.5
+    assert plan["prompt_tokens"] == 15_000
+
+    plans = [plan] * 4
+    # Each document: 2s call + 0.5 * 2s expected retry.
+    assert simulate_makespan(plans, workers=1) == pytest.approx(12.0)
+    assert simulate_makespan(plans, workers=4) == pytest.approx(3.0)
+    # 6 expected requests at 60 RPM need ~5s of quota before the last one can start.
+    assert simulate_makespan(plans, workers=4, rpm=60) > 6.0
+
+
+def test_dry_run_writes_capacity_plan(tmp_path, monkeypatch):
+    pages = [
+        "Mineral Resource Estimate: Measured 10 Mt at 1.2 g/t Au.",
+        "Mineral Reserves: Proven 5 Mt at 1.1 g/t Au.",
+    ]
+    monkeypatch.setattr(
+        pipeline,
+        "open_page_cache",
+        lambda pdf_path, cache_dir, cache_size=64: (
+            write_page_cache(pdf_path, cache_dir, pages, cache_size),
+            False,
+        ),
+    )
+    monkeypatch.setattr(pipeline, "extract_tables_for_pages", lambda pdf, pages: [])
+    logging.getLogger().addHandler(logging.NullHandler())
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "a.pdf").write_bytes(b"%PDF-1.4")
+    settings = pipeline.Settings()
+    settings.output_dir = str(tmp_path / "out")
+    settings.embeddings_enabled = False
+    settings.page_index_enabled = False
+    settings.dry_run = True
+    settings.plan_workers = "1,2"
+
+    pipeline.run_pipeline(data_dir, tmp_path / "out", tmp_path / "x.db", settings)
+
+    manifest = json.loads((tmp_path / "out" / "run_manifest.json").read_text(encoding="utf-8"))
+    document = manifest["pdfs"][0]
+    assert {"resources:retry", "reserves:retry"} <= set(document["projected_prompt_tokens"])
+    assert document["plan"]["prompt_tokens"] > 0
+    assert [row["workers"] for row in manifest["plan"]["makespan"]] == [1, 2]
+    assert manifest["plan"]["history_documents"] == 0
+
+
+def test_history_and_plan_project_cascade_escalations(tmp_path):
+    tiers = [{"escalated": 1, "sections": 4}, {"escalated": 0, "sections": 1}]
+    records = [
+        {"record": "header", "settings": {"dry_run": False}},
+        *(
+            {
+                "record": "pdf",
+                "status": "ok",
+                "cascade": {"tiers": tiers, "sections": {"reserves": {"models": models}}},
+            }
+            for models in (["cheap", "strong"], ["cheap"], ["cheap"], ["cheap"])
+        ),
+    ]
+    path = tmp_path / "m.jsonl"
+    path.write_text("\n".join(json.dumps(record) for record in records), encoding="utf-8")
+
+    history = load_history([path])
+    assert history.escalation_probability == {"reserves:tier1": 0.25}
+    assert history.tier_escalation_rate == {0: 0.25, 1: 0.0}
+
+    plan = plan_document(
+        {"reserves": 1000, "reserves:tier1": 1000, "economics:tier1": 1000},
+        history,
+        "cheap",
+        "strong",
+        tiers=["cheap", "strong"],
+    )
+    by_label = {call["label"]: call for call in plan["calls"]}
+    assert by_label["reserves:tier1"]["model"] == "strong"
+    assert by_label["reserves:tier1"]["probability"] == 0.25
+    # Unseen section: per-tier rate from the aggregate cascade stats.
+    assert by_label["economics:tier1"]["probability"] == 0.25
+    assert plan["expected_calls"] == 1.5
@@ -0,0 +1,70 @@
+from pipeline.profiling import RunProfiler, profile_stage
+
+
+def _work() -> int:
+    return sum(len(str(i)) for i in range(2000))
+
+
+def test_sampled_document_writes_prof_and_hotspots(tmp_path):
+    profiler = RunProfiler(tmp_path, sample_rate=1.0, top_n=5)
+    profiler.start()
+    with profiler.document("report.pdf") as doc:
+        assert doc is not None
+        with profile_stage("selection"):
+            _work()
+        with profile_stage("selection"):
+            _work()
+    summary = profiler.finish()
+
+    assert summary["stages"]["selection"]["calls"] == 2
+    assert (tmp_path / "report.prof").exists()
+    hotspots = (tmp_path / "hotspots.txt").read_text(encoding="utf-8")
+    assert "selection" in hotspots
+    assert "_work" in hotspots
+
+
+def test_unsampled_documents_are_not_profiled(tmp_path):
+    profiler = RunProfiler(tmp_path, sample_rate=0.0, memory=False)
+    profiler.start()
+    with profiler.document("report.pdf") as doc:
+        assert doc is None
+        with profile_stage("selection"):
+            _work()
+    assert profiler.finish()["stages"] == {}
+    assert not list(tmp_path.glob("*.prof"))
+
+
+def test_memory_is_traced_only_inside_sampled_documents(tmp_path):
+    import tracemalloc
+
+    profiler = RunProfiler(tmp_path, sample_rate=0.0, top_n=5)
+    profiler.start()
+    assert not tracemalloc.is_tracing()
+    with profiler.document("skipped.pdf"):
+        assert not tracemalloc.is_tracing()
+    with profiler.document("_run", force=True):
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+    profiler.finish()
+
+
+def _earlier_run_work() -> int:
+    return sum(len(str(i)) for i in range(2000))
+
+
+def test_hotspots_skip_profiles_of_earlier_runs(tmp_path):
+    earlier = RunProfiler(tmp_path, sample_rate=1.0, top_n=50)
+    with earlier.document("old.pdf"):
+        with profile_stage("selection"):
+            _earlier_run_work()
+    earlier.finish()
+
+    profiler = RunProfiler(tmp_path, sample_rate=1.0, top_n=50)
+    with profiler.document("new.pdf"):
+        with profile_stage("selection"):
+            _work()
+    profiler.finish()
+
+    assert (tmp_path / "old.prof").exists()
+    hotspots = (tmp_path / "hotspots.txt").read_text(encoding="utf-8")
+    assert "_work" in hotspots and "_earlier_run_work" not in hotspots
@@ -1,4 +1,4 @@
-from pipeline.models import ExtractionResult, MineralReserve
+from pipeline.models import Economics, ExtractionResult, MineralReserve, Quantity
 from pipeline.quality import apply_quality_checks
 
 
@@ -33,3 +33,17 @@ def test_flags_missing_economics_values():
     assert checked.economics is not None
     assert metrics["economics_has_values"] is False
     assert any("economics missing numeric values" in warning for warning in warnings)
+
+
+def test_quality_issues_flag_sections_for_escalation():
+    result = ExtractionResult(
+        reserves=[MineralReserve(category="Indicated"), MineralReserve(category="Probable")],
+        economics=Economics(npv=Quantity(value=120.0)),
+    )
+    _, metrics, _ = apply_quality_checks(result, sections={"reserves", "economics", "metadata"})
+
+    assert metrics["quality_issues"] == {
+        "metadata": ["metadata_missing"],
+        "reserves": ["filtered_category", "empty_quantities"],
+        "economics": ["missing_currency"],
+    }
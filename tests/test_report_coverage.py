@@ -182,3 +182,15 @@ def test_report_coverage_includes_no_flags(tmp_path, monkeypatch):
     parts_b = [part.strip() for part in row_b.strip("|").split("|")]
     assert parts_b[6] == ""
     assert parts_b[7] == "yes"
+
+    jsonl_path = tmp_path / "run_manifest.jsonl"
+    pdfs = manifest.pop("pdfs")
+    records = [{"record": "header", **manifest}] + [{"record": "pdf", **pdf} for pdf in pdfs]
+    jsonl_path.write_text("\n".join(json.dumps(record) for record in records), encoding="utf-8")
+    monkeypatch.setattr(
+        sys, "argv", ["report_coverage.py", "--manifest", str(jsonl_path)] + sys.argv[3:]
+    )
+
+    report_coverage.main()
+
+    assert output_path.read_text(encoding="utf-8").split("\n", 3)[3] == text.split("\n", 3)[3]
@@ -0,0 +1,143 @@
+import threading
+import time
+
+import pytest
+
+from pipeline.resilience import (
+    DeadlineExceeded,
+    RetryPolicy,
+    call_with_retries,
+    classify_error,
+    collect_calls,
+    summarize_calls,
+)
+
+
+class _ApiError(Exception):
+    def __init__(self, code: int) -> None:
+        super().__init__(str(code))
+        self.code = code
+
+
+def _flaky(errors: list[Exception], value: str = "ok"):
+    def _call() -> str:
+        if errors:
+            raise errors.pop(0)
+        return value
+
+    return _call
+
+
+def test_classify_error():
+    assert classify_error(_ApiError(429)) == "rate_limited"
+    assert classify_error(_ApiError(503)) == "transient"
+    assert classify_error(_ApiError(400)) == "fatal"
+    assert classify_error(TimeoutError()) == "transient"
+    assert classify_error(ValueError("bad json")) == "fatal"
+
+
+def test_retries_transient_errors_and_records_attempts():
+    delays: list[float] = []
+    with collect_calls() as calls:
+        result = call_with_retries(
+            _flaky([_ApiError(503), _ApiError(429)]),
+            RetryPolicy(max_attempts=3, base_delay_sec=0.5),
+            name="test:retry",
+            sleep=delays.append,
+        )
+    assert result == "ok"
+    assert len(delays) == 2
+    summary = summarize_calls(calls)
+    assert summary["attempts"] == 3
+    assert summary["errors"] == {"transient": 1, "rate_limited": 1}
+    assert summary["failed"] == 0
+
+
+def test_fatal_errors_are_not_retried():
+    with collect_calls() as calls, pytest.raises(_ApiError):
+        call_with_retries(
+            _flaky([_ApiError(400)]), RetryPolicy(), name="test:fatal", sleep=lambda _: None
+        )
+    assert calls[0].attempts == 1
+    assert calls[0].outcome == "fatal"
+
+
+def test_deadline_stops_slow_calls():
+    policy = RetryPolicy(deadline_sec=0.05)
+    with pytest.raises(DeadlineExceeded):
+        call_with_retries(lambda: time.sleep(0.5), policy, name="test:deadline")
+
+
+def test_hedged_request_wins_over_slow_primary():
+    policy = RetryPolicy(hedge_percentile=0.5, hedge_min_samples=3)
+    for _ in range(3):
+        call_with_retries(lambda: "warm", policy, name="test:hedge")
+
+    first = threading.Event()
+
+    def _call() -> str:
+        if not first.is_set():
+            first.set()
+            time.sleep(0.5)
+            return "slow"
+        return "fast"
+
+    with collect_calls() as calls:
+        assert call_with_retries(_call, policy, name="test:hedge") == "fast"
+    assert calls[0].hedges == 1
+    assert calls[0].wasted_sec > 0
+
+
+def test_attempt_pool_fits_every_worker_with_a_deadline():
+    # More concurrent callers than the old fixed pool of 32; none may queue past its deadline.
+    policy = RetryPolicy(max_attempts=1, deadline_sec=2.0, concurrency=40)
+    barrier = threading.Barrier(40, timeout=1.5)
+    results: list[str] = []
+
+    def _call() -> str:
+        barrier.wait()
+        return "ok"
+
+    def _worker() -> None:
+        results.append(call_with_retries(_call, policy, name="test:pool"))
+
+    threads = [threading.Thread(target=_worker) for _ in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["ok"] * 40
+
+
+def test_pool_growth_does_not_shut_down_a_pool_being_submitted_to(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pipeline import resilience
+
+    grown: list[str] = []
+
+    class _RacingPool(ThreadPoolExecutor):
+        raced = False
+
+        def submit(self, fn, /, *args, **kwargs):
+            if not _RacingPool.raced:
+                # Another caller grows the pool while this submission is in progress.
+                _RacingPool.raced = True
+                grower = threading.Thread(
+                    target=lambda: grown.append(
+                        resilience._submit(lambda: "grown", RetryPolicy(concurrency=8)).result()
+                    )
+                )
+                grower.start()
+                grower.join(timeout=0.2)
+            return super().submit(fn, *args, **kwargs)
+
+    monkeypatch.setattr(resilience, "ThreadPoolExecutor", _RacingPool)
+    monkeypatch.setattr(resilience, "_POOL", None)
+    monkeypatch.setattr(resilience, "_POOL_SIZE", 0)
+
+    assert resilience._submit(lambda: "ok", RetryPolicy(concurrency=1)).result() == "ok"
+    deadline = time.monotonic() + 2.0
+    while not grown and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert grown == ["grown"]
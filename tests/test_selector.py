@@ -1,5 +1,5 @@
 from pipeline.embeddings import EmbeddingSettings, EmbeddingStore
-from pipeline.selector import SECTION_CONFIGS, select_pages
+from pipeline.selector import SECTION_CONFIGS, page_signals, rank_pages, select_pages
 
 
 def test_select_pages_skips_toc(tmp_path):
@@ -45,3 +45,26 @@ def test_select_pages_expands_window(tmp_path):
     assert set([1, 2, 3]).issubset(selected)
     assert 0 not in selected
     assert 4 not in selected
+
+
+def test_rank_pages_from_scan_signals_matches_page_texts(tmp_path):
+    pages = [
+        "Table of Contents\n....\n1. Intro\n2. Summary",
+        "Mineral Reserves Table 5-1\nProven Probable 100 0.5",
+        "Measured and indicated resources 2.1 Mt",
+    ]
+    configs = [SECTION_CONFIGS["reserves"], SECTION_CONFIGS["resources"]]
+    embed_settings = EmbeddingSettings(
+        enabled=False,
+        api_key=None,
+        model_name="test",
+        max_chars=500,
+        max_pages=10,
+    )
+    embed_store = EmbeddingStore(tmp_path, embed_settings)
+
+    signals = [page_signals(text, configs) for text in pages]
+    for config in configs:
+        assert rank_pages(
+            pages, config, embed_store, embed_settings, signals=signals
+        ) == rank_pages(pages, config, embed_store, embed_settings)
@@ -1,7 +1,85 @@
-from pipeline.storage import _normalize_pages
+from datetime import date
+
+import pytest
+
+from pipeline.models import (
+    Economics,
+    ExtractionResult,
+    MineralResource,
+    ProjectMetadata,
+    Quantity,
+)
+from pipeline.storage import _normalize_pages, save_parquet
 
 
 def test_normalize_pages():
     raw = "Page 1; Page 2|Page 3/4"
     assert _normalize_pages(raw) == "1, 2, 3, 4"
     assert _normalize_pages(None) is None
+
+
+def _result(name: str, tonnes: float) -> ExtractionResult:
+    return ExtractionResult(
+        metadata=ProjectMetadata(source_pdf=name, report_date="2023-05-01"),
+        resources=[
+            MineralResource(
+                category="Measured",
+                metal="Au",
+                tonnes=Quantity(value=tonnes, unit="Mt"),
+                grade=Quantity(value=1.2, unit="g/t"),
+                contained_metal=Quantity(value=3.4, unit="Moz"),
+                source_pages="Page 7",
+            )
+        ],
+        economics=Economics(npv=Quantity(value=120.5, unit="M"), currency="USD"),
+    )
+
+
+def test_save_parquet_appends_typed_partitions(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    ds = pytest.importorskip("pyarrow.dataset")
+
+    save_parquet([_result("a.pdf", 10.0)], tmp_path, "run1", date(2024, 1, 1))
+    save_parquet([_result("b.pdf", 20.0)], tmp_path, "run2", date(2024, 1, 2), row_group_size=1)
+    # Rerunning a run id replaces only its own partition.
+    save_parquet([_result("b.pdf", 25.0)], tmp_path, "run2", date(2024, 1, 2))
+
+    resources = ds.dataset(tmp_path / "resources", partitioning="hive").to_table()
+    assert resources.schema.field("tonnes_value").type == pa.float64()
+    rows = sorted(resources.to_pylist(), key=lambda row: row["source_pdf"])
+    assert [(row["source_pdf"], row["tonnes_value"], row["run_id"]) for row in rows] == [
+        ("a.pdf", 10.0, "run1"),
+        ("b.pdf", 25.0, "run2"),
+    ]
+    assert rows[0]["source_pages"] == "7"
+
+    metadata = ds.dataset(tmp_path / "metadata", partitioning="hive").to_table()
+    assert metadata.column("report_date").to_pylist() == [date(2023, 5, 1)] * 2
+    assert not (tmp_path / "reserves").exists()
+
+
+def test_resumed_run_on_a_later_day_keeps_one_partition(tmp_path):
+    ds = pytest.importorskip("pyarrow.dataset")
+
+    save_parquet([_result("a.pdf", 10.0)], tmp_path, "run1", date(2024, 1, 1))
+    save_parquet(
+        [_result("a.pdf", 10.0), _result("b.pdf", 20.0)], tmp_path, "run1", date(2024, 1, 2)
+    )
+
+    resources = ds.dataset(tmp_path / "resources", partitioning="hive").to_table()
+    assert sorted(resources.column("source_pdf").to_pylist()) == ["a.pdf", "b.pdf"]
+    assert [p.name for p in (tmp_path / "resources").iterdir()] == ["ingest_date=2024-01-02"]
+
+
+def test_save_parquet_accepts_many_distinct_categories(tmp_path):
+    ds = pytest.importorskip("pyarrow.dataset")
+
+    result = _result("a.pdf", 10.0)
+    result.resources = [
+        MineralResource(category=f"Category {i}", metal=f"Metal {i}", source_pages="Page 1")
+        for i in range(200)
+    ]
+    save_parquet([result], tmp_path, "run1", date(2024, 1, 1))
+
+    resources = ds.dataset(tmp_path / "resources", partitioning="hive").to_table()
+    assert len(set(resources.column("category").to_pylist())) == 200
@@ -0,0 +1,80 @@
+from pipeline.table_parser import parse_statement_table, parse_statement_tables
+from tests.fixtures import RESOURCE_CSV
+
+
+def test_parse_resource_statement_maps_columns_and_units():
+    parsed = parse_statement_table({"page": "32", "text": RESOURCE_CSV}, "resources")
+
+    assert [row.category for row in parsed.rows] == [
+        "Measured",
+        "Indicated",
+        "Measured + Indicated",
+        "Inferred",
+    ]
+    first = parsed.rows[0]
+    assert first.tonnes.value == 1234.0
+    assert first.tonnes.unit == "kt"
+    assert first.grade.value == 5.1
+    assert first.contained_metal.unit == "koz"
+    assert first.metal == "Au"
+    assert first.source_pages == "32"
+    assert parsed.confidence == 1.0
+
+
+def test_parse_reserve_statement_splits_metals():
+    text = "\n".join(
+        [
+            "Category\tTonnes (Mt)\tAu (g/t)\tAg (g/t)\tAu (koz)\tAg (koz)",
+            "Proven\t1.2\t3.1\t20\t120\t770",
+            "Probable\t2.0\t2.8\t18\t180\t1157",
+        ]
+    )
+    parsed = parse_statement_table({"page": "40", "text": text}, "reserves")
+
+    assert len(parsed.rows) == 4
+    assert {row.metal for row in parsed.rows} == {"Au", "Ag"}
+    silver = next(row for row in parsed.rows if row.metal == "Ag")
+    assert silver.grade.value == 20.0
+    assert silver.contained_metal.value == 770.0
+
+
+def test_low_confidence_without_quantity_columns():
+    text = "Category,Comment\nMeasured,see text\nIndicated,see text"
+    parsed = parse_statement_table({"page": "3", "text": text}, "resources")
+    assert parsed.confidence < 0.5
+
+
+def test_competing_statements_lower_confidence():
+    tables = [
+        {"page": "32", "text": RESOURCE_CSV},
+        {"page": "45", "text": RESOURCE_CSV},
+    ]
+    parsed = parse_statement_tables(tables, "resources")
+    assert parsed.tables_considered == 2
+    assert parsed.confidence == 0.5
+
+
+def test_cut_off_column_is_not_read_as_grade():
+    text = "\n".join(
+        [
+            "Category,Cut-off (g/t Au),Tonnes (kt),Au (g/t),Contained Au (koz)",
+            "Measured,0.5,1234,5.10,202",
+            "Indicated,0.5,2500,4.20,338",
+        ]
+    )
+    parsed = parse_statement_table({"page": "7", "text": text}, "resources")
+
+    assert [row.grade.value for row in parsed.rows] == [5.1, 4.2]
+    assert parsed.confidence == 1.0
+
+
+def test_duplicate_grade_columns_lower_confidence():
+    text = "\n".join(
+        [
+            "Category,Tonnes (kt),Au (g/t),Au Grade (g/t),Contained Au (koz)",
+            "Measured,1234,5.10,5.10,202",
+        ]
+    )
+    parsed = parse_statement_table({"page": "7", "text": text}, "resources")
+
+    assert parsed.confidence < 0.8
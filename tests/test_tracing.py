@@ -0,0 +1,77 @@
+import json
+
+from pipeline.metrics import Counter, Histogram, render_metrics, write_textfile
+from pipeline.tracing import configure_tracing, export_otlp_json, set_attributes, span, to_otlp
+
+
+def test_nested_spans_share_trace_and_link_parents(tmp_path):
+    tracer = configure_tracing(True)
+    assert tracer is not None
+    try:
+        with span("run"):
+            with span("document", pdf="a.pdf"):
+                with span("stage:rank"):
+                    set_attributes(pages=12)
+    finally:
+        configure_tracing(False)
+
+    spans = {item.name: item for item in tracer.drain()}
+    assert {item.trace_id for item in spans.values()} == {spans["run"].trace_id}
+    assert spans["run"].parent_id is None
+    assert spans["document"].parent_id == spans["run"].span_id
+    assert spans["stage:rank"].parent_id == spans["document"].span_id
+    assert spans["stage:rank"].attributes == {"pages": 12}
+
+    path = export_otlp_json(list(spans.values()), tmp_path / "trace.json")
+    otlp = json.loads(path.read_text(encoding="utf-8"))
+    exported = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert len(exported) == 3
+    document = next(item for item in exported if item["name"] == "document")
+    assert document["parentSpanId"] == spans["run"].span_id
+    assert document["attributes"] == [{"key": "pdf", "value": {"stringValue": "a.pdf"}}]
+
+
+def test_span_is_noop_when_disabled_and_records_errors():
+    configure_tracing(False)
+    with span("ignored") as current:
+        assert current is None
+
+    tracer = configure_tracing(True)
+    assert tracer is not None
+    try:
+        with span("failing"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    finally:
+        configure_tracing(False)
+    (failed,) = tracer.drain()
+    assert to_otlp([failed])["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["status"] == {
+        "code": 2,
+        "message": "ValueError: boom",
+    }
+
+
+def test_histogram_and_counter_render_prometheus_text():
+    histogram = Histogram("demo_seconds", "Demo.", buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="rank")
+    histogram.observe(0.5, stage="rank")
+    lines = histogram.render()
+    assert 'demo_seconds_bucket{stage="rank",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{stage="rank",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{stage="rank",le="+Inf"} 2' in lines
+    assert 'demo_seconds_count{stage="rank"} 2' in lines
+
+    counter = Counter("demo_total", "Demo.")
+    counter.inc(outcome="ok")
+    counter.inc(2, outcome="ok")
+    assert counter.render() == ['demo_total{outcome="ok"} 3']
+
+
+def test_write_textfile_exposes_registry(tmp_path):
+    path = tmp_path / "pipeline.prom"
+    write_textfile(path)
+    text = path.read_text(encoding="utf-8")
+    assert text == render_metrics()
+    assert "# TYPE pipeline_stage_duration_seconds histogram" in text
+    assert not list(tmp_path.glob(".*.tmp"))
@@ -0,0 +1,115 @@
+import json
+import logging
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from pipeline import llm, pipeline
+from pipeline.config import Settings
+from pipeline.models import ExtractionResult, MetadataResult, ProjectMetadata
+from pipeline.pricing import cost_usd, parse_price_overrides, price_for
+from pipeline.usage import collect_usage, summarize_usage, usage_section
+from scripts import estimate_cost
+
+
+def test_price_lookup_uses_longest_prefix():
+    assert price_for("models/gemini-2.5-flash-lite-001").input_per_1m == 0.10
+    assert price_for("gemini-2.5-flash-001").input_per_1m == 0.30
+    assert price_for("unknown-model") is None
+
+
+def test_cost_bills_cached_prompt_tokens_at_cached_rate():
+    # 1M prompt tokens of which 400k cached, 100k output on gemini-2.5-flash.
+    cost = cost_usd("gemini-2.5-flash", 1_000_000, 100_000, cached_tokens=400_000)
+    assert cost == pytest.approx(0.6 * 0.30 + 0.4 * 0.075 + 0.1 * 2.50)
+    prices = parse_price_overrides(["my-model=1,2"])
+    assert cost_usd("my-model", 1_000_000, 1_000_000, prices=prices) == pytest.approx(3.0)
+    with pytest.raises(ValueError):
+        parse_price_overrides(["my-model=1"])
+
+
+def test_gemini_call_records_provider_usage(monkeypatch):
+    usage = SimpleNamespace(
+        prompt_token_count=1200,
+        candidates_token_count=80,
+        thoughts_token_count=20,
+        cached_content_token_count=1000,
+    )
+    response = SimpleNamespace(text='{"metadata": {"project_name": "X"}}', usage_metadata=usage)
+    models = SimpleNamespace(generate_content=lambda model, contents, config: response)
+    monkeypatch.setattr(llm, "get_genai_client", lambda api_key: SimpleNamespace(models=models))
+
+    with collect_usage() as records, usage_section("metadata"):
+        llm.extract_with_schema(
+            "Page 1:\nX Project", "gemini-2.5-flash", "k", "gemini", MetadataResult
+        )
+
+    [record] = records
+    assert (record.prompt_tokens, record.output_tokens, record.cached_tokens) == (1200, 100, 1000)
+    assert record.section == "metadata" and not record.estimated
+    summary = summarize_usage(records)
+    assert summary["by_section"]["metadata"]["calls"] == 1
+    assert summary["cost_usd"] == pytest.approx(
+        cost_usd("gemini-2.5-flash", 1200, 100, cached_tokens=1000)
+    )
+
+
+def test_offline_usage_matches_the_prompt_estimate():
+    text = "Page 1:\nX Project"
+    with collect_usage() as records:
+        for structured_output in (True, False):
+            llm.extract_with_schema(
+                text, "m", None, "mock", MetadataResult, structured_output=structured_output
+            )
+
+    assert [record.prompt_tokens for record in records] == [
+        llm.estimate_prompt_tokens(text, MetadataResult, structured_output=True),
+        llm.estimate_prompt_tokens(text, MetadataResult, structured_output=False),
+    ]
+    assert records[0].prompt_tokens < records[1].prompt_tokens
+
+
+def test_run_usage_reaches_manifest_sqlite_and_cost_report(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "a.pdf").write_bytes(b"%PDF-1.4")
+    output_dir = tmp_path / "out"
+    sqlite_path = output_dir / "x.db"
+    settings = Settings()
+    settings.embeddings_enabled = False
+    logging.getLogger().addHandler(logging.NullHandler())
+
+    def fake_process(pdf_path, settings):
+        for section in ("metadata", "resources"):
+            with usage_section(section):
+                llm.extract_with_schema(
+                    "Page 1:\n" + "Measured 10 Mt at 1.2 g/t Au. " * 50,
+                    "gemini-2.5-flash",
+                    None,
+                    "mock",
+                    MetadataResult,
+                    task=llm.SECTION_TASKS[section],
+                )
+        return ExtractionResult(metadata=ProjectMetadata(source_pdf=pdf_path.name)), {
+            "source_pdf": pdf_path.name
+        }
+
+    monkeypatch.setattr(pipeline, "process_pdf_two_stage", fake_process)
+    pipeline.run_pipeline(data_dir, output_dir, sqlite_path, settings)
+
+    manifest = json.loads((output_dir / "run_manifest.json").read_text(encoding="utf-8"))
+    usage = manifest["pdfs"][0]["usage"]
+    assert set(usage["by_section"]) == {"metadata", "resources"}
+    assert usage["estimated_calls"] == 2
+    assert manifest["usage"]["prompt_tokens"] == usage["prompt_tokens"] > 0
+
+    with sqlite3.connect(sqlite_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM llm_usage").fetchone()[0] == 2
+
+    run_id, rows = estimate_cost.load_sqlite_usage(sqlite_path, None)
+    assert run_id == manifest["run_id"]
+    assert [(row["pdf"], row["calls"]) for row in rows] == [("a.pdf", 2)]
+    assert rows[0]["prompt_tokens"] == usage["prompt_tokens"]
+    _, manifest_rows = estimate_cost.load_manifest_usage(output_dir / "run_manifest.jsonl")
+    assert manifest_rows[0]["prompt_tokens"] == usage["prompt_tokens"]
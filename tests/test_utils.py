@@ -3,9 +3,11 @@ from pipeline.utils import (
     NO_RESERVES_PATTERNS,
     clamp_text,
     extract_relevant_page_snippets,
+    find_boilerplate_lines,
     find_pages_with_patterns,
     is_toc_page,
     normalize_whitespace,
+    strip_page_boilerplate,
 )
 
 
@@ -44,3 +46,22 @@ def test_find_pages_with_patterns():
     economics = find_pages_with_patterns(pages, NO_ECONOMICS_PATTERNS)
     assert reserves == [2]
     assert economics == [3]
+
+
+def test_strip_boilerplate_removes_running_headers():
+    words = ["geology", "drilling", "sampling", "metallurgy", "mining"]
+    pages = [
+        "Acme Gold Corp.  NI 43-101 Technical Report\n"
+        + "\n".join(f"{word} discussion part {part}" for part in "abcdefgh")
+        + f"\nPage {idx} of 5"
+        for idx, word in enumerate(words, start=1)
+    ]
+    boilerplate = find_boilerplate_lines(pages, min_fraction=0.6)
+    stripped = [strip_page_boilerplate(page, boilerplate) for page in pages]
+
+    assert "acme gold corp. ni #-# technical report" in boilerplate
+    assert "page # of #" in boilerplate
+    assert stripped[0].splitlines()[0] == "geology discussion part a"
+    assert "sampling discussion part h" in stripped[2]
+    assert "Page 1 of 5" not in stripped[0]
+    assert find_boilerplate_lines(pages[:2]) == set()
@@ -0,0 +1,89 @@
+import json
+import logging
+
+from pipeline import pipeline
+from pipeline.config import Settings
+from pipeline.parsers import write_page_cache
+from pipeline.workpackage import (
+    WorkPackage,
+    list_packages,
+    load_package,
+    source_name,
+    write_package,
+)
+
+PAGES = [
+    "Technical Report on the Example Gold Project, Nevada. Effective date 2023-01-01.",
+    "Mineral Resource Estimate: Measured 10 Mt at 1.2 g/t Au for 385 koz Au.",
+    "Mineral Reserves: Proven 5 Mt at 1.1 g/t Au. Probable 2 Mt at 0.9 g/t Au.",
+    "Economic Analysis: NPV (5%) US$ 250 M, IRR 22%, payback 3.1 years.",
+]
+
+
+def _settings(tmp_path) -> Settings:
+    settings = Settings()
+    settings.output_dir = str(tmp_path / "out")
+    settings.embeddings_enabled = False
+    settings.page_index_enabled = False
+    settings.llm_provider = "mock"
+    return settings
+
+
+def _fake_pages(monkeypatch):
+    def fake_open(pdf_path, cache_dir, cache_size=64):
+        return write_page_cache(pdf_path, cache_dir, PAGES, cache_size), False
+
+    monkeypatch.setattr(pipeline, "open_page_cache", fake_open)
+    monkeypatch.setattr(pipeline, "extract_tables_for_pages", lambda pdf, pages: [])
+
+
+def test_package_round_trip(tmp_path):
+    package = WorkPackage(
+        source_pdf="a.pdf",
+        sha256="abc",
+        sections=["metadata", "reserves"],
+        llm_sections=["reserves"],
+        extraction_path="per_section",
+        contexts={"reserves": "Page 3:\nProven 5 Mt"},
+        no_reserves_pages=[7],
+        stats={"page_count": 4, "durations_sec": {"prepare": 0.1}},
+    )
+    path = write_package(package, tmp_path / "packages")
+
+    assert list_packages(tmp_path / "packages") == [path]
+    assert source_name(path) == "a.pdf"
+    assert load_package(path) == package
+
+
+def test_prepare_then_extract_matches_fused_run(tmp_path, monkeypatch):
+    _fake_pages(monkeypatch)
+    logging.getLogger().addHandler(logging.NullHandler())
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "a.pdf").write_bytes(b"%PDF-1.4")
+    settings = _settings(tmp_path)
+
+    fused = pipeline.run_pipeline(data_dir, tmp_path / "fused", tmp_path / "fused.db", settings)
+    [path] = pipeline.prepare_packages(
+        data_dir, tmp_path / "packages", tmp_path / "prep.db", settings
+    )
+    package = load_package(path)
+    assert package.llm_sections and set(package.fallback) == set(package.llm_sections)
+    assert all("Page" in context for context in package.contexts.values())
+
+    split = pipeline.run_pipeline(
+        data_dir,
+        tmp_path / "split",
+        tmp_path / "split.db",
+        settings,
+        packages_dir=tmp_path / "packages",
+    )
+
+    assert [r.model_dump() for r in split] == [r.model_dump() for r in fused]
+    manifests = [
+        json.loads((tmp_path / name / "run_manifest.json").read_text(encoding="utf-8"))["pdfs"][0]
+        for name in ("fused", "split")
+    ]
+    assert manifests[1]["source_pdf"] == "a.pdf"
+    assert manifests[1]["usage"]["calls"] == manifests[0]["usage"]["calls"]
+    assert manifests[1]["selected_pages"] == manifests[0]["selected_pages"]